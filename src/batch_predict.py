@@ -0,0 +1,301 @@
+# Batch Prediction Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 3
+# Scores a whole file of raw-format applications (CSV or Parquet) for backtesting
+# Usage: python batch_predict.py [input] [--output file] [--chunk-size N] [--workers N] [--current-state]
+#
+# Rows with an application_year are scored with point-in-time features: the
+# trailing averages and center queue load as of their own month, built from
+# the history before it like the training features. --current-state (or an
+# input without application_year) scores every row as if submitted now, with
+# the end-of-data averages and backlog, so historical scores then use
+# information from after the application.
+
+import pandas as pd
+import numpy as np
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the web service owns the serving feature pipeline; score with exactly that
+sys.path.insert(0, os.path.join(BASE_DIR, 'webapp', 'backend'))
+from prediction_service import VisaPredictionService, FEATURE_POSITION
+
+from data_preprocessing import read_table
+from queue_simulation import simulate_backlog
+
+
+FEATURED_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'visa_applications_featured.csv')
+
+_service = None
+_history = None
+
+
+class PointInTimeFeatures:
+    """
+    Trailing averages and center queue load as of each application's month,
+    rebuilt from the service's reference data the way feature_engineering
+    builds them for training (only months before the application count).
+    Months after the data get the end-of-data values the service serves.
+    """
+    
+    def __init__(self, featured_path, windows=(3, 12)):
+        df, _ = read_table(featured_path)
+        self.windows = windows
+        periods = (df['application_year'] * 12 + df['application_month'] - 1).to_numpy(dtype=np.int64)
+        self.first = periods.min()
+        self.n_periods = periods.max() - self.first + 1
+        relative = periods - self.first
+        values = df['processing_time_days'].to_numpy(dtype=np.float64)
+        self.overall_mean = values.mean()
+        
+        # prefix sums over a (group, period) grid; the extra last group is "unseen"
+        self.prefix = {}
+        for key in ('nationality', 'visa_type', None):
+            groups = df[key].to_numpy() if key else np.zeros(len(df), dtype=int)
+            codes, labels = pd.factorize(groups)
+            cell = codes * self.n_periods + relative
+            size = (len(labels) + 1) * self.n_periods
+            sums = np.bincount(cell, weights=values, minlength=size).reshape(-1, self.n_periods)
+            counts = np.bincount(cell, minlength=size).reshape(-1, self.n_periods)
+            prefix_sums = np.zeros((len(sums), self.n_periods + 1))
+            prefix_counts = np.zeros((len(sums), self.n_periods + 1))
+            np.cumsum(sums, axis=1, out=prefix_sums[:, 1:])
+            np.cumsum(counts, axis=1, out=prefix_counts[:, 1:])
+            self.prefix[key] = (pd.Index(labels), prefix_sums, prefix_counts)
+        
+        # queue each center had when its month began: what the first
+        # arrival of the month saw (months without arrivals keep the last)
+        features, _ = simulate_backlog(df)
+        codes, centers = pd.factorize(df['processing_center'], sort=True)
+        self.centers = pd.Index(centers)
+        self.center_load = np.zeros((len(centers), self.n_periods, 2))
+        first_rows = pd.Series(np.arange(len(df))).groupby([codes, relative]).min()
+        cell_center, cell_period = (first_rows.index.get_level_values(i).to_numpy() for i in (0, 1))
+        known = np.zeros((len(centers), self.n_periods), dtype=bool)
+        known[cell_center, cell_period] = True
+        self.center_load[cell_center, cell_period, 0] = features['center_queue_length'].to_numpy()[first_rows]
+        self.center_load[cell_center, cell_period, 1] = features['center_queue_wait_days'].to_numpy()[first_rows]
+        for p in range(1, self.n_periods):
+            self.center_load[~known[:, p], p] = self.center_load[~known[:, p], p - 1]
+    
+    def trailing(self, key, groups, relative, w):
+        """Mean over the w months before each row's month for its group (NaN without history)"""
+        labels, prefix_sums, prefix_counts = self.prefix[key]
+        codes = labels.get_indexer(groups) if key else np.zeros(len(relative), dtype=int)
+        codes[codes < 0] = len(labels)
+        start = np.maximum(relative - w, 0)
+        window_sum = prefix_sums[codes, relative] - prefix_sums[codes, start]
+        window_count = prefix_counts[codes, relative] - prefix_counts[codes, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(window_count > 0, window_sum / window_count, np.nan)
+    
+    def apply(self, df, full):
+        """Overwrite the time-dependent columns of serving features `full` for the rows of df"""
+        periods = (pd.to_numeric(df['application_year'], errors='coerce') * 12
+                   + pd.to_numeric(df['application_month'], errors='coerce') - 1).to_numpy()
+        dated = ~np.isnan(periods)  # undated rows keep the current-state values
+        relative = np.clip(np.nan_to_num(periods) - self.first, 0, self.n_periods).astype(np.int64)
+        
+        for w in self.windows:
+            overall = self.trailing(None, None, relative, w)
+            overall = np.where(np.isnan(overall), self.overall_mean, overall)
+            for key, prefix in [('nationality', 'country'), ('visa_type', 'visa_type')]:
+                groups = df[key].astype(str).to_numpy() if key in df.columns else np.full(len(df), '')
+                means = self.trailing(key, groups, relative, w)
+                column = FEATURE_POSITION[f'{prefix}_avg_time_{w}m']
+                full[:, column] = np.where(dated, np.where(np.isnan(means), overall, means), full[:, column])
+        
+        # inside the data: the simulated queue; after it: the served snapshot
+        # (already in full); unknown centers keep the served default
+        if 'processing_center' in df.columns:
+            codes = self.centers.get_indexer(df['processing_center'].astype(str).to_numpy())
+            historical = dated & (codes >= 0) & (relative < self.n_periods)
+            rows = np.flatnonzero(historical)
+            load = self.center_load[codes[rows], relative[rows]]
+            full[rows, FEATURE_POSITION['center_queue_length']] = load[:, 0]
+            full[rows, FEATURE_POSITION['center_queue_wait_days']] = load[:, 1]
+        return full
+
+
+def _init_worker(point_in_time=True):
+    """Load the model and reference data once per process (quietly)"""
+    global _service, _history
+    with contextlib.redirect_stdout(io.StringIO()):
+        _service = VisaPredictionService()
+        _history = PointInTimeFeatures(FEATURED_PATH) if point_in_time else None
+
+
+def score_chunk(chunk, id_column):
+    """
+    Predictions with intervals for one chunk, keyed by the id column when present.
+    Dated rows get point-in-time features unless the worker was set up for current state.
+    """
+    features = None
+    if _history is not None and 'application_year' in chunk.columns:
+        features = _history.apply(chunk, _service.feature_frame(chunk))
+    scores = _service.predict_frame(chunk, features)
+    if id_column in chunk.columns:
+        scores.insert(0, id_column, chunk[id_column].to_numpy())
+    return scores
+
+
+def count_rows(path):
+    """Row count from Parquet metadata; None for CSV (would need a full pass)"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+def has_column(path, name):
+    """Whether the input file has a column, from its header or Parquet schema"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return name in pq.ParquetFile(path).schema_arrow.names
+    return name in pd.read_csv(path, nrows=0).columns
+
+
+def iter_chunks(path, chunk_size):
+    """Read the input in chunks so memory stays flat however large the file is"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class PredictionWriter:
+    """Appends scored chunks to a CSV or Parquet file, in input order"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self._writer = None
+        self._started = False
+
+    def write(self, scores):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(scores, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            scores.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(input_path, output_path, chunk_size=200000, workers=None, id_column='application_id',
+              point_in_time=True):
+    """
+    Score every row of input_path into output_path.
+    With point_in_time, dated rows are scored with features as of their month;
+    otherwise every row uses the current (end-of-data) averages and backlog.
+    Chunks are scored across a process pool with a bounded number in flight
+    (reading never runs far ahead of scoring) and written back in order.
+    Returns (rows scored, seconds, mean predicted days).
+    """
+    workers = workers or os.cpu_count() or 1
+    total = count_rows(input_path)
+    writer = PredictionWriter(output_path)
+    rows, days_sum = 0, 0.0
+    start = time.perf_counter()
+
+    def record(scores):
+        nonlocal rows, days_sum
+        writer.write(scores)
+        rows += len(scores)
+        days_sum += scores['predicted_days'].sum()
+        elapsed = time.perf_counter() - start
+        progress = f" ({rows / total:.0%})" if total else ""
+        print(f"  {rows:>12,} rows{progress}  {elapsed:7.1f}s  {rows / elapsed:>10,.0f} rows/s")
+
+    try:
+        if workers == 1:
+            # one process: skip pickling chunks back and forth
+            _init_worker(point_in_time)
+            for chunk in iter_chunks(input_path, chunk_size):
+                record(score_chunk(chunk, id_column))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(point_in_time,)) as pool:
+                pending = deque()
+                for chunk in iter_chunks(input_path, chunk_size):
+                    pending.append(pool.submit(score_chunk, chunk, id_column))
+                    if len(pending) >= 2 * workers:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return rows, seconds, (days_sum / rows if rows else float('nan'))
+
+
+def parse_args():
+    """Command line options for a batch scoring run"""
+    parser = argparse.ArgumentParser(description="Score a file of visa applications with the trained model")
+    parser.add_argument('input', nargs='?',
+                        default=os.path.join(BASE_DIR, 'data', 'raw', 'visa_applications_raw.csv'),
+                        help="raw-format applications, .csv or .parquet (default: the raw dataset)")
+    parser.add_argument('--output', default=None,
+                        help="predictions file, .csv or .parquet (default: data/processed/batch_predictions.csv)")
+    parser.add_argument('--chunk-size', type=int, default=200000, help="rows per chunk (default: 200000)")
+    parser.add_argument('--workers', type=int, default=None, help="scoring processes (default: CPU count)")
+    parser.add_argument('--id-column', default='application_id',
+                        help="input column copied to the output to join results back (default: application_id)")
+    parser.add_argument('--current-state', action='store_true',
+                        help="score every row with today's trailing averages and center backlog instead of "
+                             "those as of its application month (historical scores then use later data)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    output = args.output or os.path.join(BASE_DIR, 'data', 'processed', 'batch_predictions.csv')
+
+    print("=" * 60)
+    print("BATCH PREDICTION")
+    print("=" * 60)
+
+    # step 1: check the model loads before starting the pool
+    point_in_time = not args.current_state and has_column(args.input, 'application_year')
+    _init_worker(point_in_time)
+    print(f"\nModel: {_service.model_name} "
+          f"({'quantile' if _service.interval_models else 'fixed'} intervals)")
+    print(f"Input:  {args.input}")
+    print(f"Output: {output}")
+    if point_in_time:
+        print("Features: point-in-time (trailing averages and center backlog as of each application month)")
+    else:
+        print(f"Features: CURRENT STATE (averages and backlog as of {_service.get_center_backlog()['as_of'] or 'the latest data'});")
+        print("          scores of past applications use information from after they were filed")
+    print(f"Chunks of {args.chunk_size:,} rows, {args.workers or os.cpu_count()} worker(s)\n")
+
+    # step 2: score chunk by chunk
+    rows, seconds, mean_days = run_batch(args.input, output, args.chunk_size, args.workers, args.id_column,
+                                         point_in_time)
+
+    # step 3: throughput summary
+    print(f"\nScored {rows:,} applications in {seconds:.1f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)")
+    print(f"Mean predicted processing time: {mean_days:.2f} days")
+    print(f"Predictions saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@
 #section-1
 import pandas as pd 
 import numpy as np
+import hashlib
+import json
 import os
 import warnings
 warnings.filterwarnings('ignore')
@@ -65,7 +67,7 @@ def handle_missing_values(df):
         if col in df_clean.columns and df_clean[col].isnull().sum() > 0:
             median_val = df_clean[col].median()
             count = df_clean[col].isnull().sum()
-            df_clean[col].fillna(median_val, inplace=True)
+            df_clean[col] = df_clean[col].fillna(median_val)
             print(f"  {col}: filled {count} nulls with median = {median_val:.1f}")
     
     #section-4
@@ -73,7 +75,7 @@ def handle_missing_values(df):
         if col in df_clean.columns and df_clean[col].isnull().sum() > 0:
             mode_val = df_clean[col].mode()[0]
             count = df_clean[col].isnull().sum()
-            df_clean[col].fillna(mode_val, inplace=True)
+            df_clean[col] = df_clean[col].fillna(mode_val)
             print(f"  {col}: filled {count} nulls with mode = '{mode_val}'")
     
     print("\nMissing value handling done!")
@@ -155,10 +157,64 @@ def process_target_labels(df):
     return df_out
 
 
+def typed_path(csv_path):
+    """Parquet copy kept next to a CSV file"""
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def save_typed(df, csv_path):
+    """
+    Write a Parquet copy of df next to its CSV.
+    Parquet keeps dtypes (categoricals, ints, bools) and loads far faster
+    than parsing text; needs pyarrow, and is skipped without it.
+    """
+    path = typed_path(csv_path)
+    try:
+        df.to_parquet(path, index=False)
+    except ImportError:
+        print("  (pyarrow not installed - skipping Parquet copy, CSV only)")
+        return None
+    print(f"Typed copy: {path}")
+    return path
+
+
+def _typed_copy_is_fresh(csv_path):
+    """Whether the Parquet copy exists and is at least as new as the CSV"""
+    path = typed_path(csv_path)
+    return os.path.exists(path) and (not os.path.exists(csv_path)
+                                     or os.path.getmtime(path) >= os.path.getmtime(csv_path))
+
+
+def read_table(csv_path):
+    """Read a dataset, preferring its Parquet copy when it is at least as new as the CSV"""
+    if _typed_copy_is_fresh(csv_path):
+        try:
+            return pd.read_parquet(typed_path(csv_path)), typed_path(csv_path)
+        except ImportError:
+            pass
+    return pd.read_csv(csv_path), csv_path
+
+
+def iter_table(csv_path, chunk_size=1000000):
+    """
+    Chunked version of read_table for data too large to load at once.
+    Returns (chunk iterator, path read); only one chunk is in memory at a time.
+    """
+    if _typed_copy_is_fresh(csv_path):
+        try:
+            import pyarrow.parquet as pq
+            parquet = pq.ParquetFile(typed_path(csv_path))
+            return (batch.to_pandas() for batch in parquet.iter_batches(batch_size=chunk_size)), typed_path(csv_path)
+        except ImportError:
+            pass
+    return pd.read_csv(csv_path, chunksize=chunk_size), csv_path
+
+
 def save_data(df, path):
-    """Save cleaned data to CSV"""
+    """Save cleaned data to CSV (plus a typed Parquet copy)"""
     df.to_csv(path, index=False)
     print(f"\nSaved to: {path}")
+    save_typed(df, path)
     print(f"Shape: {df.shape[0]} rows x {df.shape[1]} columns")
 
 
@@ -200,6 +256,64 @@ def generate_summary_report(df, path):
     
     return report
 
+def save_encodings(enc_maps, path):
+    """Write the category -> code mappings as a readable text file"""
+    with open(path, 'w') as f:
+        f.write("ENCODING MAPPINGS\n")
+        f.write("=" * 40 + "\n\n")
+        for name, mapping in enc_maps.items():
+            f.write(f"{name}:\n")
+            for k, v in sorted(mapping.items(), key=lambda x: x[1]):
+                f.write(f"  {v} = {k}\n")
+            f.write("\n")
+    print(f"\nEncoding mappings saved to: {path}")
+
+
+def save_encodings_artifact(enc_maps, path):
+    """
+    Write the encodings as JSON the serving code loads back: for each
+    column, its categories listed in code order (position = code), plus a
+    content hash so a model can be matched to the vocabulary it saw.
+    """
+    columns = {}
+    for name, mapping in enc_maps.items():
+        categories = sorted(mapping, key=mapping.get)
+        if [mapping[c] for c in categories] != list(range(len(categories))):
+            raise ValueError(f"codes for {name} are not 0..n-1")
+        columns[name] = [str(c) for c in categories]
+    payload = json.dumps(columns, sort_keys=True)
+    artifact = {'version': hashlib.sha256(payload.encode()).hexdigest()[:12], 'columns': columns}
+    with open(path, 'w') as f:
+        json.dump(artifact, f, indent=1, sort_keys=True)
+    print(f"Encoding artifact saved to: {path} (version {artifact['version']})")
+    return artifact['version']
+
+
+def preprocess_dataframe(df):
+    """Run the full cleaning pipeline on a raw DataFrame (steps 2-6 of main)"""
+    # analyze missing (before)
+    print("\n" + "=" * 40)
+    print("BEFORE PREPROCESSING")
+    print("=" * 40)
+    analyze_missing_values(df)
+    
+    # handle missing values
+    df_clean = handle_missing_values(df)
+    
+    # encode categorical
+    df_encoded, enc_maps = encode_categorical_variables(df_clean)
+    
+    # process targets
+    df_final = process_target_labels(df_encoded)
+    
+    # verify no missing
+    print("\n" + "=" * 40)
+    print("AFTER PREPROCESSING")
+    print("=" * 40)
+    analyze_missing_values(df_final)
+    
+    return df_final, enc_maps
+
 #section-9
 def main():
     print("=" * 60)
@@ -213,44 +327,20 @@ def main():
     clean_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_cleaned.csv')
     report_path = os.path.join(base_dir, 'reports', 'data_summary.txt')
     encoding_path = os.path.join(base_dir, 'data', 'processed', 'encoding_mappings.txt')
+    encoding_json_path = os.path.join(base_dir, 'data', 'processed', 'encodings.json')
     
     # step 1: load data
     df = load_data(raw_path)
     
-    # step 2: analyze missing (before)
-    print("\n" + "=" * 40)
-    print("BEFORE PREPROCESSING")
-    print("=" * 40)
-    analyze_missing_values(df)
-    
-    # step 3: handle missing values
-    df_clean = handle_missing_values(df)
-    
-    # step 4: encode categorical
-    df_encoded, enc_maps = encode_categorical_variables(df_clean)
-    
-    # step 5: process targets
-    df_final = process_target_labels(df_encoded)
-    
-    # step 6: verify no missing
-    print("\n" + "=" * 40)
-    print("AFTER PREPROCESSING")
-    print("=" * 40)
-    analyze_missing_values(df_final)
+    # steps 2-6: missing values, encoding, targets, verification
+    df_final, enc_maps = preprocess_dataframe(df)
     
     # step 7: save
     save_data(df_final, clean_path)
     
     # step 8: save encodings
-    with open(encoding_path, 'w') as f:
-        f.write("ENCODING MAPPINGS\n")
-        f.write("=" * 40 + "\n\n")
-        for name, mapping in enc_maps.items():
-            f.write(f"{name}:\n")
-            for k, v in sorted(mapping.items(), key=lambda x: x[1]):
-                f.write(f"  {v} = {k}\n")
-            f.write("\n")
-    print(f"\nEncoding mappings saved to: {encoding_path}")
+    save_encodings(enc_maps, encoding_path)
+    save_encodings_artifact(enc_maps, encoding_json_path)
     
     # step 9: summary report
     print("\n" + "=" * 40)
@@ -5,9 +5,18 @@
 
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib import cbook
 import seaborn as sns
+import argparse
+import hashlib
+import json
+import multiprocessing
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from data_preprocessing import read_table, iter_table
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -21,8 +30,8 @@ def load_data():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_cleaned.csv')
     
+    df, data_path = read_table(data_path)
     print(f"Loading data from: {data_path}")
-    df = pd.read_csv(data_path)
     print(f"Dataset shape: {df.shape[0]} rows, {df.shape[1]} columns")
     
     return df, base_dir
@@ -307,7 +316,25 @@ def plot_age_distribution(df, save_path):
     print(f"  Oldest applicants: {avg_age.idxmax()} ({avg_age.max():.1f} years avg)")
 
 
-def generate_key_insights(df):
+def key_insight_stats(df):
+    """The numbers behind the key insights, as a plain dict"""
+    days = df['processing_time_days']
+    visa_counts = df['visa_type'].value_counts()
+    return {
+        'avg_days': float(days.mean()),
+        'median_days': float(days.median()),
+        'approval_rate': float((df['visa_status'] == 'Approved').mean() * 100),
+        'rejection_rate': float((df['visa_status'] == 'Rejected').mean() * 100),
+        'top_visa': visa_counts.index[0],
+        'top_visa_share': float(visa_counts.iloc[0] / len(df) * 100),
+        'complete_docs_days': float(days[df['documents_complete'] == 1].mean()),
+        'incomplete_docs_days': float(days[df['documents_complete'] == 0].mean()),
+        'express_days': float(days[df['express_processing'] == 1].mean()),
+        'normal_days': float(days[df['express_processing'] == 0].mean())
+    }
+
+
+def print_key_insights(stats):
     """Print summary of key insights from EDA"""
     
     print("\n" + "=" * 60)
@@ -316,44 +343,687 @@ def generate_key_insights(df):
     
     # insight 1: processing time
     print("\n1. PROCESSING TIME INSIGHTS:")
-    print(f"   - Average: {df['processing_time_days'].mean():.1f} days")
-    print(f"   - 50% of applications processed within {df['processing_time_days'].median():.0f} days")
+    print(f"   - Average: {stats['avg_days']:.1f} days")
+    print(f"   - 50% of applications processed within {stats['median_days']:.0f} days")
     print(f"   - Express processing reduces time significantly")
     
     # insight 2: approval rates
-    approval_rate = (df['visa_status'] == 'Approved').mean() * 100
-    print(f"\n2. APPROVAL RATE: {approval_rate:.1f}%")
-    print(f"   - Rejection rate: {(df['visa_status'] == 'Rejected').mean() * 100:.1f}%")
+    print(f"\n2. APPROVAL RATE: {stats['approval_rate']:.1f}%")
+    print(f"   - Rejection rate: {stats['rejection_rate']:.1f}%")
     
     # insight 3: visa types
-    top_visa = df['visa_type'].value_counts().index[0]
-    print(f"\n3. MOST COMMON VISA TYPE: {top_visa}")
-    print(f"   - Makes up {df['visa_type'].value_counts().iloc[0] / len(df) * 100:.1f}% of applications")
+    print(f"\n3. MOST COMMON VISA TYPE: {stats['top_visa']}")
+    print(f"   - Makes up {stats['top_visa_share']:.1f}% of applications")
     
     # insight 4: document impact
-    complete_docs_time = df[df['documents_complete'] == 1]['processing_time_days'].mean()
-    incomplete_docs_time = df[df['documents_complete'] == 0]['processing_time_days'].mean()
     print(f"\n4. DOCUMENT COMPLETION IMPACT:")
-    print(f"   - Complete docs: {complete_docs_time:.1f} days avg")
-    print(f"   - Incomplete docs: {incomplete_docs_time:.1f} days avg")
+    print(f"   - Complete docs: {stats['complete_docs_days']:.1f} days avg")
+    print(f"   - Incomplete docs: {stats['incomplete_docs_days']:.1f} days avg")
     
     # insight 5: express processing
-    express_time = df[df['express_processing'] == 1]['processing_time_days'].mean()
-    normal_time = df[df['express_processing'] == 0]['processing_time_days'].mean()
     print(f"\n5. EXPRESS PROCESSING IMPACT:")
-    print(f"   - Express: {express_time:.1f} days avg")
-    print(f"   - Normal: {normal_time:.1f} days avg")
-    print(f"   - Saves approximately {normal_time - express_time:.1f} days")
+    print(f"   - Express: {stats['express_days']:.1f} days avg")
+    print(f"   - Normal: {stats['normal_days']:.1f} days avg")
+    print(f"   - Saves approximately {stats['normal_days'] - stats['express_days']:.1f} days")
     
     print("\n" + "=" * 60)
 
 
+def generate_key_insights(df):
+    """Print summary of key insights from EDA"""
+    print_key_insights(key_insight_stats(df))
+
+
+# ============================================================
+# FAST MODE: aggregate once, render in parallel, skip unchanged
+# ============================================================
+
+MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+CORRELATION_COLS = ['applicant_age', 'duration_requested_days', 'num_previous_visits',
+                    'financial_proof_usd', 'has_sponsor', 'documents_complete',
+                    'express_processing', 'processing_time_days', 'visa_status_encoded']
+
+FIGURE_FILES = {
+    'processing_time_distribution': '01_processing_time_distribution.png',
+    'visa_type_distribution': '02_visa_type_distribution.png',
+    'visa_status_pie': '03_visa_status_pie.png',
+    'processing_by_visa_type': '04_processing_by_visa_type.png',
+    'correlation_heatmap': '05_correlation_heatmap.png',
+    'monthly_trends': '06_monthly_trends.png',
+    'country_analysis': '07_country_analysis.png',
+    'age_distribution': '08_age_distribution.png'
+}
+
+
+def hash_dataframe(df):
+    """Content hash of the whole dataset (row order and values)"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+
+
+def hash_file(path):
+    """Content hash of a data file, read in blocks (for data too large to load)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def gaussian_kde(values, grid, chunk_size=100000, weights=None):
+    """
+    Gaussian KDE with Scott's bandwidth, evaluated on grid (chunked to bound memory).
+    weights turns values into (distinct value, count) pairs, so a KDE over
+    millions of whole-day values costs one term per distinct day.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+    n = weights.sum()
+    mean = np.dot(weights, values) / n if n > 0 else 0.0
+    var = np.dot(weights, (values - mean) ** 2) / (n - 1) if n > 1 else 0.0
+    bandwidth = np.sqrt(var) * n ** (-1 / 5)
+    if not bandwidth > 0:
+        bandwidth = 1.0
+    density = np.zeros(len(grid))
+    for start in range(0, len(values), chunk_size):
+        z = (grid[:, None] - values[None, start:start + chunk_size]) / bandwidth
+        density += np.exp(-0.5 * z ** 2) @ weights[start:start + chunk_size]
+    return density / (n * bandwidth * np.sqrt(2 * np.pi))
+
+
+def compute_aggregates(df):
+    """
+    Everything the eight figures need, computed in one pass over the data.
+    Each figure gets its own small entry, so it can be hashed and shipped
+    to a worker process without the full DataFrame.
+    """
+    times = df['processing_time_days'].to_numpy(dtype=np.float64)
+    
+    # one groupby per key, shared by every figure that needs it
+    by_visa = {k: g for k, g in df.groupby('visa_type', sort=False)}
+    by_month = df.groupby('application_month')['processing_time_days'].agg(['size', 'mean'])
+    by_country = df.groupby('nationality')['processing_time_days'].agg(['size', 'mean'])
+    
+    # processing time histogram (same 30 bins seaborn uses) plus KDE scaled to counts
+    counts, edges = np.histogram(times, bins=30)
+    grid = np.linspace(times.min(), times.max(), 200)
+    kde = gaussian_kde(times, grid) * len(times) * (edges[1] - edges[0])
+    
+    # box plot stats ordered by median, violin stats in order of appearance
+    visa_order = df['visa_type'].unique()
+    box_order = sorted(by_visa, key=lambda k: by_visa[k]['processing_time_days'].median())
+    box_stats = [cbook.boxplot_stats(by_visa[k]['processing_time_days'].to_numpy())[0] for k in box_order]
+    violin_stats = cbook.violin_stats(
+        [by_visa[k]['applicant_age'].to_numpy(dtype=np.float64) for k in visa_order],
+        lambda values, coords: gaussian_kde(values, coords)
+    )
+    
+    corr_cols = [col for col in CORRELATION_COLS if col in df.columns]
+    status_counts = df['visa_status'].value_counts()
+    visa_counts = df['visa_type'].value_counts()
+    
+    return {
+        'processing_time_distribution': {
+            'edges': edges, 'counts': counts, 'kde_x': grid, 'kde_y': kde,
+            'mean': times.mean(), 'median': np.median(times)
+        },
+        'visa_type_distribution': {
+            'labels': list(visa_counts.index), 'counts': visa_counts.to_numpy()
+        },
+        'visa_status_pie': {
+            'labels': list(status_counts.index), 'counts': status_counts.to_numpy()
+        },
+        'processing_by_visa_type': {
+            'labels': box_order, 'stats': box_stats
+        },
+        'correlation_heatmap': {
+            'corr': df[corr_cols].corr()
+        },
+        'monthly_trends': {
+            'months': by_month.index.to_numpy(), 'counts': by_month['size'].to_numpy(),
+            'avg': by_month['mean'].to_numpy()
+        },
+        'country_analysis': {
+            'top_counts': by_country['size'].sort_values(ascending=False).head(10),
+            'top_avg': by_country['mean'].sort_values(ascending=False).head(10)
+        },
+        'age_distribution': {
+            'labels': list(visa_order), 'stats': violin_stats
+        }
+    }
+
+
+# ------------------------------------------------------------
+# LARGE-DATA MODE: streaming, mergeable accumulators
+#
+# Error relative to the exact fast mode:
+#   - histogram counts, mean, median, processing-time KDE, box plots,
+#     monthly / country / status / visa-type aggregates: exact when
+#     processing_time_days holds whole days (it does after preprocessing).
+#     Other values are rounded to the nearest day first, which moves a
+#     value by at most 0.5 day.
+#   - correlation heatmap: exact up to floating point rounding (~1e-12),
+#     rows with missing values in the correlation columns are dropped.
+#   - age violins: KDE of a uniform reservoir sample of sample_size rows.
+#     For a visa type with m sampled rows the sample CDF is within
+#     1.36 / sqrt(m) of the full-data CDF with 95% probability (DKW bound),
+#     e.g. +-0.4 percentage points at m = 100k. Exact when the dataset has
+#     no more than sample_size rows.
+# ------------------------------------------------------------
+
+class CorrelationAccumulator:
+    """Running mean and co-moment matrix; chunks can be added or merged in any order"""
+    
+    def __init__(self, n_cols):
+        self.n = 0
+        self.mean = np.zeros(n_cols)
+        self.comoment = np.zeros((n_cols, n_cols))
+    
+    def update(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        X = X[~np.isnan(X).any(axis=1)]
+        if len(X) == 0:
+            return self
+        other = CorrelationAccumulator(X.shape[1])
+        other.n = len(X)
+        other.mean = X.mean(axis=0)
+        centered = X - other.mean
+        other.comoment = centered.T @ centered
+        return self.merge(other)
+    
+    def merge(self, other):
+        """Pairwise combination of two partial results (Chan et al.)"""
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        return self
+    
+    def corr(self):
+        std = np.sqrt(np.diag(self.comoment))
+        return self.comoment / np.outer(std, std)
+
+
+class ReservoirSample:
+    """Uniform sample of k rows from a stream of chunks (vectorized Algorithm R)"""
+    
+    def __init__(self, k, columns, seed=42):
+        self.k = k
+        self.columns = columns
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+        self.data = None
+    
+    def update(self, chunk):
+        values = {col: chunk[col].to_numpy() for col in self.columns}
+        n = len(chunk)
+        start = 0
+        if self.data is None:
+            take = min(self.k, n)
+            self.data = {col: v[:take].copy() for col, v in values.items()}
+            start = take
+        elif len(self.data[self.columns[0]]) < self.k:
+            take = min(self.k - len(self.data[self.columns[0]]), n)
+            self.data = {col: np.concatenate([self.data[col], values[col][:take]]) for col in self.columns}
+            start = take
+        
+        if start < n:
+            # row with global position g replaces slot j ~ U[0, g] when j < k
+            positions = self.seen + np.arange(start, n)
+            slots = self.rng.integers(0, positions + 1)
+            keep = slots < self.k
+            slots, rows = slots[keep], np.arange(start, n)[keep]
+            # when a slot is hit twice in this chunk the later row wins
+            _, last = np.unique(slots[::-1], return_index=True)
+            picked = len(slots) - 1 - last
+            for col in self.columns:
+                self.data[col][slots[picked]] = values[col][rows[picked]]
+        
+        self.seen += n
+        return self
+    
+    def frame(self):
+        return pd.DataFrame(self.data)
+
+
+class InsightAccumulator:
+    """Counts and sums behind key_insight_stats, added up chunk by chunk"""
+    
+    def __init__(self):
+        self.rows = 0
+        self.day_counts = None
+        self.status_counts = None
+        self.visa_counts = None
+        self.group_days = {}  # (column, value) -> [sum, count]
+    
+    def update(self, chunk):
+        days = chunk['processing_time_days']
+        self.rows += len(chunk)
+        self.day_counts = _accumulate(self.day_counts, days.value_counts())
+        self.status_counts = _accumulate(self.status_counts, chunk['visa_status'].value_counts())
+        self.visa_counts = _accumulate(self.visa_counts, chunk['visa_type'].value_counts())
+        for column in ('documents_complete', 'express_processing'):
+            for value in (0, 1):
+                part = days[chunk[column] == value]
+                total = self.group_days.setdefault((column, value), [0.0, 0])
+                total[0] += float(part.sum())
+                total[1] += int(part.count())
+        return self
+    
+    def _group_mean(self, column, value):
+        total, count = self.group_days[(column, value)]
+        return total / count if count else float('nan')
+    
+    def stats(self):
+        """Same dict as key_insight_stats on the whole data"""
+        day_counts = self.day_counts.sort_index()
+        values, counts = day_counts.index.to_numpy(dtype=np.float64), day_counts.to_numpy(dtype=np.float64)
+        visa_counts = self.visa_counts.sort_values(ascending=False, kind='stable')
+        return {
+            'avg_days': float(np.dot(values, counts) / counts.sum()),
+            'median_days': float(percentile_from_counts(values, counts, 50)),
+            'approval_rate': float(self.status_counts.get('Approved', 0) / self.rows * 100),
+            'rejection_rate': float(self.status_counts.get('Rejected', 0) / self.rows * 100),
+            'top_visa': visa_counts.index[0],
+            'top_visa_share': float(visa_counts.iloc[0] / self.rows * 100),
+            'complete_docs_days': self._group_mean('documents_complete', 1),
+            'incomplete_docs_days': self._group_mean('documents_complete', 0),
+            'express_days': self._group_mean('express_processing', 1),
+            'normal_days': self._group_mean('express_processing', 0)
+        }
+
+
+def percentile_from_counts(values, counts, q):
+    """np.percentile (linear interpolation) of data given as sorted distinct values and counts"""
+    cum = np.cumsum(counts)
+    pos = q / 100 * (cum[-1] - 1)
+    lo = values[np.searchsorted(cum, np.floor(pos), side='right')]
+    hi = values[np.searchsorted(cum, np.ceil(pos), side='right')]
+    return lo + (hi - lo) * (pos - np.floor(pos))
+
+
+def boxplot_stats_from_counts(values, counts, whis=1.5):
+    """Same statistics as matplotlib.cbook.boxplot_stats, from (value, count) pairs"""
+    n = counts.sum()
+    q1, med, q3 = (percentile_from_counts(values, counts, q) for q in (25, 50, 75))
+    iqr = q3 - q1
+    inside = (values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)
+    return {
+        'mean': np.dot(values, counts) / n, 'med': med, 'q1': q1, 'q3': q3, 'iqr': iqr,
+        'cilo': med - 1.57 * iqr / np.sqrt(n), 'cihi': med + 1.57 * iqr / np.sqrt(n),
+        'whislo': values[inside].min(), 'whishi': values[inside].max(),
+        # each distinct outlier value once - identical on screen to drawing every row
+        'fliers': values[~inside]
+    }
+
+
+def _accumulate(total, part):
+    """Add a chunk's partial counts/sums to the running total (aligned on index)"""
+    return part if total is None else total.add(part, fill_value=0)
+
+
+def compute_aggregates_streaming(chunks, sample_size=200000):
+    """
+    Large-data version of compute_aggregates: one pass over an iterable of
+    DataFrame chunks with bounded memory. Returns the same structure, so the
+    same renderers draw it. See the error notes above.
+    """
+    day_counts = visa_day_counts = month_agg = country_agg = status_counts = visa_counts = None
+    visa_order = []
+    corr_acc, corr_cols = None, None
+    reservoir = ReservoirSample(sample_size, ['visa_type', 'applicant_age'])
+    
+    for chunk in chunks:
+        days = np.rint(chunk['processing_time_days'].to_numpy(dtype=np.float64)).astype(np.int64)
+        chunk = chunk.assign(_day=days)
+        
+        # per-day histogram via bincount (no sort, no range needed up front)
+        offset = days.min()
+        binc = np.bincount(days - offset)
+        day_counts = _accumulate(day_counts, pd.Series(binc, index=np.arange(offset, offset + len(binc))))
+        
+        visa_day_counts = _accumulate(visa_day_counts, chunk.groupby(['visa_type', '_day']).size())
+        month_agg = _accumulate(
+            month_agg, chunk.groupby('application_month')['processing_time_days'].agg(['size', 'sum']))
+        country_agg = _accumulate(
+            country_agg, chunk.groupby('nationality')['processing_time_days'].agg(['size', 'sum']))
+        status_counts = _accumulate(status_counts, chunk['visa_status'].value_counts())
+        visa_counts = _accumulate(visa_counts, chunk['visa_type'].value_counts())
+        visa_order += [v for v in chunk['visa_type'].unique() if v not in visa_order]
+        
+        if corr_acc is None:
+            corr_cols = [col for col in CORRELATION_COLS if col in chunk.columns]
+            corr_acc = CorrelationAccumulator(len(corr_cols))
+        corr_acc.update(chunk[corr_cols].to_numpy(dtype=np.float64))
+        reservoir.update(chunk)
+    
+    day_counts = day_counts[day_counts > 0]
+    day_values = day_counts.index.to_numpy(dtype=np.float64)
+    day_weights = day_counts.to_numpy(dtype=np.float64)
+    
+    # histogram, mean, median and KDE from the per-day counts
+    edges = np.linspace(day_values.min(), day_values.max(), 31)
+    counts, _ = np.histogram(day_values, bins=edges, weights=day_weights)
+    grid = np.linspace(day_values.min(), day_values.max(), 200)
+    kde = gaussian_kde(day_values, grid, weights=day_weights) * day_weights.sum() * (edges[1] - edges[0])
+    
+    # box plots from per-(visa type, day) counts, ordered by median
+    box_stats = {}
+    for visa_type, group in visa_day_counts.groupby(level=0):
+        group = group.droplevel(0).sort_index()
+        group = group[group > 0]
+        box_stats[visa_type] = boxplot_stats_from_counts(group.index.to_numpy(dtype=np.float64),
+                                                         group.to_numpy(dtype=np.float64))
+    # stable sort over first-appearance order, so ties match compute_aggregates
+    box_order = sorted(visa_order, key=lambda k: box_stats[k]['med'])
+    
+    # violins from the reservoir sample
+    sample = reservoir.frame()
+    violin_stats = cbook.violin_stats(
+        [sample.loc[sample['visa_type'] == k, 'applicant_age'].to_numpy(dtype=np.float64) for k in visa_order],
+        lambda values, coords: gaussian_kde(values, coords)
+    )
+    
+    month_agg = month_agg.sort_index()
+    country_size = country_agg['size'].astype(np.int64)
+    visa_counts = visa_counts.astype(np.int64).sort_values(ascending=False, kind='stable')
+    status_counts = status_counts.astype(np.int64).sort_values(ascending=False, kind='stable')
+    
+    return {
+        'processing_time_distribution': {
+            'edges': edges, 'counts': counts.astype(np.int64), 'kde_x': grid, 'kde_y': kde,
+            'mean': np.dot(day_values, day_weights) / day_weights.sum(),
+            'median': percentile_from_counts(day_values, day_weights, 50)
+        },
+        'visa_type_distribution': {
+            'labels': list(visa_counts.index), 'counts': visa_counts.to_numpy()
+        },
+        'visa_status_pie': {
+            'labels': list(status_counts.index), 'counts': status_counts.to_numpy()
+        },
+        'processing_by_visa_type': {
+            'labels': box_order, 'stats': [box_stats[k] for k in box_order]
+        },
+        'correlation_heatmap': {
+            'corr': pd.DataFrame(corr_acc.corr(), index=corr_cols, columns=corr_cols)
+        },
+        'monthly_trends': {
+            'months': month_agg.index.to_numpy(), 'counts': month_agg['size'].to_numpy(dtype=np.int64),
+            'avg': (month_agg['sum'] / month_agg['size']).to_numpy()
+        },
+        'country_analysis': {
+            'top_counts': country_size.sort_values(ascending=False).head(10),
+            'top_avg': (country_agg['sum'] / country_agg['size']).sort_values(ascending=False).head(10)
+        },
+        'age_distribution': {
+            'labels': list(visa_order), 'stats': violin_stats
+        }
+    }
+
+
+def observe_chunks(chunks, *accumulators):
+    """Pass chunks through unchanged, feeding each one to the accumulators on the way"""
+    for chunk in chunks:
+        for accumulator in accumulators:
+            accumulator.update(chunk)
+        yield chunk
+
+
+def draw_processing_time_distribution(agg, ax):
+    edges = agg['edges']
+    ax.bar(edges[:-1], agg['counts'], width=np.diff(edges), align='edge',
+           color='steelblue', alpha=0.6, edgecolor='white')
+    ax.plot(agg['kde_x'], agg['kde_y'], color='steelblue', linewidth=2)
+    ax.axvline(agg['mean'], color='red', linestyle='--', linewidth=2, label=f"Mean: {agg['mean']:.1f} days")
+    ax.axvline(agg['median'], color='green', linestyle='--', linewidth=2, label=f"Median: {agg['median']:.1f} days")
+    ax.set_xlabel('Processing Time (Days)', fontsize=12)
+    ax.set_ylabel('Number of Applications', fontsize=12)
+    ax.set_title('Distribution of Visa Processing Times', fontsize=14, fontweight='bold')
+    ax.legend()
+
+
+def draw_visa_type_distribution(agg, ax):
+    colors = sns.color_palette("husl", len(agg['labels']))
+    bars = ax.bar(agg['labels'], agg['counts'], color=colors)
+    for bar, val in zip(bars, agg['counts']):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 10,
+                str(val), ha='center', va='bottom', fontsize=10)
+    ax.set_xlabel('Visa Type', fontsize=12)
+    ax.set_ylabel('Number of Applications', fontsize=12)
+    ax.set_title('Distribution of Visa Types', fontsize=14, fontweight='bold')
+    plt.xticks(rotation=45, ha='right')
+
+
+def draw_visa_status_pie(agg, ax):
+    colors = ['#2ecc71', '#e74c3c', '#f39c12']
+    _, _, autotexts = ax.pie(agg['counts'], labels=agg['labels'], autopct='%1.1f%%',
+                             colors=colors, explode=[0.02] * len(agg['counts']),
+                             shadow=True, startangle=90)
+    for autotext in autotexts:
+        autotext.set_fontsize(12)
+        autotext.set_fontweight('bold')
+    ax.set_title('Visa Application Status Distribution', fontsize=14, fontweight='bold')
+
+
+def draw_processing_by_visa_type(agg, ax):
+    artists = ax.bxp(agg['stats'], patch_artist=True, showfliers=True)
+    for patch, color in zip(artists['boxes'], sns.color_palette('Set2', len(agg['stats']))):
+        patch.set_facecolor(color)
+    ax.set_xticks(range(1, len(agg['labels']) + 1))
+    ax.set_xticklabels(agg['labels'])
+    ax.set_xlabel('Visa Type', fontsize=12)
+    ax.set_ylabel('Processing Time (Days)', fontsize=12)
+    ax.set_title('Processing Time by Visa Type', fontsize=14, fontweight='bold')
+    plt.xticks(rotation=45, ha='right')
+
+
+def draw_correlation_heatmap(agg, ax):
+    sns.heatmap(agg['corr'], annot=True, cmap='RdBu_r', center=0,
+                fmt='.2f', linewidths=0.5, ax=ax, annot_kws={'size': 9})
+    ax.set_title('Correlation Heatmap of Numerical Features', fontsize=14, fontweight='bold')
+    plt.xticks(rotation=45, ha='right')
+    plt.yticks(rotation=0)
+
+
+def draw_monthly_trends(agg, axes):
+    axes[0].plot(agg['months'], agg['counts'], marker='o', linewidth=2, markersize=8)
+    axes[0].set_ylabel('Number of Applications', fontsize=12)
+    axes[0].set_title('Monthly Application Volume', fontsize=13, fontweight='bold')
+    axes[1].plot(agg['months'], agg['avg'], marker='s', linewidth=2, markersize=8, color='coral')
+    axes[1].set_ylabel('Avg Processing Time (Days)', fontsize=12)
+    axes[1].set_title('Average Processing Time by Month', fontsize=13, fontweight='bold')
+    for ax in axes:
+        ax.set_xlabel('Month', fontsize=12)
+        ax.set_xticks(range(1, 13))
+        ax.set_xticklabels(MONTH_LABELS)
+
+
+def draw_country_analysis(agg, axes):
+    counts, avg = agg['top_counts'], agg['top_avg']
+    axes[0].barh(counts.index[::-1], counts.values[::-1], color='teal')
+    axes[0].set_xlabel('Number of Applications', fontsize=12)
+    axes[0].set_title('Top 10 Countries by Application Volume', fontsize=13, fontweight='bold')
+    axes[1].barh(avg.index[::-1], avg.values[::-1], color='salmon')
+    axes[1].set_xlabel('Avg Processing Time (Days)', fontsize=12)
+    axes[1].set_title('Top 10 Countries by Processing Time', fontsize=13, fontweight='bold')
+
+
+def draw_age_distribution(agg, ax):
+    parts = ax.violin(agg['stats'], showmedians=True)
+    for body, color in zip(parts['bodies'], sns.color_palette('muted', len(agg['stats']))):
+        body.set_facecolor(color)
+        body.set_alpha(0.8)
+    ax.set_xticks(range(1, len(agg['labels']) + 1))
+    ax.set_xticklabels(agg['labels'])
+    ax.set_xlabel('Visa Type', fontsize=12)
+    ax.set_ylabel('Applicant Age', fontsize=12)
+    ax.set_title('Age Distribution by Visa Type', fontsize=14, fontweight='bold')
+    plt.xticks(rotation=45, ha='right')
+
+
+# figure name -> (draw function, figsize, subplot columns)
+FIGURE_RENDERERS = {
+    'processing_time_distribution': (draw_processing_time_distribution, (10, 6), 1),
+    'visa_type_distribution': (draw_visa_type_distribution, (10, 6), 1),
+    'visa_status_pie': (draw_visa_status_pie, (8, 8), 1),
+    'processing_by_visa_type': (draw_processing_by_visa_type, (12, 6), 1),
+    'correlation_heatmap': (draw_correlation_heatmap, (10, 8), 1),
+    'monthly_trends': (draw_monthly_trends, (14, 5), 2),
+    'country_analysis': (draw_country_analysis, (14, 6), 2),
+    'age_distribution': (draw_age_distribution, (12, 6), 1)
+}
+
+
+def _init_render_worker():
+    """Worker processes only write PNGs, so use the non-interactive backend"""
+    matplotlib.use('Agg')
+
+
+def render_figure(name, agg, figures_dir):
+    """Draw one figure from its pre-computed aggregates and save it"""
+    draw, figsize, ncols = FIGURE_RENDERERS[name]
+    fig, axes = plt.subplots(1, ncols, figsize=figsize)
+    draw(agg, axes)
+    plt.tight_layout()
+    path = os.path.join(figures_dir, FIGURE_FILES[name])
+    plt.savefig(path, dpi=150)
+    plt.close(fig)
+    return path
+
+
+def load_manifest(path):
+    """Hashes from the previous fast run"""
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {'data_hash': None, 'figures': {}}
+
+
+def figures_up_to_date(figures_dir, data_hash, force=False):
+    """Whether the last fast run saw the same data and left every figure in place"""
+    manifest = load_manifest(os.path.join(figures_dir, 'eda_manifest.json'))
+    files_present = all(os.path.exists(os.path.join(figures_dir, f)) for f in FIGURE_FILES.values())
+    return not force and data_hash == manifest['data_hash'] and files_present
+
+
+def render_all_figures(df, figures_dir, workers=None, force=False):
+    """
+    Fast EDA: hash the data, build the aggregate cache in one pass, then
+    render only the figures whose inputs changed, in a process pool.
+    """
+    data_hash = hash_dataframe(df)
+    if figures_up_to_date(figures_dir, data_hash, force):
+        print(f"\nData unchanged (hash {data_hash}), all figures up to date")
+        return []
+    return render_changed_figures(compute_aggregates(df), data_hash, figures_dir, workers, force)
+
+
+def render_large_figures(data_path, figures_dir, workers=None, force=False,
+                         sample_size=200000, chunk_size=1000000):
+    """
+    Large-data EDA: stream the table from disk in chunks (Parquet copy when
+    fresh), so memory is bounded by chunk_size and sample_size rather than
+    the row count. The data hash is taken over the file bytes, and the key
+    insights are accumulated in the same pass and kept in the manifest, so
+    an unchanged file is not read at all. Returns the key insight stats.
+    """
+    chunks, path = iter_table(data_path, chunk_size)
+    print(f"Streaming data from: {path} ({chunk_size:,} rows per chunk)")
+    data_hash = f'{hash_file(path)}-large{sample_size}'
+    manifest = load_manifest(os.path.join(figures_dir, 'eda_manifest.json'))
+    if figures_up_to_date(figures_dir, data_hash, force) and 'insights' in manifest:
+        print(f"\nData unchanged (hash {data_hash}), all figures up to date")
+        return manifest['insights']
+    
+    insights = InsightAccumulator()
+    aggregates = compute_aggregates_streaming(observe_chunks(chunks, insights), sample_size)
+    stats = insights.stats()
+    render_changed_figures(aggregates, data_hash, figures_dir, workers, force, insights=stats)
+    return stats
+
+
+def render_changed_figures(aggregates, data_hash, figures_dir, workers=None, force=False, insights=None):
+    """Render the figures whose aggregates changed since the last run and update the manifest"""
+    manifest_path = os.path.join(figures_dir, 'eda_manifest.json')
+    manifest = load_manifest(manifest_path)
+    figure_hashes = {name: hashlib.sha256(pickle.dumps(agg)).hexdigest()[:16]
+                     for name, agg in aggregates.items()}
+    
+    todo = [name for name in FIGURE_FILES
+            if force
+            or figure_hashes[name] != manifest['figures'].get(name)
+            or not os.path.exists(os.path.join(figures_dir, FIGURE_FILES[name]))]
+    skipped = len(FIGURE_FILES) - len(todo)
+    print(f"\nRendering {len(todo)} figures ({skipped} unchanged, skipped)")
+    
+    rendered = []
+    if todo:
+        # spawn, not fork: the pipeline runner calls this while other stages run in
+        # threads, and forking mid pandas/BLAS call can leave locks held in the child
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {name: pool.submit(render_figure, name, aggregates[name], figures_dir) for name in todo}
+            for name, future in futures.items():
+                rendered.append(future.result())
+                print(f"  Saved: {FIGURE_FILES[name]}")
+    
+    record = {'data_hash': data_hash, 'figures': figure_hashes}
+    if insights is not None:
+        record['insights'] = insights
+    with open(manifest_path, 'w') as f:
+        json.dump(record, f, indent=2)
+    
+    return rendered
+
+
+def parse_args():
+    """Command line options for the EDA run"""
+    parser = argparse.ArgumentParser(description="Exploratory data analysis for the visa dataset")
+    parser.add_argument('--fast', action='store_true',
+                        help="aggregate once and render figures in parallel, skipping unchanged ones")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="render processes for --fast (default: CPU count)")
+    parser.add_argument('--force', action='store_true',
+                        help="with --fast, re-render every figure even if inputs are unchanged")
+    parser.add_argument('--large', action='store_true',
+                        help="implies --fast; read the data from disk in chunks through bincount histograms, "
+                             "mergeable correlation accumulators and a reservoir sample, so memory stays "
+                             "bounded for millions of rows")
+    parser.add_argument('--sample-size', type=int, default=200000,
+                        help="reservoir sample size for --large violin plots (default: 200000)")
+    parser.add_argument('--chunk-size', type=int, default=1000000,
+                        help="rows read per chunk with --large (default: 1000000)")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    
     print("=" * 60)
     print("EXPLORATORY DATA ANALYSIS - VISA DATASET")
     print("Infosys Springboard - Milestone 2")
     print("=" * 60)
     
+    if args.large:
+        # never load the whole table: stream it from disk
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        figures_dir = create_output_folder(base_dir)
+        print(f"\nSaving figures to: {figures_dir}")
+        data_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_cleaned.csv')
+        stats = render_large_figures(data_path, figures_dir, workers=args.workers, force=args.force,
+                                     sample_size=args.sample_size, chunk_size=args.chunk_size)
+        print_key_insights(stats)
+        print("\n" + "=" * 60)
+        print("EDA COMPLETE!")
+        print(f"Figures up to date in: {figures_dir}")
+        print("=" * 60)
+        return
+    
     # load data
     df, base_dir = load_data()
     
@@ -361,6 +1031,15 @@ def main():
     figures_dir = create_output_folder(base_dir)
     print(f"\nSaving figures to: {figures_dir}")
     
+    if args.fast:
+        render_all_figures(df, figures_dir, workers=args.workers, force=args.force)
+        generate_key_insights(df)
+        print("\n" + "=" * 60)
+        print("EDA COMPLETE!")
+        print(f"Figures up to date in: {figures_dir}")
+        print("=" * 60)
+        return
+    
     # generate all plots
     plot_processing_time_distribution(df, figures_dir)
     plot_visa_type_distribution(df, figures_dir)
@@ -0,0 +1,249 @@
+# Fast Inference Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 3
+# Flattens tree models into plain NumPy arrays for cheap small-batch prediction,
+# and exports fitted models as .npy arrays the web service loads without sklearn
+# Usage: python fast_inference.py  (exports the models already saved in models/)
+
+import numpy as np
+import joblib
+import json
+import os
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+
+
+class FlatTreeEnsemble:
+    """
+    All trees of a model stored as one set of node arrays.
+    Leaves point to themselves, so prediction is max_depth rounds of
+    vectorized lookups over every (row, tree) pair at once - no Python
+    loop per tree and no per-call threading overhead. Internal nodes hold
+    the mean value of the leaves below them (for path attributions).
+    """
+
+    def __init__(self, feature, threshold, left, right, value, missing_left, roots,
+                 max_depth, scale=1.0, baseline=0.0, float32_inputs=False):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.scale = float(scale)
+        self.baseline = float(baseline)
+        # sklearn's DecisionTree compares float32-cast inputs against its thresholds
+        self.float32_inputs = bool(float32_inputs)
+
+    def leaf_indices(self, X):
+        """Node index of the leaf each row reaches in each tree, shape (n_rows, n_trees)"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.float32_inputs:
+            X = X.astype(np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        idx = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[idx]]
+            go_left = (x <= self.threshold[idx]) | (np.isnan(x) & self.missing_left[idx])
+            idx = np.where(go_left, self.left[idx], self.right[idx])
+        return idx
+
+    def predict(self, X):
+        """Same output as the source model's predict"""
+        return self.value[self.leaf_indices(X)].sum(axis=1) * self.scale + self.baseline
+
+
+def _stack_trees(trees):
+    """Concatenate per-tree node arrays, shifting child indices by each tree's offset"""
+    parts = {k: [] for k in ('feature', 'threshold', 'left', 'right', 'value', 'missing_left')}
+    roots, offset, max_depth = [], 0, 0
+    for tree in trees:
+        n = len(tree['feature'])
+        is_leaf = tree['is_leaf']
+        own = np.arange(n)
+        parts['feature'].append(np.where(is_leaf, 0, tree['feature']))
+        parts['threshold'].append(np.where(is_leaf, np.inf, tree['threshold']))
+        parts['left'].append(np.where(is_leaf, own, tree['left']) + offset)
+        parts['right'].append(np.where(is_leaf, own, tree['right']) + offset)
+        parts['value'].append(tree['value'])
+        parts['missing_left'].append(tree['missing_left'])
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, tree['depth'])
+    arrays = {
+        'feature': np.concatenate(parts['feature']).astype(np.int64),
+        'threshold': np.concatenate(parts['threshold']).astype(np.float64),
+        'left': np.concatenate(parts['left']).astype(np.int64),
+        'right': np.concatenate(parts['right']).astype(np.int64),
+        'value': np.concatenate(parts['value']).astype(np.float64),
+        'missing_left': np.concatenate(parts['missing_left']).astype(bool)
+    }
+    return arrays, np.array(roots, dtype=np.int64), max_depth
+
+
+def _sklearn_tree_nodes(estimator):
+    """Node arrays of a fitted DecisionTreeRegressor"""
+    tree = estimator.tree_
+    is_leaf = tree.children_left == -1
+    missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+    return {
+        'feature': tree.feature, 'threshold': tree.threshold,
+        'left': tree.children_left, 'right': tree.children_right,
+        'value': tree.value[:, 0, 0], 'is_leaf': is_leaf,
+        'missing_left': np.asarray(missing_left, dtype=bool), 'depth': tree.max_depth
+    }
+
+
+def _hist_predictor_nodes(predictor):
+    """Node arrays of one HistGradientBoosting tree predictor"""
+    nodes = predictor.nodes
+    if nodes['is_categorical'].any():
+        raise ValueError("categorical splits are not supported by the flat predictor")
+    # only leaf values carry the learning rate, so internal values are rebuilt
+    # bottom-up as the count-weighted mean of their children
+    value = nodes['value'].astype(np.float64)
+    count = nodes['count'].astype(np.float64)
+    for i in np.argsort(-nodes['depth'].astype(np.int64), kind='stable'):
+        if not nodes['is_leaf'][i]:
+            left, right = nodes['left'][i], nodes['right'][i]
+            total = count[left] + count[right]
+            value[i] = (value[left] * count[left] + value[right] * count[right]) / total if total else 0.0
+    return {
+        'feature': nodes['feature_idx'], 'threshold': nodes['num_threshold'],
+        'left': nodes['left'], 'right': nodes['right'],
+        'value': value, 'is_leaf': nodes['is_leaf'].astype(bool),
+        'missing_left': nodes['missing_go_to_left'].astype(bool), 'depth': int(nodes['depth'].max())
+    }
+
+
+def flatten_model(model):
+    """
+    Build a FlatTreeEnsemble for a fitted tree model.
+    Returns None for models without trees (e.g. Linear Regression).
+    """
+    if isinstance(model, DecisionTreeRegressor):
+        arrays, roots, depth = _stack_trees([_sklearn_tree_nodes(model)])
+        return FlatTreeEnsemble(**arrays, roots=roots, max_depth=depth, float32_inputs=True)
+
+    if isinstance(model, RandomForestRegressor):
+        arrays, roots, depth = _stack_trees([_sklearn_tree_nodes(t) for t in model.estimators_])
+        return FlatTreeEnsemble(**arrays, roots=roots, max_depth=depth,
+                                scale=1.0 / len(model.estimators_), float32_inputs=True)
+
+    if isinstance(model, HistGradientBoostingRegressor):
+        trees = [_hist_predictor_nodes(it[0]) for it in model._predictors]
+        arrays, roots, depth = _stack_trees(trees)
+        return FlatTreeEnsemble(**arrays, roots=roots, max_depth=depth,
+                                baseline=np.ravel(model._baseline_prediction)[0])
+
+    return None
+
+
+# ============================================================
+# SERVING ARRAY EXPORT
+# ============================================================
+
+SERVING_FORMAT = 1
+TREE_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'missing_left', 'roots')
+
+
+def model_arrays(model):
+    """
+    Describe a fitted model as (metadata, arrays) for the NumPy-only runtime:
+    coefficients for linear/logistic models, stacked node arrays for trees.
+    Raises ValueError for anything else.
+    """
+    name = type(model).__name__
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.ndim > 1 and coef.shape[0] != 1:
+            raise ValueError(f"{name} with {coef.shape[0]} outputs is not supported")
+        kind = 'logistic' if hasattr(model, 'predict_proba') else 'linear'
+        intercept = np.ravel(np.asarray(model.intercept_, dtype=np.float64))[:1]
+        return {'kind': kind, 'name': name}, {'coef': np.ravel(coef), 'intercept': intercept}
+
+    flat = flatten_model(model)
+    if flat is None:
+        raise ValueError(f"{name} cannot be exported as arrays")
+    meta = {'kind': 'trees', 'name': name, 'max_depth': flat.max_depth, 'scale': flat.scale,
+            'baseline': flat.baseline, 'float32_inputs': flat.float32_inputs}
+    return meta, {key: getattr(flat, key) for key in TREE_ARRAYS}
+
+
+def scaler_arrays(scaler):
+    """(metadata, arrays) of a fitted StandardScaler"""
+    meta = {'kind': 'scaler', 'name': type(scaler).__name__,
+            'feature_names': [str(f) for f in getattr(scaler, 'feature_names_in_', [])]}
+    return meta, {'mean': np.asarray(scaler.mean_, dtype=np.float64),
+                  'scale': np.asarray(scaler.scale_, dtype=np.float64)}
+
+
+def export_component(directory, component, meta, arrays, reset=False):
+    """
+    Write one component (scaler, point, lower, upper, approval) as .npy files
+    plus its entry in manifest.json. reset=True starts a fresh folder so no
+    component of an older model survives.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, 'manifest.json')
+    manifest = {'format': SERVING_FORMAT, 'components': {}}
+    if reset:
+        for name in os.listdir(directory):
+            if name.endswith('.npy') or name == 'manifest.json':
+                os.remove(os.path.join(directory, name))
+    elif os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    files = {}
+    for key, values in arrays.items():
+        files[key] = f'{component}_{key}.npy'
+        np.save(os.path.join(directory, files[key]), np.ascontiguousarray(values))
+    manifest['components'][component] = {**meta, 'arrays': files}
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def export_models(directory, scaler, point_model, quantile_models=None, approval_model=None):
+    """Export everything the service scores with; returns the components written"""
+    export_component(directory, 'scaler', *scaler_arrays(scaler), reset=True)
+    export_component(directory, 'point', *model_arrays(point_model))
+    written = ['scaler', 'point']
+    if quantile_models is not None:
+        for component in ('lower', 'upper'):
+            export_component(directory, component, *model_arrays(quantile_models[component]))
+            written.append(component)
+    if approval_model is not None:
+        export_component(directory, 'approval', *model_arrays(approval_model))
+        written.append('approval')
+    return written
+
+
+def main():
+    print("=" * 60)
+    print("EXPORT SERVING ARRAYS")
+    print("=" * 60)
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    models_dir = os.path.join(base_dir, 'models')
+
+    def load_optional(name):
+        path = os.path.join(models_dir, name)
+        return joblib.load(path) if os.path.exists(path) else None
+
+    scaler = joblib.load(os.path.join(models_dir, 'scaler.pkl'))
+    point_model = joblib.load(os.path.join(models_dir, 'best_model.pkl'))
+    serving_dir = os.path.join(models_dir, 'serving')
+    written = export_models(serving_dir, scaler, point_model,
+                            load_optional('quantile_models.pkl'), load_optional('approval_classifier.pkl'))
+
+    print(f"\nExported {', '.join(written)} to: {serving_dir}")
+    for name in sorted(os.listdir(serving_dir)):
+        print(f"  {name:<28} {os.path.getsize(os.path.join(serving_dir, name)):>10,} bytes")
+
+
+if __name__ == "__main__":
+    main()
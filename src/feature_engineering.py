@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 import os
 import warnings
+from data_preprocessing import read_table, save_typed
+from queue_simulation import simulate_backlog, save_backlog_snapshot
 warnings.filterwarnings('ignore')
 
 
@@ -15,8 +17,8 @@ def load_data():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_cleaned.csv')
     
+    df, data_path = read_table(data_path)
     print(f"Loading data from: {data_path}")
-    df = pd.read_csv(data_path)
     print(f"Original shape: {df.shape[0]} rows, {df.shape[1]} columns")
     
     return df, base_dir
@@ -208,11 +210,110 @@ def create_processing_efficiency_feature(df):
     return df
 
 
+def trailing_group_means(groups, periods, values, windows):
+    """
+    Mean of values over the previous w periods (current period excluded)
+    for each row's group, for every window w.
+    Sums and counts go on a (group, period) grid once; a cumulative sum
+    along periods then gives every window total as one subtraction,
+    instead of filtering the frame for each row.
+    Rows whose group has no history in the window get NaN.
+    """
+    group_codes, _ = pd.factorize(groups)
+    n_groups, n_periods = group_codes.max() + 1, periods.max() + 1
+    cell = group_codes * n_periods + periods
+    sums = np.bincount(cell, weights=values, minlength=n_groups * n_periods).reshape(n_groups, n_periods)
+    counts = np.bincount(cell, minlength=n_groups * n_periods).reshape(n_groups, n_periods)
+
+    # prefix[:, p] = total over periods < p
+    prefix_sums = np.zeros((n_groups, n_periods + 1))
+    prefix_counts = np.zeros((n_groups, n_periods + 1))
+    np.cumsum(sums, axis=1, out=prefix_sums[:, 1:])
+    np.cumsum(counts, axis=1, out=prefix_counts[:, 1:])
+
+    result = {}
+    for w in windows:
+        start = np.maximum(periods - w, 0)
+        window_sum = prefix_sums[group_codes, periods] - prefix_sums[group_codes, start]
+        window_count = prefix_counts[group_codes, periods] - prefix_counts[group_codes, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[w] = np.where(window_count > 0, window_sum / window_count, np.nan)
+    return result
+
+
+def create_rolling_time_features(df, windows=(3, 12)):
+    """
+    Feature 7: Trailing processing-time averages
+    Average processing time per nationality and per visa type over the
+    previous 3 and 12 months (the application's own month is excluded,
+    so only history that existed at application time is used).
+    Gaps fall back to the all-nationality/all-visa trailing average, then
+    to the overall mean for the very first months.
+    """
+    print("\n--- Creating Rolling Time Features ---")
+    
+    # months since the first month in the data
+    first_year = df['application_year'].min()
+    periods = ((df['application_year'] - first_year) * 12 + df['application_month'] - 1).to_numpy()
+    values = df['processing_time_days'].to_numpy(dtype=np.float64)
+    
+    overall = trailing_group_means(np.zeros(len(df), dtype=int), periods, values, windows)
+    created = []
+    for key, prefix in [('nationality', 'country'), ('visa_type', 'visa_type')]:
+        means = trailing_group_means(df[key].to_numpy(), periods, values, windows)
+        for w in windows:
+            col = f'{prefix}_avg_time_{w}m'
+            filled = np.where(np.isnan(means[w]), overall[w], means[w])
+            df[col] = np.where(np.isnan(filled), values.mean(), filled)
+            created.append(col)
+    
+    for col in created:
+        corr = df[col].corr(df['processing_time_days'])
+        print(f"  {col}: correlation with processing time {corr:.3f}")
+    
+    print(f"  Created: {', '.join(repr(c) for c in created)}")
+    
+    return df
+
+
+def create_center_backlog_feature(df, utilization=0.95):
+    """
+    Feature 8: Processing center queue load
+    Each center is simulated as a FIFO queue fed by the applications it
+    receives; the queue length and wait an application sees on arrival
+    only depend on earlier applications.
+    Returns the DataFrame and the end-of-data backlog snapshot per center.
+    """
+    print("\n--- Creating Center Backlog Features ---")
+    
+    features, snapshot = simulate_backlog(df, utilization)
+    df['center_queue_length'] = features['center_queue_length']
+    df['center_queue_wait_days'] = features['center_queue_wait_days']
+    
+    print(f"  Centers at {utilization:.0%} target utilization, as of {snapshot['as_of']}:")
+    for name, c in snapshot['centers'].items():
+        print(f"    {name}: backlog {c['backlog']}, wait {c['wait_days']:.1f} days")
+    corr = df['center_queue_wait_days'].corr(df['processing_time_days'])
+    print(f"  Wait correlation with processing time: {corr:.3f}")
+    
+    print(f"  Created: 'center_queue_length' and 'center_queue_wait_days'")
+    
+    return df, snapshot
+
+
+def save_center_backlog(snapshot, base_dir):
+    """Save the end-of-data backlog per center (from the feature step) for the prediction service"""
+    output_path = os.path.join(base_dir, 'data', 'processed', 'center_backlog.json')
+    save_backlog_snapshot(snapshot, output_path)
+    return output_path
+
+
 def save_featured_data(df, base_dir):
     """Save the dataset with new features"""
     output_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_featured.csv')
     df.to_csv(output_path, index=False)
     print(f"\nSaved to: {output_path}")
+    save_typed(df, output_path)
     print(f"Final shape: {df.shape[0]} rows, {df.shape[1]} columns")
     return output_path
 
@@ -236,6 +337,22 @@ def print_feature_summary(df, original_cols):
     print("\n" + "=" * 60)
 
 
+def engineer_features(df):
+    """
+    Apply every feature step in order.
+    Returns the enhanced DataFrame and the center backlog snapshot.
+    """
+    df = create_seasonal_feature(df)
+    df = create_country_avg_feature(df)
+    df = create_visa_type_avg_feature(df)
+    df = create_age_group_feature(df)
+    df = create_risk_score_feature(df)
+    df = create_processing_efficiency_feature(df)
+    df = create_rolling_time_features(df)
+    df, backlog = create_center_backlog_feature(df)
+    return df, backlog
+
+
 def main():
     print("=" * 60)
     print("FEATURE ENGINEERING - VISA DATASET")
@@ -247,15 +364,11 @@ def main():
     original_cols = list(df.columns)
     
     # create features one by one
-    df = create_seasonal_feature(df)
-    df = create_country_avg_feature(df)
-    df = create_visa_type_avg_feature(df)
-    df = create_age_group_feature(df)
-    df = create_risk_score_feature(df)
-    df = create_processing_efficiency_feature(df)
+    df, backlog = engineer_features(df)
     
     # save enhanced dataset
     save_featured_data(df, base_dir)
+    save_center_backlog(backlog, base_dir)
     
     # print summary
     print_feature_summary(df, original_cols)
@@ -0,0 +1,213 @@
+# Hyperparameter Search Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 3
+# Successive halving search over model configs with k-fold CV and a disk cache
+
+import numpy as np
+import hashlib
+import json
+import math
+import os
+import time
+from joblib import Parallel, delayed
+from sklearn.model_selection import KFold, ParameterGrid, cross_val_score
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+
+
+# search space for each tunable candidate: (estimator class, param grid, fixed params)
+SEARCH_SPACES = {
+    'Decision Tree': (
+        DecisionTreeRegressor,
+        {
+            'max_depth': [4, 6, 8, 10, 12, None],
+            'min_samples_leaf': [1, 2, 5, 10, 20],
+            'min_samples_split': [2, 5, 10]
+        },
+        {'random_state': 42}
+    ),
+    'Random Forest': (
+        RandomForestRegressor,
+        {
+            'n_estimators': [50, 100, 200, 300],
+            'max_depth': [6, 8, 10, 12, None],
+            'min_samples_leaf': [1, 2, 5],
+            'max_features': [1.0, 0.5, 'sqrt']
+        },
+        {'random_state': 42, 'n_jobs': 1}
+    ),
+    'Hist Gradient Boosting': (
+        HistGradientBoostingRegressor,
+        {
+            'max_iter': [100, 200, 400],
+            'learning_rate': [0.03, 0.1, 0.2],
+            'max_leaf_nodes': [7, 15, 31],
+            'min_samples_leaf': [10, 20, 40],
+            'l2_regularization': [0.0, 1.0]
+        },
+        {'random_state': 42}
+    )
+}
+
+
+def hash_data(X, y):
+    """Fingerprint the training data so cached scores are only reused on identical data"""
+    digest = hashlib.sha256()
+    for arr in (np.ascontiguousarray(X, dtype=np.float64), np.ascontiguousarray(y, dtype=np.float64)):
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def load_cache(cache_path):
+    """Load previously evaluated (model, params, data, resource) scores"""
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache, cache_path):
+    """Write the score cache back to disk"""
+    if not cache_path:
+        return
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+
+def cache_key(model_name, params, data_hash, n_samples, cv):
+    """Build a stable key for one candidate evaluation"""
+    payload = json.dumps(
+        {'model': model_name, 'params': params, 'data': data_hash, 'n': n_samples, 'cv': cv},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+def sample_candidates(param_grid, n_candidates, rng):
+    """Draw up to n_candidates distinct configs from the grid"""
+    grid = list(ParameterGrid(param_grid))
+    if len(grid) <= n_candidates:
+        return grid
+    idx = rng.choice(len(grid), size=n_candidates, replace=False)
+    return [grid[i] for i in sorted(idx)]
+
+
+def evaluate_candidate(estimator_cls, params, fixed_params, X, y, cv):
+    """k-fold CV mean absolute error for one config (runs in a worker)"""
+    model = estimator_cls(**params, **fixed_params)
+    folds = KFold(n_splits=cv, shuffle=True, random_state=42)
+    scores = cross_val_score(model, X, y, cv=folds, scoring='neg_mean_absolute_error', n_jobs=1)
+    return float(-scores.mean())
+
+
+def successive_halving(model_name, X, y, n_candidates=27, eta=3, cv=5, n_jobs=-1,
+                       deadline=None, cache=None, data_hash=None, min_samples=None):
+    """
+    Successive halving for one model family.
+    Every round scores the surviving configs on a larger slice of the
+    training rows and keeps the best 1/eta of them, so bad configs are
+    stopped early on cheap subsets.
+    """
+    estimator_cls, param_grid, fixed_params = SEARCH_SPACES[model_name]
+    rng = np.random.RandomState(42)
+    candidates = sample_candidates(param_grid, n_candidates, rng)
+    cache = cache if cache is not None else {}
+
+    X = np.asarray(X)
+    y = np.asarray(y)
+    order = rng.permutation(len(X))
+    n_total = len(X)
+    if min_samples is None:
+        min_samples = cv * 20
+
+    n_rounds = max(1, int(math.ceil(math.log(len(candidates), eta))) + 1) if len(candidates) > 1 else 1
+
+    evaluated, cache_hits = 0, 0
+    scores = {}
+    for rnd in range(n_rounds):
+        if rnd > 0 and deadline is not None and time.time() > deadline:
+            print(f"   Time limit reached before round {rnd + 1}, stopping early")
+            break
+
+        # rows used this round grow geometrically up to the full training set
+        n_samples = int(n_total * eta ** (rnd - (n_rounds - 1)))
+        n_samples = min(n_total, max(min_samples, n_samples))
+        rows = order[:n_samples]
+
+        keys = [cache_key(model_name, p, data_hash, n_samples, cv) for p in candidates]
+        todo = [(k, p) for k, p in zip(keys, candidates) if k not in cache]
+        cache_hits += len(candidates) - len(todo)
+
+        if todo:
+            maes = Parallel(n_jobs=n_jobs)(
+                delayed(evaluate_candidate)(estimator_cls, p, fixed_params, X[rows], y[rows], cv)
+                for _, p in todo
+            )
+            for (k, p), mae in zip(todo, maes):
+                cache[k] = {'model': model_name, 'params': p, 'n_samples': n_samples, 'cv_mae': mae}
+            evaluated += len(todo)
+
+        scores = {k: cache[k]['cv_mae'] for k in keys}
+        ranked = sorted(zip(keys, candidates), key=lambda kp: scores[kp[0]])
+        print(f"   Round {rnd + 1}/{n_rounds}: {len(candidates)} configs on {n_samples} rows, "
+              f"best CV MAE {scores[ranked[0][0]]:.3f}")
+
+        if rnd < n_rounds - 1:
+            keep = max(1, int(math.ceil(len(candidates) / eta)))
+            candidates = [p for _, p in ranked[:keep]]
+        else:
+            candidates = [p for _, p in ranked]
+
+    best_key = min(scores, key=scores.get)
+    return {
+        'params': cache[best_key]['params'],
+        'cv_mae': cache[best_key]['cv_mae'],
+        'n_samples': cache[best_key]['n_samples'],
+        'evaluated': evaluated,
+        'cache_hits': cache_hits
+    }
+
+
+def run_search(X_train, y_train, base_dir, n_candidates=27, time_limit=None, cv=5, n_jobs=-1,
+               model_names=None):
+    """
+    Tune every model family in SEARCH_SPACES.
+    Returns {model name: best params} for train_models, plus a summary per model.
+    """
+    print("\n--- Hyperparameter Search (successive halving) ---")
+
+    cache_path = os.path.join(base_dir, 'models', 'search_cache.json')
+    cache = load_cache(cache_path)
+    data_hash = hash_data(X_train, y_train)
+    deadline = time.time() + time_limit if time_limit else None
+
+    print(f"Candidates per model: {n_candidates}, CV folds: {cv}, "
+          f"time limit: {str(time_limit) + 's' if time_limit else 'none'}")
+    print(f"Cache: {cache_path} ({len(cache)} entries), data hash {data_hash}")
+
+    best_params = {}
+    summary = []
+    for name in (model_names or SEARCH_SPACES.keys()):
+        print(f"\n{name}:")
+        start = time.time()
+        result = successive_halving(name, X_train, y_train, n_candidates=n_candidates, cv=cv,
+                                    n_jobs=n_jobs, deadline=deadline, cache=cache,
+                                    data_hash=data_hash)
+        save_cache(cache, cache_path)
+        best_params[name] = result['params']
+        summary.append({
+            'Model': name,
+            'Best Params': json.dumps(result['params'], sort_keys=True),
+            'CV MAE': result['cv_mae'],
+            'Rows': result['n_samples'],
+            'Evaluated': result['evaluated'],
+            'Cache Hits': result['cache_hits'],
+            'Seconds': time.time() - start
+        })
+        print(f"   Best: {result['params']} (CV MAE {result['cv_mae']:.3f}, "
+              f"{result['evaluated']} fits, {result['cache_hits']} from cache)")
+
+    return best_params, summary
@@ -0,0 +1,106 @@
+# Model Profiling Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 3
+# Measures how expensive each trained model is to serve
+
+import numpy as np
+import joblib
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+# batch sizes for throughput: one API request, a what-if fan-out, a bulk job
+THROUGHPUT_BATCH_SIZES = (1, 64, 10000)
+
+
+def _as_rows(X, n_rows):
+    """Return exactly n_rows rows of X as a contiguous float64 array (tiling if needed)"""
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if len(X) < n_rows:
+        X = np.tile(X, (int(np.ceil(n_rows / len(X))), 1))
+    return np.ascontiguousarray(X[:n_rows])
+
+
+def measure_single_row_latency(model, X, n_calls=500):
+    """Per-call latencies (seconds) of predicting one row at a time"""
+    model.predict(X[:1])  # warm up (first call pays for lazy init inside sklearn)
+    times = np.empty(n_calls)
+    for i in range(n_calls):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        model.predict(row)
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def measure_throughput(model, X, batch_size, min_seconds=0.2, max_calls=200):
+    """Rows per second when predicting in batches of batch_size"""
+    batch = _as_rows(X, batch_size)
+    model.predict(batch)
+    calls, start = 0, time.perf_counter()
+    while calls < max_calls:
+        model.predict(batch)
+        calls += 1
+        if time.perf_counter() - start >= min_seconds:
+            break
+    return batch_size * calls / (time.perf_counter() - start)
+
+
+def measure_artifact_cost(model, X, batch_size=10000, repeats=3):
+    """
+    Size of the pickled model, time to joblib.load it, and peak Python
+    memory while loading it and scoring one large batch.
+    """
+    batch = _as_rows(X, batch_size)
+    fd, path = tempfile.mkstemp(suffix='.pkl')
+    os.close(fd)
+    try:
+        joblib.dump(model, path)
+        size_bytes = os.path.getsize(path)
+
+        load_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            joblib.load(path)
+            load_times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        loaded = joblib.load(path)
+        loaded.predict(batch)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.remove(path)
+
+    return {
+        'size_kb': size_bytes / 1024,
+        'load_ms': float(np.median(load_times) * 1000),
+        'peak_mem_mb': peak_bytes / 1024 ** 2
+    }
+
+
+def profile_model(model, X, fast_model=None):
+    """
+    Serving profile of one model.
+    If fast_model is given (e.g. a flattened tree ensemble) it is used for
+    single-row calls, since that is the path serving would take there;
+    for larger batches the faster of the two paths is reported.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    single_model = fast_model if fast_model is not None else model
+
+    single_times = measure_single_row_latency(single_model, X)
+    profile = {
+        'p50_ms': float(np.percentile(single_times, 50) * 1000),
+        'p99_ms': float(np.percentile(single_times, 99) * 1000)
+    }
+    for batch_size in THROUGHPUT_BATCH_SIZES:
+        if batch_size == 1:
+            profile[f'rows_per_sec_{batch_size}'] = float(1.0 / single_times.mean())
+        else:
+            paths = [model] if fast_model is None else [model, fast_model]
+            profile[f'rows_per_sec_{batch_size}'] = max(measure_throughput(m, X, batch_size) for m in paths)
+    profile.update(measure_artifact_cost(model, X))
+    return profile
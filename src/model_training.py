@@ -9,13 +9,20 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LinearRegression
+from sklearn.linear_model import LinearRegression, QuantileRegressor, LogisticRegression
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.metrics import accuracy_score, roc_auc_score, log_loss, brier_score_loss
 import joblib
+import argparse
 import os
+import shutil
 import warnings
+from data_preprocessing import read_table
+from hyperparameter_search import run_search
+from model_profiling import profile_model
+from fast_inference import flatten_model, model_arrays, scaler_arrays, export_component
 warnings.filterwarnings('ignore')
 
 
@@ -24,8 +31,8 @@ def load_data():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_featured.csv')
     
+    df, data_path = read_table(data_path)
     print(f"Loading data from: {data_path}")
-    df = pd.read_csv(data_path)
     print(f"Dataset: {df.shape[0]} rows, {df.shape[1]} columns")
     
     return df, base_dir
@@ -54,7 +61,13 @@ def prepare_features(df):
         'occupation_encoded',
         'risk_score',
         'country_avg_processing_time',
-        'visa_type_avg_time'
+        'visa_type_avg_time',
+        'country_avg_time_3m',
+        'country_avg_time_12m',
+        'visa_type_avg_time_3m',
+        'visa_type_avg_time_12m',
+        'center_queue_length',
+        'center_queue_wait_days'
     ]
     
     # filter to available columns
@@ -72,13 +85,27 @@ def prepare_features(df):
     return X, y, available_cols
 
 
-def split_data(X, y):
-    """Split data into training (80%) and testing (20%) sets"""
+def split_data(X, y, periods=None, test_size=0.2):
+    """
+    Split data into training (80%) and testing (20%) sets.
+    With periods (e.g. year * 12 + month) the split is time ordered: the
+    latest months form the test set, so the score reflects predicting
+    applications newer than anything the model was trained on.
+    """
     print("\n--- Splitting Data ---")
     
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    if periods is None:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=42
+        )
+    else:
+        # cut at a month boundary so no month is split across both sets
+        periods = np.asarray(periods)
+        cutoff = np.sort(periods)[int(len(periods) * (1 - test_size))]
+        is_test = periods >= cutoff
+        X_train, X_test = X[~is_test], X[is_test]
+        y_train, y_test = y[~is_test], y[is_test]
+        print(f"Time-ordered split: testing on periods from {cutoff // 12}-{cutoff % 12 + 1:02d} onwards")
     
     print(f"Training set: {len(X_train)} samples")
     print(f"Testing set: {len(X_test)} samples")
@@ -99,11 +126,16 @@ def scale_features(X_train, X_test):
     return X_train_scaled, X_test_scaled, scaler
 
 
-def train_models(X_train, y_train):
-    """Train multiple regression models"""
+def train_models(X_train, y_train, tuned_params=None):
+    """
+    Train multiple regression models.
+    tuned_params: optional {model name: params} from the hyperparameter
+    search, overriding the default configs below.
+    """
     print("\n--- Training Models ---")
     
     models = {}
+    tuned_params = tuned_params or {}
     
     # Model 1: Linear Regression
     print("\n1. Training Linear Regression...")
@@ -114,23 +146,35 @@ def train_models(X_train, y_train):
     
     # Model 2: Decision Tree
     print("\n2. Training Decision Tree...")
-    dt_model = DecisionTreeRegressor(max_depth=10, random_state=42)
+    dt_params = tuned_params.get('Decision Tree', {'max_depth': 10})
+    dt_model = DecisionTreeRegressor(**dt_params, random_state=42)
     dt_model.fit(X_train, y_train)
     models['Decision Tree'] = dt_model
     print("   Done!")
     
     # Model 3: Random Forest
     print("\n3. Training Random Forest...")
-    rf_model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42)
+    rf_params = tuned_params.get('Random Forest', {'n_estimators': 100, 'max_depth': 10})
+    rf_model = RandomForestRegressor(**rf_params, random_state=42)
     rf_model.fit(X_train, y_train)
     models['Random Forest'] = rf_model
     print("   Done!")
     
+    # Model 4: Histogram Gradient Boosting
+    # bins features into at most 255 buckets, so trees stay shallow and cheap to evaluate
+    print("\n4. Training Histogram Gradient Boosting...")
+    hgb_params = tuned_params.get('Hist Gradient Boosting',
+                                  {'max_iter': 200, 'learning_rate': 0.1, 'max_leaf_nodes': 15})
+    hgb_model = HistGradientBoostingRegressor(**hgb_params, random_state=42)
+    hgb_model.fit(X_train, y_train)
+    models['Hist Gradient Boosting'] = hgb_model
+    print("   Done!")
+    
     return models
 
 
 def evaluate_models(models, X_test, y_test):
-    """Evaluate all models and compare performance"""
+    """Evaluate all models on accuracy and serving cost"""
     print("\n--- Evaluating Models ---")
     
     results = []
@@ -144,54 +188,90 @@ def evaluate_models(models, X_test, y_test):
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
         r2 = r2_score(y_test, y_pred)
         
+        # measure serving cost (single rows of tree models go through flattened node arrays)
+        flat_model = flatten_model(model)
+        if flat_model is not None:
+            gap = np.max(np.abs(flat_model.predict(X_test) - y_pred), initial=0.0)
+            if not np.isfinite(gap) or gap > 1e-6 * max(1.0, np.max(np.abs(y_pred), initial=0.0)):
+                print(f"  Warning: {name} flat predictor differs by up to {gap:.3g} days, "
+                      f"profiling the sklearn model instead")
+                flat_model = None
+        profile = profile_model(model, X_test, fast_model=flat_model)
+        
         results.append({
             'Model': name,
             'MAE': mae,
             'RMSE': rmse,
-            'R2 Score': r2
+            'R2 Score': r2,
+            'Latency 1-row (ms)': profile['p50_ms'],
+            'Latency p99 (ms)': profile['p99_ms'],
+            'Rows/s @1': profile['rows_per_sec_1'],
+            'Rows/s @64': profile['rows_per_sec_64'],
+            'Rows/s @10k': profile['rows_per_sec_10000'],
+            'Size (KB)': profile['size_kb'],
+            'Load (ms)': profile['load_ms'],
+            'Peak Mem (MB)': profile['peak_mem_mb']
         })
         
         print(f"\n{name}:")
         print(f"  MAE: {mae:.2f} days (average error)")
         print(f"  RMSE: {rmse:.2f} days")
         print(f"  R² Score: {r2:.4f} ({r2*100:.1f}% accuracy)")
+        print(f"  Latency: {profile['p50_ms']:.3f} ms p50, {profile['p99_ms']:.3f} ms p99 (single row)")
+        print(f"  Throughput: {profile['rows_per_sec_1']:,.0f} / {profile['rows_per_sec_64']:,.0f} / "
+              f"{profile['rows_per_sec_10000']:,.0f} rows/s at batch 1 / 64 / 10k")
+        print(f"  Artifact: {profile['size_kb']:.1f} KB, loads in {profile['load_ms']:.1f} ms, "
+              f"peak memory {profile['peak_mem_mb']:.1f} MB")
     
     results_df = pd.DataFrame(results)
     return results_df
 
 
 def plot_model_comparison(results_df, save_path):
-    """Create comparison visualization"""
+    """Create comparison visualization (accuracy on top, serving cost below)"""
     print("\n--- Creating Comparison Chart ---")
     
-    fig, axes = plt.subplots(1, 3, figsize=(14, 5))
-    
-    colors = ['#3498db', '#e74c3c', '#2ecc71']
-    
-    # MAE comparison
-    axes[0].bar(results_df['Model'], results_df['MAE'], color=colors)
-    axes[0].set_ylabel('MAE (Days)')
-    axes[0].set_title('Mean Absolute Error\n(Lower is Better)')
-    axes[0].tick_params(axis='x', rotation=15)
-    for i, v in enumerate(results_df['MAE']):
-        axes[0].text(i, v + 0.1, f'{v:.2f}', ha='center', fontsize=10)
-    
-    # RMSE comparison
-    axes[1].bar(results_df['Model'], results_df['RMSE'], color=colors)
-    axes[1].set_ylabel('RMSE (Days)')
-    axes[1].set_title('Root Mean Squared Error\n(Lower is Better)')
-    axes[1].tick_params(axis='x', rotation=15)
-    for i, v in enumerate(results_df['RMSE']):
-        axes[1].text(i, v + 0.1, f'{v:.2f}', ha='center', fontsize=10)
-    
-    # R2 comparison
-    axes[2].bar(results_df['Model'], results_df['R2 Score'], color=colors)
-    axes[2].set_ylabel('R² Score')
-    axes[2].set_title('R² Score\n(Higher is Better)')
-    axes[2].set_ylim(0, 1)
-    axes[2].tick_params(axis='x', rotation=15)
-    for i, v in enumerate(results_df['R2 Score']):
-        axes[2].text(i, v + 0.02, f'{v:.2f}', ha='center', fontsize=10)
+    fig, axes = plt.subplots(2, 4, figsize=(20, 10))
+    
+    colors = ['#3498db', '#e74c3c', '#2ecc71', '#9b59b6']
+    models = results_df['Model']
+    
+    def bar_panel(ax, col, ylabel, title, fmt, ylim=None):
+        ax.bar(models, results_df[col], color=colors)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        if ylim:
+            ax.set_ylim(*ylim)
+        ax.tick_params(axis='x', rotation=15)
+        offset = (ylim[1] if ylim else results_df[col].max()) * 0.01
+        for i, v in enumerate(results_df[col]):
+            ax.text(i, v + offset, fmt.format(v), ha='center', fontsize=10)
+    
+    # accuracy
+    bar_panel(axes[0, 0], 'MAE', 'MAE (Days)', 'Mean Absolute Error\n(Lower is Better)', '{:.2f}')
+    bar_panel(axes[0, 1], 'RMSE', 'RMSE (Days)', 'Root Mean Squared Error\n(Lower is Better)', '{:.2f}')
+    bar_panel(axes[0, 2], 'R2 Score', 'R² Score', 'R² Score\n(Higher is Better)', '{:.2f}', ylim=(0, 1))
+    bar_panel(axes[0, 3], 'Latency p99 (ms)', 'Milliseconds', 'p99 Single-Row Latency\n(Lower is Better)', '{:.2f}')
+    
+    # throughput at each batch size, grouped per model
+    ax = axes[1, 0]
+    batch_cols = ['Rows/s @1', 'Rows/s @64', 'Rows/s @10k']
+    width = 0.25
+    x = np.arange(len(models))
+    for j, col in enumerate(batch_cols):
+        ax.bar(x + (j - 1) * width, results_df[col], width, label=col.replace('Rows/s ', 'batch '),
+               color=plt.cm.Greys(0.4 + 0.2 * j))
+    ax.set_yscale('log')
+    ax.set_xticks(x)
+    ax.set_xticklabels(models, rotation=15)
+    ax.set_ylabel('Rows / second (log)')
+    ax.set_title('Inference Throughput\n(Higher is Better)')
+    ax.legend(fontsize=8)
+    
+    # artifact cost
+    bar_panel(axes[1, 1], 'Size (KB)', 'KB', 'Model Size on Disk\n(Lower is Better)', '{:.0f}')
+    bar_panel(axes[1, 2], 'Load (ms)', 'Milliseconds', 'Load Time\n(Lower is Better)', '{:.1f}')
+    bar_panel(axes[1, 3], 'Peak Mem (MB)', 'MB', 'Peak Memory (load + 10k batch)\n(Lower is Better)', '{:.1f}')
     
     plt.suptitle('Model Performance Comparison', fontsize=14, fontweight='bold', y=1.02)
     plt.tight_layout()
@@ -232,13 +312,37 @@ def plot_feature_importance(model, feature_names, save_path):
         print(f"  {row['Feature']}: {row['Importance']:.4f}")
 
 
-def save_best_model(models, results_df, scaler, base_dir):
+def select_best_model(results_df, latency_weight=0.0, latency_budget_ms=None):
+    """
+    Pick the model with the lowest combined objective:
+        MAE + latency_weight * median single-row latency (ms)
+    Models whose p99 single-row latency exceeds latency_budget_ms are
+    not eligible; if none is within budget a ValueError is raised, so
+    nothing is saved. With the defaults this is simply the lowest MAE.
+    """
+    candidates = results_df
+    if latency_budget_ms is not None:
+        candidates = results_df[results_df['Latency p99 (ms)'] <= latency_budget_ms]
+        rejected = results_df.loc[~results_df.index.isin(candidates.index)]
+        for _, row in rejected.iterrows():
+            print(f"  Rejected {row['Model']}: p99 {row['Latency p99 (ms)']:.3f} ms "
+                  f"over budget of {latency_budget_ms} ms")
+        if len(candidates) == 0:
+            fastest = results_df.loc[results_df['Latency p99 (ms)'].idxmin()]
+            raise ValueError(f"no model meets the latency budget of {latency_budget_ms} ms p99 "
+                             f"(fastest: {fastest['Model']} at {fastest['Latency p99 (ms)']:.3f} ms); "
+                             f"the saved model was left unchanged")
+    
+    objective = candidates['MAE'] + latency_weight * candidates['Latency 1-row (ms)']
+    return candidates.loc[objective.idxmin(), 'Model']
+
+
+def save_best_model(models, results_df, scaler, base_dir, latency_weight=0.0, latency_budget_ms=None):
     """Save the best performing model"""
     print("\n--- Saving Best Model ---")
     
-    # find best model (lowest MAE)
-    best_idx = results_df['MAE'].idxmin()
-    best_model_name = results_df.loc[best_idx, 'Model']
+    # find best model (lowest MAE, optionally traded off against latency)
+    best_model_name = select_best_model(results_df, latency_weight, latency_budget_ms)
     best_model = models[best_model_name]
     
     print(f"Best Model: {best_model_name}")
@@ -253,9 +357,168 @@ def save_best_model(models, results_df, scaler, base_dir):
     joblib.dump(scaler, scaler_path)
     print(f"Scaler saved to: {scaler_path}")
     
+    # keep the category vocabularies the model was trained on next to it
+    encodings_path = os.path.join(base_dir, 'data', 'processed', 'encodings.json')
+    if os.path.exists(encodings_path):
+        shutil.copyfile(encodings_path, os.path.join(base_dir, 'models', 'encodings.json'))
+        print(f"Encodings saved to: {os.path.join(base_dir, 'models', 'encodings.json')}")
+    
+    # plain arrays for the service: loads in milliseconds, no sklearn needed
+    serving_dir = os.path.join(base_dir, 'models', 'serving')
+    export_component(serving_dir, 'scaler', *scaler_arrays(scaler), reset=True)
+    try:
+        export_component(serving_dir, 'point', *model_arrays(best_model))
+        print(f"Serving arrays saved to: {serving_dir}")
+    except ValueError as e:
+        # the service falls back to the pickles when there is no point model here
+        print(f"Serving arrays not exported ({e})")
+    
     return best_model_name, best_model
 
 
+def train_quantile_models(X_train, y_train, best_model, quantiles=(0.1, 0.9)):
+    """
+    Train lower/upper quantile models for the prediction interval.
+    A linear point model gets linear quantile models, so serving can fold
+    all three into a single matrix product; otherwise gradient boosting
+    with the quantile loss is used.
+    """
+    print("\n--- Training Quantile Models ---")
+    
+    quantile_models = {'quantiles': tuple(quantiles)}
+    for name, q in zip(['lower', 'upper'], quantiles):
+        if isinstance(best_model, LinearRegression):
+            model = QuantileRegressor(quantile=q, alpha=0.0, solver='highs')
+        else:
+            model = HistGradientBoostingRegressor(loss='quantile', quantile=q, max_iter=200,
+                                                  max_leaf_nodes=15, random_state=42)
+        model.fit(X_train, y_train)
+        quantile_models[name] = model
+        print(f"  {name}: {type(model).__name__} (q={q})")
+    
+    return quantile_models
+
+
+def evaluate_intervals(quantile_models, best_model, X_test, y_test):
+    """Check how often the test targets fall inside the predicted interval"""
+    print("\n--- Evaluating Prediction Intervals ---")
+    
+    y_test = np.asarray(y_test)
+    q_low, q_high = quantile_models['quantiles']
+    point = best_model.predict(X_test)
+    # keep the point estimate inside its own interval, as the service does
+    lower = np.minimum(quantile_models['lower'].predict(X_test), point)
+    upper = np.maximum(quantile_models['upper'].predict(X_test), point)
+    
+    def pinball(y, pred, q):
+        diff = y - pred
+        return np.mean(np.maximum(q * diff, (q - 1) * diff))
+    
+    result = {
+        'Nominal Coverage': q_high - q_low,
+        'Empirical Coverage': np.mean((y_test >= lower) & (y_test <= upper)),
+        'Below Lower': np.mean(y_test < lower),
+        'Above Upper': np.mean(y_test > upper),
+        'Mean Width (days)': np.mean(upper - lower),
+        'Pinball Lower': pinball(y_test, lower, q_low),
+        'Pinball Upper': pinball(y_test, upper, q_high)
+    }
+    
+    # the old fixed +-15% / +-2 day band, for comparison
+    margin = np.maximum(point * 0.15, 2.0)
+    result['Fixed Band Coverage'] = np.mean((y_test >= point - margin) & (y_test <= point + margin))
+    
+    print(f"  Nominal coverage: {result['Nominal Coverage']*100:.0f}% "
+          f"(q{q_low*100:.0f} - q{q_high*100:.0f})")
+    print(f"  Empirical coverage: {result['Empirical Coverage']*100:.1f}% "
+          f"({result['Below Lower']*100:.1f}% below, {result['Above Upper']*100:.1f}% above)")
+    print(f"  Mean interval width: {result['Mean Width (days)']:.2f} days")
+    print(f"  Old fixed band coverage: {result['Fixed Band Coverage']*100:.1f}%")
+    
+    return result
+
+
+def save_quantile_models(quantile_models, base_dir):
+    """Save the interval models next to the point model"""
+    path = os.path.join(base_dir, 'models', 'quantile_models.pkl')
+    joblib.dump(quantile_models, path)
+    print(f"Quantile models saved to: {path}")
+    
+    serving_dir = os.path.join(base_dir, 'models', 'serving')
+    try:
+        for name in ('lower', 'upper'):
+            export_component(serving_dir, name, *model_arrays(quantile_models[name]))
+    except ValueError as e:
+        print(f"Quantile serving arrays not exported ({e})")
+
+
+def train_approval_classifier(X_train, approved_train):
+    """
+    Train a probabilistic classifier for P(visa approved).
+    Logistic regression gives calibrated probabilities out of the box and
+    is linear, so the service can score it in the same pass as the regressor.
+    """
+    print("\n--- Training Approval Classifier ---")
+    
+    classifier = LogisticRegression(max_iter=1000, C=1.0)
+    classifier.fit(X_train, approved_train)
+    print(f"  Logistic Regression on {len(approved_train)} samples "
+          f"({np.mean(approved_train)*100:.1f}% approved)")
+    
+    return classifier
+
+
+def expected_calibration_error(y_true, prob, n_bins=10):
+    """Average gap between predicted probability and observed rate, weighted by bin size"""
+    bins = np.minimum((prob * n_bins).astype(int), n_bins - 1)
+    ece = 0.0
+    for b in range(n_bins):
+        in_bin = bins == b
+        if in_bin.any():
+            ece += in_bin.mean() * abs(prob[in_bin].mean() - y_true[in_bin].mean())
+    return ece
+
+
+def evaluate_approval_classifier(classifier, X_test_scaled, approved_test, risk_score_test):
+    """Check discrimination and calibration of the approval probabilities"""
+    print("\n--- Evaluating Approval Classifier ---")
+    
+    approved_test = np.asarray(approved_test)
+    prob = classifier.predict_proba(X_test_scaled)[:, 1]
+    
+    # the old hard-coded buckets on risk score (85 / 70 / 50 percent)
+    risk = np.asarray(risk_score_test)
+    bucket_prob = np.where(risk <= 1, 0.85, np.where(risk <= 3, 0.70, 0.50))
+    
+    result = {
+        'Accuracy': accuracy_score(approved_test, prob >= 0.5),
+        'ROC AUC': roc_auc_score(approved_test, prob),
+        'Log Loss': log_loss(approved_test, prob),
+        'Brier Score': brier_score_loss(approved_test, prob),
+        'ECE': expected_calibration_error(approved_test, prob),
+        'Bucket Brier Score': brier_score_loss(approved_test, bucket_prob),
+        'Bucket ECE': expected_calibration_error(approved_test, bucket_prob)
+    }
+    
+    print(f"  ROC AUC: {result['ROC AUC']:.3f}")
+    print(f"  Brier score: {result['Brier Score']:.4f} (risk buckets: {result['Bucket Brier Score']:.4f})")
+    print(f"  Calibration error: {result['ECE']:.4f} (risk buckets: {result['Bucket ECE']:.4f})")
+    
+    return result
+
+
+def save_approval_classifier(classifier, base_dir):
+    """Save the approval classifier next to the regressor"""
+    path = os.path.join(base_dir, 'models', 'approval_classifier.pkl')
+    joblib.dump(classifier, path)
+    print(f"Approval classifier saved to: {path}")
+    
+    try:
+        export_component(os.path.join(base_dir, 'models', 'serving'), 'approval', *model_arrays(classifier))
+    except ValueError as e:
+        print(f"Approval serving arrays not exported ({e})")
+
+
 def print_summary(results_df, best_model_name):
     """Print final summary"""
     print("\n" + "=" * 60)
@@ -274,26 +537,59 @@ def print_summary(results_df, best_model_name):
     print("\n" + "=" * 60)
 
 
-def main():
-    print("=" * 60)
-    print("PREDICTIVE MODELING - VISA PROCESSING TIME")
-    print("Infosys Springboard - Milestone 3")
-    print("=" * 60)
-    
-    # step 1: load data
-    df, base_dir = load_data()
-    
+def parse_args(argv=None):
+    """Command line options for the training run (argv=None reads sys.argv)"""
+    parser = argparse.ArgumentParser(description="Train visa processing time models")
+    parser.add_argument('--search', action='store_true',
+                        help="tune tree models with successive halving before training")
+    parser.add_argument('--search-candidates', type=int, default=27,
+                        help="configs sampled per model for the search (default: 27)")
+    parser.add_argument('--search-time-limit', type=float, default=None,
+                        help="stop starting new search rounds after this many seconds")
+    parser.add_argument('--cv-folds', type=int, default=5,
+                        help="k for k-fold cross validation in the search (default: 5)")
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help="parallel workers for the search (default: all cores)")
+    parser.add_argument('--latency-weight', type=float, default=0.0,
+                        help="days of MAE one ms of single-row latency is worth when "
+                             "picking the best model (default: 0, accuracy only)")
+    parser.add_argument('--latency-budget-ms', type=float, default=None,
+                        help="reject models whose p99 single-row latency exceeds this; "
+                             "training fails without saving if none is within budget")
+    parser.add_argument('--split', choices=['time', 'random'], default='time',
+                        help="hold out the latest months (default) or a random 20%%")
+    return parser.parse_args(argv)
+
+
+def run_training(df, base_dir, args):
+    """Steps 2-11 of main on an already loaded featured DataFrame"""
     # step 2: prepare features
     X, y, feature_names = prepare_features(df)
     
     # step 3: split data
-    X_train, X_test, y_train, y_test = split_data(X, y)
+    periods = None
+    if args.split == 'time':
+        periods = df['application_year'] * 12 + df['application_month'] - 1
+    X_train, X_test, y_train, y_test = split_data(X, y, periods)
     
     # step 4: scale features
     X_train_scaled, X_test_scaled, scaler = scale_features(X_train, X_test)
     
-    # step 5: train models
-    models = train_models(X_train_scaled, y_train)
+    # step 5: tune (optional) and train models
+    tuned_params = None
+    if args.search:
+        tuned_params, search_summary = run_search(
+            X_train_scaled, y_train, base_dir,
+            n_candidates=args.search_candidates,
+            time_limit=args.search_time_limit,
+            cv=args.cv_folds,
+            n_jobs=args.n_jobs
+        )
+        search_path = os.path.join(base_dir, 'reports', 'hyperparameter_search.csv')
+        pd.DataFrame(search_summary).to_csv(search_path, index=False)
+        print(f"\nSearch results saved to: {search_path}")
+    
+    models = train_models(X_train_scaled, y_train, tuned_params)
     
     # step 6: evaluate models
     results_df = evaluate_models(models, X_test_scaled, y_test)
@@ -305,9 +601,29 @@ def main():
                            os.path.join(figures_dir, 'feature_importance.png'))
     
     # step 8: save best model
-    best_name, best_model = save_best_model(models, results_df, scaler, base_dir)
-    
-    # step 9: print summary
+    best_name, best_model = save_best_model(models, results_df, scaler, base_dir,
+                                            latency_weight=args.latency_weight,
+                                            latency_budget_ms=args.latency_budget_ms)
+    
+    # step 9: prediction interval models
+    quantile_models = train_quantile_models(X_train_scaled, y_train, best_model)
+    interval_result = evaluate_intervals(quantile_models, best_model, X_test_scaled, y_test)
+    save_quantile_models(quantile_models, base_dir)
+    interval_path = os.path.join(base_dir, 'reports', 'interval_coverage.csv')
+    pd.DataFrame([interval_result]).to_csv(interval_path, index=False)
+    print(f"Coverage results saved to: {interval_path}")
+    
+    # step 10: approval probability classifier (Approved vs Pending/Rejected)
+    approved = (df['visa_status_encoded'] == 2).astype(int)
+    classifier = train_approval_classifier(X_train_scaled, approved.loc[X_train.index])
+    approval_result = evaluate_approval_classifier(classifier, X_test_scaled,
+                                                   approved.loc[X_test.index], X_test['risk_score'])
+    save_approval_classifier(classifier, base_dir)
+    approval_path = os.path.join(base_dir, 'reports', 'approval_classifier.csv')
+    pd.DataFrame([approval_result]).to_csv(approval_path, index=False)
+    print(f"Classifier results saved to: {approval_path}")
+    
+    # step 11: print summary
     print_summary(results_df, best_name)
     
     # save results to file
@@ -315,6 +631,23 @@ def main():
     results_df.to_csv(results_path, index=False)
     print(f"\nResults saved to: {results_path}")
     
+    return best_name, results_df
+
+
+def main():
+    args = parse_args()
+    
+    print("=" * 60)
+    print("PREDICTIVE MODELING - VISA PROCESSING TIME")
+    print("Infosys Springboard - Milestone 3")
+    print("=" * 60)
+    
+    # step 1: load data
+    df, base_dir = load_data()
+    
+    # steps 2-11: features, split, train, evaluate, save
+    run_training(df, base_dir, args)
+    
     print("\nMILESTONE 3 COMPLETE!")
     print("=" * 60)
 
@@ -0,0 +1,161 @@
+# Queue Simulation Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 2
+# Simulates each processing center as a FIFO queue to estimate backlog and waiting time
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import time
+from data_preprocessing import read_table
+
+
+DAYS_PER_MONTH = 365.25 / 12
+
+
+def arrival_times(center_codes, periods):
+    """
+    Arrival time (in months) of each application: its month index plus an
+    even spread across the month, in file order within each (month, center).
+    """
+    n_centers = center_codes.max() + 1
+    cell = periods * n_centers + center_codes
+    counts = np.bincount(cell)
+    starts = np.cumsum(counts) - counts
+    order = np.argsort(cell, kind='stable')
+    rank = np.empty(len(cell), dtype=np.int64)
+    rank[order] = np.arange(len(cell)) - starts[cell[order]]
+    return periods + (rank + 0.5) / counts[cell]
+
+
+def estimate_capacity(center_codes, periods, utilization=0.95):
+    """Applications each center can finish per month, set so average load = utilization"""
+    n_months = periods.max() - periods.min() + 1
+    monthly_arrivals = np.bincount(center_codes) / n_months
+    return monthly_arrivals / utilization
+
+
+def simulate_center_queues(center_codes, times, capacity):
+    """
+    FIFO queue per center serving one application every 1/capacity months.
+    Departures follow d_i = max(a_i, d_(i-1)) + s, which unrolls to
+    d_i = s * (i + 1) + max_(j <= i) (a_j - s * j): a running maximum, so
+    every center is simulated with array operations and no per-event loop.
+    Returns per-application wait (months before service starts), queue
+    length seen on arrival, and departure time, in input order.
+    """
+    n = len(times)
+    order = np.lexsort((times, center_codes))
+    c = center_codes[order]
+    a = times[order]
+    s = 1.0 / capacity[c]
+
+    counts = np.bincount(c, minlength=len(capacity))
+    starts = np.cumsum(counts) - counts
+    i = np.arange(n) - starts[c]  # position in its center's queue
+
+    # offset each center's values above the previous one's so one global
+    # running max / searchsorted behaves as a per-center one
+    key = a - s * i
+    offset = key.max() - key.min() + 1.0
+    running = np.maximum.accumulate(key + c * offset) - c * offset
+    departure = s * (i + 1) + running
+
+    # a departure at the arrival instant counts as gone (tolerance absorbs float noise)
+    span = departure.max() + 1.0
+    departed = np.searchsorted(departure + c * span, a + c * span + 1e-9, side='right') - starts[c]
+
+    wait = np.empty(n)
+    queue_length = np.empty(n, dtype=np.int64)
+    depart = np.empty(n)
+    wait[order] = departure - s - a
+    queue_length[order] = i - departed
+    depart[order] = departure
+    return wait, queue_length, depart
+
+
+def simulate_backlog(df, utilization=0.95):
+    """
+    Run the queue simulation on an applications DataFrame.
+    Returns per-application features (known at arrival time) and a
+    snapshot of every center at the end of the latest month.
+    """
+    centers, center_names = pd.factorize(df['processing_center'], sort=True)
+    periods = ((df['application_year'] - df['application_year'].min()) * 12
+               + df['application_month'] - 1).to_numpy()
+    times = arrival_times(centers, periods)
+    capacity = estimate_capacity(centers, periods, utilization)
+    wait, queue_length, departure = simulate_center_queues(centers, times, capacity)
+
+    features = pd.DataFrame({
+        'center_queue_length': queue_length,
+        'center_queue_wait_days': wait * DAYS_PER_MONTH
+    }, index=df.index)
+
+    # state at the end of the last month in the data
+    end = periods.max() + 1
+    last_year = df['application_year'].min() + periods.max() // 12
+    snapshot = {
+        'as_of': f"{last_year}-{periods.max() % 12 + 1:02d}",
+        'utilization': utilization,
+        'centers': {}
+    }
+    for code, name in enumerate(center_names):
+        mine = centers == code
+        snapshot['centers'][name] = {
+            'backlog': int((departure[mine] > end).sum()),
+            'wait_days': round(float(max(0.0, departure[mine].max() - end) * DAYS_PER_MONTH), 2),
+            'capacity_per_month': round(float(capacity[code]), 2),
+            'arrivals_last_month': int((mine & (periods == periods.max())).sum())
+        }
+    return features, snapshot
+
+
+def save_backlog_snapshot(snapshot, path):
+    """Write the per-center snapshot the prediction service serves"""
+    with open(path, 'w') as f:
+        json.dump(snapshot, f, indent=1)
+    print(f"Center backlog saved to: {path}")
+
+
+def benchmark(n_applications=5000000, n_centers=8, n_months=12, seed=42):
+    """Time the simulation on a synthetic year of n_applications arrivals"""
+    rng = np.random.RandomState(seed)
+    centers = rng.randint(0, n_centers, n_applications)
+    periods = rng.randint(0, n_months, n_applications)
+    start = time.perf_counter()
+    times = arrival_times(centers, periods)
+    capacity = estimate_capacity(centers, periods)
+    simulate_center_queues(centers, times, capacity)
+    return time.perf_counter() - start
+
+
+def main():
+    print("=" * 60)
+    print("PROCESSING CENTER QUEUE SIMULATION")
+    print("=" * 60)
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_cleaned.csv')
+    df, data_path = read_table(data_path)
+    print(f"Loaded {len(df)} applications from: {data_path}")
+
+    features, snapshot = simulate_backlog(df)
+
+    print(f"\nCenters as of {snapshot['as_of']} (target utilization {snapshot['utilization']:.0%}):")
+    print(f"  {'Center':<12} {'Backlog':>8} {'Wait (days)':>12} {'Capacity/mo':>12} {'Last month':>11}")
+    for name, c in snapshot['centers'].items():
+        print(f"  {name:<12} {c['backlog']:>8} {c['wait_days']:>12.1f} "
+              f"{c['capacity_per_month']:>12.1f} {c['arrivals_last_month']:>11}")
+
+    print(f"\nMean queue wait seen on arrival: {features['center_queue_wait_days'].mean():.2f} days")
+    corr = features['center_queue_wait_days'].corr(df['processing_time_days'])
+    print(f"Correlation with processing time: {corr:.3f}")
+
+    seconds = benchmark()
+    print(f"\nScale check: 5,000,000 applications in one simulated year took {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
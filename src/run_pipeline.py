@@ -0,0 +1,323 @@
+# Pipeline Runner Script
+# Author: Harsh
+# Infosys Springboard Project
+# Runs generate -> preprocess -> (EDA | features) -> train as one DAG,
+# skipping stages whose code, parameters and inputs have not changed
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # stages only write PNGs, and may do so off the main thread
+import argparse
+import hashlib
+import json
+import os
+import random
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import generate_synthetic_data
+import data_preprocessing
+import eda_analysis
+import feature_engineering
+import model_training
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, 'src')
+STATE_DIR = os.path.join(BASE_DIR, '.pipeline')
+STATE_PATH = os.path.join(STATE_DIR, 'state.json')
+
+RAW_PATH = 'data/raw/visa_applications_raw.csv'
+CLEAN_PATH = 'data/processed/visa_applications_cleaned.csv'
+FEATURED_PATH = 'data/processed/visa_applications_featured.csv'
+
+
+# ============================================================
+# STAGES
+# Each stage gets the in-memory frames of its dependencies and returns
+# the frames it produces; files it writes are listed in 'outputs'.
+# ============================================================
+
+def stage_generate(frames, params):
+    # same seeds the script sets at import time, so reruns reproduce the data
+    np.random.seed(42)
+    random.seed(42)
+    df = generate_synthetic_data.generate_visa_dataset(params['num_records'])
+    df = generate_synthetic_data.introduce_missing_values(df)
+    df.to_csv(os.path.join(BASE_DIR, RAW_PATH), index=False)
+    return {'raw': df}
+
+
+def stage_preprocess(frames, params):
+    df_final, enc_maps = data_preprocessing.preprocess_dataframe(frames['raw'])
+    data_preprocessing.save_data(df_final, os.path.join(BASE_DIR, CLEAN_PATH))
+    data_preprocessing.save_encodings(
+        enc_maps, os.path.join(BASE_DIR, 'data', 'processed', 'encoding_mappings.txt'))
+    data_preprocessing.save_encodings_artifact(
+        enc_maps, os.path.join(BASE_DIR, 'data', 'processed', 'encodings.json'))
+    data_preprocessing.generate_summary_report(
+        df_final, os.path.join(BASE_DIR, 'reports', 'data_summary.txt'))
+    return {'cleaned': df_final}
+
+
+def stage_eda(frames, params):
+    figures_dir = eda_analysis.create_output_folder(BASE_DIR)
+    if params['large']:
+        # stream the file preprocess wrote instead of holding the frame
+        eda_analysis.render_large_figures(os.path.join(BASE_DIR, CLEAN_PATH), figures_dir)
+    else:
+        eda_analysis.render_all_figures(frames['cleaned'], figures_dir)
+    return {}
+
+
+def stage_features(frames, params):
+    df, backlog = feature_engineering.engineer_features(frames['cleaned'].copy())
+    feature_engineering.save_featured_data(df, BASE_DIR)
+    feature_engineering.save_center_backlog(backlog, BASE_DIR)
+    return {'featured': df}
+
+
+def stage_train(frames, params):
+    args = model_training.parse_args(shlex.split(params['train_args']))
+    model_training.run_training(frames['featured'], BASE_DIR, args)
+    return {}
+
+
+FIGURES = ['reports/figures/' + f for f in eda_analysis.FIGURE_FILES.values()]
+
+STAGES = {
+    'generate': {
+        'run': stage_generate, 'deps': [], 'consumes': [], 'produces': ['raw'],
+        'code': ['generate_synthetic_data.py'],
+        'outputs': [RAW_PATH]
+    },
+    'preprocess': {
+        'run': stage_preprocess, 'deps': ['generate'], 'consumes': ['raw'], 'produces': ['cleaned'],
+        'code': ['data_preprocessing.py'],
+        'outputs': [CLEAN_PATH, data_preprocessing.typed_path(CLEAN_PATH),
+                    'data/processed/encoding_mappings.txt', 'data/processed/encodings.json',
+                    'reports/data_summary.txt']
+    },
+    'eda': {
+        'run': stage_eda, 'deps': ['preprocess'], 'consumes': ['cleaned'], 'produces': [],
+        'code': ['eda_analysis.py'],
+        'outputs': FIGURES
+    },
+    'features': {
+        'run': stage_features, 'deps': ['preprocess'], 'consumes': ['cleaned'], 'produces': ['featured'],
+        'code': ['feature_engineering.py', 'queue_simulation.py'],
+        'outputs': [FEATURED_PATH, data_preprocessing.typed_path(FEATURED_PATH),
+                    'data/processed/center_backlog.json']
+    },
+    'train': {
+        'run': stage_train, 'deps': ['features'], 'consumes': ['featured'], 'produces': [],
+        'code': ['model_training.py', 'hyperparameter_search.py', 'model_profiling.py', 'fast_inference.py'],
+        'outputs': ['models/best_model.pkl', 'models/scaler.pkl', 'models/encodings.json',
+                    'models/quantile_models.pkl', 'models/serving/manifest.json',
+                    'models/approval_classifier.pkl', 'reports/model_results.csv',
+                    'reports/figures/model_comparison.png', 'reports/figures/feature_importance.png']
+    }
+}
+
+# where a frame lives on disk if its producer is skipped
+FRAME_CSV = {'raw': RAW_PATH, 'cleaned': CLEAN_PATH, 'featured': FEATURED_PATH}
+
+
+# ============================================================
+# HASHING AND STATE
+# ============================================================
+
+def hash_file(path, block_size=1 << 20):
+    """sha256 of a file's contents, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def stage_key(name, params, state):
+    """Hash of the stage's code, its parameters and the content of its inputs"""
+    stage = STAGES[name]
+    digest = hashlib.sha256()
+    for code_file in stage['code']:
+        digest.update(code_file.encode())
+        digest.update((hash_file(os.path.join(SRC_DIR, code_file)) or '').encode())
+    digest.update(json.dumps(params.get(name, {}), sort_keys=True).encode())
+    for dep in stage['deps']:
+        digest.update(json.dumps(state.get(dep, {}).get('outputs', {}), sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def is_up_to_date(name, key, state):
+    """Key matches the last run and every output still has the content it was left with"""
+    entry = state.get(name)
+    if entry is None or entry['key'] != key:
+        return False
+    return all(hash_file(os.path.join(BASE_DIR, path)) == h for path, h in entry['outputs'].items())
+
+
+def load_state():
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state):
+    with open(STATE_PATH, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def load_frame(name):
+    """Get a frame whose producer was skipped (typed Parquet copy when there is one)"""
+    df, _ = data_preprocessing.read_table(os.path.join(BASE_DIR, FRAME_CSV[name]))
+    return df
+
+
+class StageInputs(dict):
+    """Frames for one stage: those in memory up front, the rest read from disk on first use"""
+
+    def __missing__(self, name):
+        self[name] = load_frame(name)
+        return self[name]
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def upstream_closure(targets):
+    """Targets plus everything they depend on, in topological order"""
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in STAGES[name]['deps']:
+            visit(dep)
+        order.append(name)
+
+    for target in targets:
+        visit(target)
+    return order
+
+
+def run_pipeline(targets=None, params=None, force=(), jobs=2, dry_run=False):
+    """
+    Run the stages needed for targets (default: all). Independent stages
+    (EDA and feature engineering) run concurrently, up-to-date stages are
+    skipped, and DataFrames move between stages in memory.
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    params = params or {}
+    state = load_state()
+    order = upstream_closure(targets or list(STAGES))
+    frames = {}
+    done, summary = set(), []
+
+    def execute(name):
+        stage = STAGES[name]
+        inputs = StageInputs({frame: frames[frame] for frame in stage['consumes'] if frame in frames})
+        start = time.time()
+        produced = stage['run'](inputs, params.get(name, {}))
+        return produced, time.time() - start
+
+    pending = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # start every stage whose dependencies have finished
+            for name in list(pending):
+                if not all(dep in done or dep not in order for dep in STAGES[name]['deps']):
+                    continue
+                pending.remove(name)
+                key = stage_key(name, params, state)
+                if name not in force and is_up_to_date(name, key, state):
+                    print(f"[pipeline] {name}: up to date, skipped")
+                    summary.append((name, 'skipped', 0.0))
+                    done.add(name)
+                    continue
+                if dry_run:
+                    print(f"[pipeline] {name}: would run")
+                    summary.append((name, 'would run', 0.0))
+                    done.add(name)
+                    continue
+                print(f"[pipeline] {name}: running")
+                running[pool.submit(execute, name)] = (name, key)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key = running.pop(future)
+                produced, seconds = future.result()
+                frames.update(produced)
+                state[name] = {
+                    'key': key,
+                    'outputs': {path: hash_file(os.path.join(BASE_DIR, path)) for path in STAGES[name]['outputs']}
+                }
+                save_state(state)
+                print(f"[pipeline] {name}: done in {seconds:.1f}s")
+                summary.append((name, 'ran', seconds))
+                done.add(name)
+
+    return summary
+
+
+def parse_args():
+    """Command line options for the pipeline runner"""
+    parser = argparse.ArgumentParser(description="Run the visa ML pipeline, skipping up-to-date stages")
+    parser.add_argument('targets', nargs='*', default=[],
+                        help=f"stages to bring up to date, with their dependencies "
+                             f"(default: all of {', '.join(STAGES)})")
+    parser.add_argument('--force', nargs='*', default=[], choices=list(STAGES),
+                        help="rerun these stages even if up to date")
+    parser.add_argument('--jobs', type=int, default=2,
+                        help="stages allowed to run at the same time (default: 2)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="only report which stages would run")
+    parser.add_argument('--num-records', type=int, default=2000,
+                        help="rows for the generate stage (default: 2000)")
+    parser.add_argument('--large-eda', action='store_true',
+                        help="use the streaming large-data EDA mode")
+    parser.add_argument('--train-args', default='',
+                        help="extra options passed to model_training.py, e.g. \"--search\"")
+    args = parser.parse_args()
+    unknown = [t for t in args.targets if t not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 60)
+    print("VISA ML PIPELINE")
+    print("=" * 60)
+
+    params = {
+        'generate': {'num_records': args.num_records},
+        'eda': {'large': args.large_eda},
+        'train': {'train_args': args.train_args}
+    }
+    start = time.time()
+    summary = run_pipeline(args.targets, params, force=set(args.force), jobs=args.jobs,
+                           dry_run=args.dry_run)
+
+    print("\n" + "=" * 60)
+    print("PIPELINE SUMMARY")
+    print("=" * 60)
+    for name, status, seconds in summary:
+        print(f"  {name:<12} {status:<10} {seconds:6.1f}s")
+    print(f"\nTotal: {time.time() - start:.1f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
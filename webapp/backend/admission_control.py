@@ -0,0 +1,154 @@
+# Admission Control for the Visa Processing Time Estimator API
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Per-client token-bucket rate limiting and a concurrency cap on the inference routes
+#
+# Settings (environment):
+#   RATE_LIMIT_RPS              sustained requests/s per client on /api routes (default 0 = off; e.g. 20)
+#   RATE_LIMIT_BURST            bucket size, i.e. allowed burst (default 60)
+#   MAX_INFERENCE_CONCURRENCY   in-flight prediction requests per worker (default 32, 0 = off)
+#   TRUST_PROXY_HEADERS         1 = identify clients by X-Forwarded-For, as added by the proxies
+#   TRUSTED_PROXY_HOPS          proxies in front of the app that append to X-Forwarded-For
+#                               (default 1): the client is the entry that many from the right.
+#                               Entries further left are whatever the client sent, so they are
+#                               never used; with fewer entries the socket address is used
+#   API_KEYS                    comma separated keys that get their own bucket (X-API-Key);
+#                               any other key is ignored and the client is limited by address
+#
+# Rate limiting is off by default. Behind a reverse proxy (Render, Heroku, nginx)
+# every request arrives from the proxy's address, so turning it on without
+# TRUST_PROXY_HEADERS=1 (and TRUSTED_PROXY_HOPS matching the proxies in front)
+# would put all users in one bucket. See the commented envVars in webapp/render.yaml.
+
+import math
+import os
+import time
+from collections import OrderedDict
+
+API_KEY_HEADER = b'x-api-key'
+FORWARDED_HEADER = b'x-forwarded-for'
+
+
+class TokenBucketLimiter:
+    """
+    One token bucket per client, refilled at `rate` tokens/s up to `burst`.
+    Buckets live in an LRU capped at max_clients, so memory is bounded and
+    each check is a dict lookup plus a move-to-end. A client evicted after
+    going quiet simply starts again with a full bucket.
+    """
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+
+    def acquire(self, client, now=None) -> float:
+        """Take one token for client; returns 0 when allowed, else seconds until a token is due"""
+        now = time.monotonic() if now is None else now
+        tokens, last = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load before it reaches a route:
+    429 + Retry-After when a client's bucket is empty, 503 + Retry-After
+    when the worker already has max_inference requests predicting.
+    The event loop runs one request step at a time, so the counters need
+    no locks.
+    """
+
+    def __init__(self, app, limiter=None, max_inference=0, rate_limited_prefix='/api/',
+                 inference_prefix=('/api/predict', '/api/explain'), trust_proxy_headers=False,
+                 api_keys=(), trusted_proxy_hops=1):
+        self.app = app
+        self.limiter = limiter
+        self.max_inference = max_inference
+        self.rate_limited_prefix = rate_limited_prefix
+        self.inference_prefix = inference_prefix
+        self.trust_proxy_headers = trust_proxy_headers
+        self.trusted_proxy_hops = max(1, trusted_proxy_hops)
+        # bytes, as they arrive in the headers; only these keys earn a bucket
+        self.api_keys = frozenset(k.encode('latin-1') if isinstance(k, str) else k for k in api_keys)
+        self.in_flight = 0
+        self.rejected = {429: 0, 503: 0}
+
+    @classmethod
+    def settings_from_env(cls) -> dict:
+        """Keyword arguments for add_middleware from the environment"""
+        rate = float(os.environ.get('RATE_LIMIT_RPS', '0'))
+        burst = float(os.environ.get('RATE_LIMIT_BURST', '60'))
+        return {
+            'limiter': TokenBucketLimiter(rate, burst) if rate > 0 else None,
+            'max_inference': int(os.environ.get('MAX_INFERENCE_CONCURRENCY', '32')),
+            'trust_proxy_headers': os.environ.get('TRUST_PROXY_HEADERS', '0') == '1',
+            'trusted_proxy_hops': int(os.environ.get('TRUSTED_PROXY_HOPS', '1')),
+            'api_keys': [k.strip() for k in os.environ.get('API_KEYS', '').split(',') if k.strip()]
+        }
+
+    def client_id(self, scope) -> str:
+        """
+        A configured API key when the client sends one, else its address.
+        Unknown keys are ignored: otherwise a client could send a fresh key
+        per request, get a full bucket each time and flood the LRU. For the
+        same reason only X-Forwarded-For entries added by our own proxies
+        (counted from the right) are trusted, never what the client sent.
+        """
+        forwarded = []
+        for name, value in scope['headers']:
+            if name == API_KEY_HEADER and value in self.api_keys:
+                return 'key:' + value.decode('latin-1')
+            if name == FORWARDED_HEADER:
+                forwarded.extend(value.split(b','))
+        if self.trust_proxy_headers and len(forwarded) >= self.trusted_proxy_hops:
+            address = forwarded[-self.trusted_proxy_hops].strip()
+            if address:
+                return 'ip:' + address.decode('latin-1')
+        client = scope.get('client')
+        return 'ip:' + (client[0] if client else 'unknown')
+
+    async def reject(self, send, status, detail, retry_after):
+        self.rejected[status] += 1
+        body = ('{"detail": "%s"}' % detail).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'),
+                        (b'content-length', str(len(body)).encode()),
+                        (b'retry-after', str(max(1, math.ceil(retry_after))).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        path = scope['path']
+
+        if self.limiter is not None and path.startswith(self.rate_limited_prefix):
+            wait = self.limiter.acquire(self.client_id(scope))
+            if wait > 0:
+                await self.reject(send, 429, "Rate limit exceeded", wait)
+                return
+
+        if self.max_inference <= 0 or not path.startswith(self.inference_prefix):
+            await self.app(scope, receive, send)
+            return
+        if self.in_flight >= self.max_inference:
+            await self.reject(send, 503, "Server busy, retry shortly", 1)
+            return
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -2,15 +2,25 @@
 # Author: Harsh
 # Infosys Springboard Project - Milestone 4
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional, get_args
+import json
 import os
 
-from prediction_service import get_prediction_service
+try:
+    import orjson
+except ImportError:  # the fast route falls back to the standard json module
+    orjson = None
+
+from prediction_service import get_prediction_service, ApplicationRecord
+from static_assets import StaticAssets
+from prediction_cache import cache_from_env
+from request_profiler import RequestProfiler, ProfilingMiddleware
+from admission_control import AdmissionControlMiddleware
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -19,24 +29,47 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# CORS middleware for frontend
+# Rate limiting and overload shedding (settings in admission_control.py);
+# added before CORS so that 429/503 responses still carry CORS headers
+app.add_middleware(AdmissionControlMiddleware, **AdmissionControlMiddleware.settings_from_env())
+
+# CORS middleware for frontend (ALLOWED_ORIGINS: comma separated, default any);
+# credentials are only allowed for an explicit list of origins
+allowed_origins = [o.strip() for o in os.environ.get("ALLOWED_ORIGINS", "*").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=allowed_origins,
+    allow_credentials="*" not in allowed_origins,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (PROFILE_REQUESTS, see request_profiler.py);
+# when off, neither the middleware nor the debug routes exist
+request_profiler = RequestProfiler.from_env()
+if request_profiler is not None:
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
 # Initialize prediction service
 prediction_service = None
 
+# Optional cache shared by the workers (PREDICTION_CACHE, see prediction_cache.py)
+prediction_cache = None
+
 
 @app.on_event("startup")
 async def startup_event():
     """Load the prediction service on startup"""
-    global prediction_service
+    global prediction_service, prediction_cache
     prediction_service = get_prediction_service()
+    prediction_cache = cache_from_env(prediction_service.model_version)
+    if prediction_cache is not None:
+        print(f"✓ Prediction cache: {type(prediction_cache.backend).__name__} "
+              f"(model version {prediction_service.model_version})")
+    if static_assets is not None:
+        print(f"✓ Frontend: {len(static_assets.assets)} files from {frontend_path}")
+    else:
+        print(f"⚠ Frontend not found at {frontend_path}, serving the API only")
     print("✓ API server started successfully!")
 
 
@@ -55,6 +88,7 @@ class VisaApplication(BaseModel):
     documents_complete: bool = Field(default=True, description="All documents submitted")
     express_processing: bool = Field(default=False, description="Express processing requested")
     application_month: int = Field(default=1, ge=1, le=12, description="Application month (1-12)")
+    processing_center: Optional[str] = Field(default=None, description="Processing center, if known")
 
 
 class PredictionResponse(BaseModel):
@@ -72,6 +106,185 @@ class PredictionResponse(BaseModel):
     factors: dict
 
 
+class ExplainRequest(BaseModel):
+    """Applications to explain in one call, e.g. an estimate and its what-if scenarios"""
+    applications: List[VisaApplication] = Field(..., min_length=1, max_length=100)
+
+
+# Field checks for the fast route, read from VisaApplication so both routes
+# enforce the same required fields, types and bounds:
+# (name, type, nullable, required, default, ge, le)
+def _field_checks(model):
+    checks = []
+    for name, field in model.model_fields.items():
+        args = get_args(field.annotation)  # Optional[str] -> (str, NoneType)
+        nullable = type(None) in args
+        kind = next(t for t in args if t is not type(None)) if args else field.annotation
+        ge = next((m.ge for m in field.metadata if hasattr(m, 'ge')), None)
+        le = next((m.le for m in field.metadata if hasattr(m, 'le')), None)
+        default = None if field.is_required() else field.default
+        checks.append((name, kind, nullable, field.is_required(), default, ge, le))
+    return checks
+
+
+FAST_FIELD_CHECKS = _field_checks(VisaApplication)
+
+
+def parse_application_fast(data: dict):
+    """
+    Validate a decoded JSON body straight into an ApplicationRecord.
+    JSON types are taken strictly (no string-to-number coercion); an
+    integral float is accepted for an int field.
+    Returns (record, errors) with errors in FastAPI's 422 detail format.
+    """
+    record = ApplicationRecord.__new__(ApplicationRecord)
+    errors = []
+    for name, kind, nullable, required, default, ge, le in FAST_FIELD_CHECKS:
+        value = data.get(name, default)
+        if name not in data and required:
+            errors.append({'loc': ['body', name], 'msg': 'Field required', 'type': 'missing'})
+            continue
+        if value is None and nullable:
+            setattr(record, name, None)
+            continue
+        if kind is bool:
+            ok = isinstance(value, bool)
+        elif kind is int:
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            ok = isinstance(value, int) and not isinstance(value, bool)
+        elif kind is float:
+            ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        else:
+            ok = isinstance(value, kind)
+        if not ok:
+            errors.append({'loc': ['body', name], 'msg': f'Input should be a valid {kind.__name__}',
+                           'type': f'{kind.__name__}_type'})
+        elif ge is not None and value < ge:
+            errors.append({'loc': ['body', name], 'msg': f'Input should be greater than or equal to {ge}',
+                           'type': 'greater_than_equal'})
+        elif le is not None and value > le:
+            errors.append({'loc': ['body', name], 'msg': f'Input should be less than or equal to {le}',
+                           'type': 'less_than_equal'})
+        else:
+            setattr(record, name, value)
+    return record, errors
+
+
+def dumps(content) -> bytes:
+    """JSON bytes via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content).encode()
+
+
+def loads(body: bytes):
+    """Parse JSON bytes via orjson when available"""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def decode_application(body: bytes):
+    """Decode one JSON object into an ApplicationRecord; returns (record, errors)"""
+    try:
+        data = loads(body)
+    except ValueError:
+        return None, [{"loc": ["body"], "msg": "Invalid JSON", "type": "json_invalid"}]
+    if not isinstance(data, dict):
+        return None, [{"loc": ["body"], "msg": "Input should be an object", "type": "model_type"}]
+    return parse_application_fast(data)
+
+
+def json_response(content, status_code: int = 200) -> Response:
+    """Serialize once (orjson when available) and send the bytes as-is"""
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
+
+
+def record_key(record: ApplicationRecord) -> bytes:
+    """
+    Cache key payload for an application: all of its fields, in slot order.
+    Whole floats are keyed as ints, so 15000 and 15000.0 (as the validated
+    route coerces it) share an entry.
+    """
+    values = [getattr(record, name) for name in ApplicationRecord.__slots__]
+    return dumps([int(v) if isinstance(v, float) and v.is_integer() else v for v in values])
+
+
+def cached_predict(record: ApplicationRecord) -> bytes:
+    """Prediction JSON for a record, from the shared cache when enabled"""
+    if prediction_cache is None:
+        return dumps(prediction_service.predict(record))
+    return prediction_cache.get_or_compute("predict", record_key(record),
+                                           lambda: prediction_service.predict(record), dumps)
+
+
+def cached_json_response(kind: str, compute) -> Response:
+    """JSON response for a statistics payload, from the shared cache when enabled"""
+    if prediction_cache is None:
+        return json_response(compute())
+    return Response(content=prediction_cache.get_or_compute(kind, b"", compute, dumps),
+                    media_type="application/json")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for a generator that is still reading the request body.
+    Starlette's version also waits on receive() for a client disconnect,
+    which would swallow the body chunks the generator needs; here a
+    disconnect surfaces through request.stream() instead.
+    """
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def ndjson_lines(request: Request):
+    """Yield (line number, line) for each non-blank line of the body as it arrives"""
+    pending = b''
+    line_number = 0
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if pending.strip():
+        yield line_number + 1, pending
+
+
+def score_ndjson_batch(batch) -> bytes:
+    """Score the valid lines of a batch together and render every line, in input order"""
+    records = [record for _, record, errors in batch if not errors]
+    try:
+        results = iter(prediction_service.predict_batch(records))
+        failure = None
+    except Exception as e:
+        failure = f"Prediction error: {str(e)}"
+    out = []
+    for line_number, record, errors in batch:
+        if errors:
+            out.append(dumps({"line": line_number, "error": errors}))
+        elif failure is not None:
+            out.append(dumps({"line": line_number, "error": failure}))
+        else:
+            out.append(dumps({"line": line_number, "prediction": next(results)}))
+    return b'\n'.join(out) + b'\n'
+
+
+async def stream_predictions(request: Request, batch_size: int):
+    """Parse NDJSON lines as they arrive and emit each scored batch as soon as it is full"""
+    batch, n_valid = [], 0
+    async for line_number, line in ndjson_lines(request):
+        record, errors = decode_application(line)
+        batch.append((line_number, record, errors))
+        n_valid += not errors
+        # flush on enough valid rows, or on a long run of bad ones
+        if n_valid >= batch_size or len(batch) >= 4 * batch_size:
+            yield await run_in_threadpool(score_ndjson_batch, batch)
+            batch, n_valid = [], 0
+    if batch:
+        yield await run_in_threadpool(score_ndjson_batch, batch)
+
+
 # API Endpoints
 @app.get("/api/health")
 async def health_check():
@@ -91,18 +304,72 @@ async def predict_processing_time(application: VisaApplication):
         raise HTTPException(status_code=503, detail="Prediction service not initialized")
     
     try:
-        # Convert to dict for prediction service
-        app_dict = application.model_dump()
-        
-        # Get prediction
-        result = prediction_service.predict(app_dict)
+        # The service reads the request model's fields directly (no dict copy)
+        if prediction_cache is None:
+            return prediction_service.predict(application)
         
-        return result
+        return loads(cached_predict(ApplicationRecord.parse(application)))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
+@app.post("/api/predict/fast")
+async def predict_processing_time_fast(request: Request):
+    """
+    Same prediction as /api/predict on a leaner path: the body is decoded
+    with orjson directly into the service's ApplicationRecord, and the
+    result is serialized once, without re-validating it against
+    PredictionResponse.
+    """
+    if prediction_service is None:
+        return json_response({"detail": "Prediction service not initialized"}, 503)
+    
+    record, errors = decode_application(await request.body())
+    if errors:
+        return json_response({"detail": errors}, 422)
+    
+    try:
+        return Response(content=cached_predict(record), media_type="application/json")
+    except Exception as e:
+        return json_response({"detail": f"Prediction error: {str(e)}"}, 500)
+
+
+@app.post("/api/predict/stream")
+async def predict_processing_time_stream(request: Request,
+                                         batch_size: int = Query(default=256, ge=1, le=10000)):
+    """
+    Bulk scoring: POST one application per line (NDJSON) and read back one
+    result per line, streamed as batches are scored, so neither side has to
+    hold the whole job in memory. Output lines carry the input line number
+    and either a "prediction" or an "error" (bad lines do not stop the job).
+    """
+    if prediction_service is None:
+        return json_response({"detail": "Prediction service not initialized"}, 503)
+    
+    return RequestStreamingResponse(stream_predictions(request, batch_size), media_type="application/x-ndjson")
+
+
+@app.post("/api/explain")
+async def explain_predictions(request: ExplainRequest):
+    """
+    Why an estimate is long or short: every feature's contribution in days
+    to predicted_days, largest first, for each application in the batch.
+    baseline_days (the model's average estimate) plus the contributions
+    adds up to predicted_days; rounding_days carries the difference the
+    rounding of the shown values leaves, so all three sum exactly.
+    """
+    if prediction_service is None:
+        return json_response({"detail": "Prediction service not initialized"}, 503)
+    if not prediction_service.explainable:
+        return json_response({"detail": f"Explanations are not available for {prediction_service.model_name}"}, 501)
+    
+    try:
+        return json_response({"explanations": prediction_service.explain_batch(request.applications)})
+    except Exception as e:
+        return json_response({"detail": f"Explanation error: {str(e)}"}, 500)
+
+
 @app.get("/api/statistics")
 async def get_statistics():
     """
@@ -113,7 +380,7 @@ async def get_statistics():
     if prediction_service is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
     
-    return prediction_service.get_statistics()
+    return cached_json_response("statistics", prediction_service.get_statistics)
 
 
 @app.get("/api/visa-types")
@@ -122,7 +389,7 @@ async def get_visa_types():
     if prediction_service is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
     
-    return prediction_service.get_visa_type_stats()
+    return cached_json_response("visa-types", prediction_service.get_visa_type_stats)
 
 
 @app.get("/api/countries")
@@ -131,7 +398,39 @@ async def get_countries():
     if prediction_service is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
     
-    return prediction_service.get_country_stats()
+    return cached_json_response("countries", prediction_service.get_country_stats)
+
+
+@app.get("/api/stats/cube")
+async def query_stats_cube(nationality: Optional[List[str]] = Query(default=None),
+                           visa_type: Optional[List[str]] = Query(default=None),
+                           month: Optional[List[int]] = Query(default=None),
+                           group_by: Optional[List[str]] = Query(default=None)):
+    """
+    Processing time and approval statistics from the pre-aggregated
+    (nationality x visa_type x month) cube. Repeat a filter to keep several
+    values (e.g. ?nationality=UK&nationality=USA); group_by lists the
+    dimensions to break down by, all others are rolled up.
+    """
+    if prediction_service is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+    
+    filters = {"nationality": nationality, "visa_type": visa_type, "month": month}
+    filters = {dim: values for dim, values in filters.items() if values}
+    try:
+        rows = prediction_service.query_stats_cube(filters, group_by or [])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"group_by": group_by or [], "filters": filters, "rows": rows}
+
+
+@app.get("/api/centers/backlog")
+async def get_center_backlog():
+    """Estimated current backlog and wait per processing center (queue simulation)"""
+    if prediction_service is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+    
+    return prediction_service.get_center_backlog()
 
 
 @app.get("/api/options")
@@ -140,13 +439,47 @@ async def get_options():
     if prediction_service is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
     
-    stats = prediction_service.get_statistics()
-    return {
-        "nationalities": stats['nationalities'],
-        "visa_types": stats['visa_types'],
-        "occupations": stats['occupations'],
-        "education_levels": stats['education_levels']
-    }
+    def options():
+        stats = prediction_service.get_statistics()
+        return {
+            "nationalities": stats['nationalities'],
+            "visa_types": stats['visa_types'],
+            "occupations": stats['occupations'],
+            "education_levels": stats['education_levels']
+        }
+    
+    return cached_json_response("options", options)
+
+
+if request_profiler is not None:
+    @app.get("/api/debug/profile")
+    async def get_profile(limit: int = Query(default=25, ge=1, le=500),
+                          sort: str = Query(default="cumulative", pattern="^(cumulative|total)$")):
+        """
+        Top functions across the requests profiled by this worker. Exact only
+        when requests_overlapped is 0: other requests running on the loop
+        meanwhile are counted in (see request_profiler.py).
+        """
+        return {
+            "requests_profiled": request_profiler.requests,
+            "profiled_seconds": round(request_profiler.seconds, 4),
+            "requests_overlapped": request_profiler.overlapped,
+            "overlapping_requests": request_profiler.overlapping_requests,
+            "sample_rate": request_profiler.sample_rate,
+            "functions": request_profiler.top_functions(limit, sort)
+        }
+    
+    @app.get("/api/debug/profile/collapsed")
+    async def get_profile_collapsed():
+        """Aggregated profile as collapsed stacks, for flamegraph tools"""
+        return Response(content=request_profiler.collapsed_stacks(), media_type="text/plain",
+                        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'})
+    
+    @app.delete("/api/debug/profile")
+    async def reset_profile():
+        """Drop the aggregated profile"""
+        request_profiler.reset()
+        return {"status": "reset"}
 
 
 # Serve frontend static files
@@ -154,93 +487,19 @@ async def get_options():
 _backend_dir = os.path.dirname(os.path.abspath(__file__))
 frontend_path = os.path.normpath(os.path.join(_backend_dir, "..", "frontend"))
 
-# Debug: print path on startup
-print(f"Looking for frontend at: {frontend_path}")
-print(f"Frontend exists: {os.path.exists(frontend_path)}")
-if os.path.exists(frontend_path):
-    print(f"Frontend files: {os.listdir(frontend_path)}")
+static_assets = None
 
 if os.path.exists(frontend_path):
-    # Helper function to create response with no-cache headers
-    def create_file_response(file_path: str, media_type: str = None):
-        """Create FileResponse with no-cache headers"""
-        response = FileResponse(file_path, media_type=media_type)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        return response
-    
-    @app.get("/styles.css")
-    async def serve_css():
-        """Serve CSS file"""
-        return create_file_response(
-            os.path.join(frontend_path, "styles.css"), 
-            media_type="text/css"
-        )
-    
-    @app.get("/app.js")
-    async def serve_js():
-        """Serve JavaScript file"""
-        return create_file_response(
-            os.path.join(frontend_path, "app.js"), 
-            media_type="application/javascript"
-        )
-    
-    @app.get("/")
-    async def serve_home():
-        """Serve the home page"""
-        return create_file_response(
-            os.path.join(frontend_path, "index.html"),
-            media_type="text/html"
-        )
-    
-    @app.get("/predict")
-    async def serve_predict():
-        """Serve the prediction page"""
-        return create_file_response(
-            os.path.join(frontend_path, "predict.html"),
-            media_type="text/html"
-        )
-    
-    @app.get("/predict.html")
-    async def serve_predict_html():
-        """Serve the prediction page (with .html extension)"""
-        return create_file_response(
-            os.path.join(frontend_path, "predict.html"),
-            media_type="text/html"
-        )
-    
-    @app.get("/visa-info")
-    async def serve_visa_info():
-        """Serve the visa information page"""
-        return create_file_response(
-            os.path.join(frontend_path, "visa-info.html"),
-            media_type="text/html"
-        )
-    
-    @app.get("/visa-info.html")
-    async def serve_visa_info_html():
-        """Serve the visa information page (with .html extension)"""
-        return create_file_response(
-            os.path.join(frontend_path, "visa-info.html"),
-            media_type="text/html"
-        )
-    
-    @app.get("/compare")
-    async def serve_compare():
-        """Serve the country comparison page"""
-        return create_file_response(
-            os.path.join(frontend_path, "compare.html"),
-            media_type="text/html"
-        )
-    
-    @app.get("/compare.html")
-    async def serve_compare_html():
-        """Serve the country comparison page (with .html extension)"""
-        return create_file_response(
-            os.path.join(frontend_path, "compare.html"),
-            media_type="text/html"
-        )
+    # Pages, script and stylesheet are held in memory (precompressed, with
+    # ETags); every page answers at both /name and /name.html
+    static_assets = StaticAssets(frontend_path)
+    
+    async def serve_asset(request: Request, v: Optional[str] = None):
+        """Serve a frontend file from memory"""
+        return static_assets.response(request.url.path, request.headers, query_version=v)
+    
+    for _path in static_assets.routes:
+        app.add_api_route(_path, serve_asset, methods=["GET"], include_in_schema=False)
 
 
 # Run with: uvicorn app:app --reload --port 8000
@@ -0,0 +1,121 @@
+# Array Model Runtime for the Visa Processing Time Estimator
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Scores the models exported to models/serving (src/fast_inference.py) with NumPy alone:
+# arrays are memory-mapped .npy files, so loading is a few file opens, with no pickle or sklearn
+
+import json
+import os
+import numpy as np
+
+
+class ArrayScaler:
+    """StandardScaler parameters (same attribute names, so callers need not care)"""
+
+    def __init__(self, meta, arrays):
+        self.mean_ = arrays['mean']
+        self.scale_ = arrays['scale']
+        if meta.get('feature_names'):
+            self.feature_names_in_ = np.array(meta['feature_names'], dtype=object)
+
+
+class ArrayLinear:
+    """Linear model: X @ coef + intercept"""
+
+    def __init__(self, meta, arrays):
+        self.name = meta['name']
+        self.coef_ = arrays['coef']
+        self.intercept_ = arrays['intercept']
+
+    def predict(self, X):
+        return X @ self.coef_ + self.intercept_[0]
+    
+    def contributions(self, X):
+        """(intercept, coef * x per feature): exact, they add up to predict(X)"""
+        return float(self.intercept_[0]), X * self.coef_
+
+
+class ArrayLogistic(ArrayLinear):
+    """Binary logistic regression; predict_proba returns [P(0), P(1)] columns"""
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.predict(X)))
+        return np.column_stack([1.0 - p, p])
+
+
+class ArrayTrees:
+    """
+    Tree ensemble as stacked node arrays (leaves point to themselves), walked
+    max_depth levels for every (row, tree) pair at once. Internal nodes hold
+    the mean value of the leaves below them, which contributions() uses.
+    """
+
+    def __init__(self, meta, arrays):
+        self.name = meta['name']
+        self.max_depth = int(meta['max_depth'])
+        self.scale = float(meta['scale'])
+        self.baseline = float(meta['baseline'])
+        self.float32_inputs = bool(meta['float32_inputs'])
+        for key in ('feature', 'threshold', 'left', 'right', 'value', 'missing_left', 'roots'):
+            setattr(self, key, arrays[key])
+
+    def _walk(self, X):
+        """Yield (node, child) index arrays, shape (n_rows, n_trees), for each level"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.float32_inputs:
+            X = X.astype(np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        idx = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[idx]]
+            go_left = (x <= self.threshold[idx]) | (np.isnan(x) & self.missing_left[idx])
+            child = np.where(go_left, self.left[idx], self.right[idx])
+            yield idx, child
+            idx = child
+    
+    def predict(self, X):
+        idx = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _, idx in self._walk(X):
+            pass
+        return self.value[idx].sum(axis=1) * self.scale + self.baseline
+    
+    def contributions(self, X):
+        """
+        Path (Saabas) attribution: at every split a row passes, the change from
+        the node's value to the child's is credited to the split feature.
+        Returns (expected value, contributions of shape X.shape); the two add
+        up to predict(X). Leaves step to themselves, so they add nothing.
+        """
+        n_rows, n_features = np.shape(X)
+        cells = np.arange(n_rows)[:, None] * n_features
+        totals = np.zeros(n_rows * n_features)
+        for idx, child in self._walk(X):
+            totals += np.bincount((cells + self.feature[idx]).ravel(),
+                                  weights=(self.value[child] - self.value[idx]).ravel(),
+                                  minlength=len(totals))
+        expected = float(self.value[self.roots].sum()) * self.scale + self.baseline
+        return expected, totals.reshape(n_rows, n_features) * self.scale
+
+
+RUNTIMES = {'scaler': ArrayScaler, 'linear': ArrayLinear, 'logistic': ArrayLogistic, 'trees': ArrayTrees}
+
+
+def load_array_models(directory, mmap=True):
+    """
+    Components (scaler, point, lower, upper, approval) exported to directory,
+    as runtime objects; None when there is no manifest. Arrays are opened
+    read-only memory-mapped, so pages are shared between workers and read
+    from disk only when used.
+    """
+    manifest_path = os.path.join(directory, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    components = {}
+    for name, meta in manifest['components'].items():
+        arrays = {key: np.load(os.path.join(directory, filename), mmap_mode='r' if mmap else None)
+                  for key, filename in meta['arrays'].items()}
+        components[name] = RUNTIMES[meta['kind']](meta, arrays)
+    return components
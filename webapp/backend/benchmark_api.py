@@ -0,0 +1,128 @@
+# API Benchmark Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Compares /api/predict with the orjson fast route, in process (no network)
+# Run from webapp/backend: python benchmark_api.py [--requests N]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import numpy as np
+from fastapi.testclient import TestClient
+
+# thousands of requests from one client: measure the routes, not the rate limiter
+os.environ.setdefault('RATE_LIMIT_RPS', '0')
+from app import app
+
+
+NATIONALITIES = ['USA', 'UK', 'Germany', 'Japan', 'Nepal', 'Russia', 'Brazil']
+VISA_TYPES = ['Tourist', 'Business', 'Employment', 'Student', 'Medical', 'Research']
+
+
+def sample_requests(n, seed=42):
+    """Random but valid prediction payloads"""
+    rng = random.Random(seed)
+    return [{
+        'applicant_age': rng.randint(18, 80),
+        'nationality': rng.choice(NATIONALITIES),
+        'visa_type': rng.choice(VISA_TYPES),
+        'num_previous_visits': rng.randint(0, 5),
+        'financial_proof_usd': rng.choice([5000, 15000, 40000]),
+        'has_sponsor': rng.random() < 0.5,
+        'documents_complete': rng.random() < 0.8,
+        'express_processing': rng.random() < 0.2,
+        'application_month': rng.randint(1, 12)
+    } for _ in range(n)]
+
+
+async def asgi_post(path, body):
+    """
+    POST straight into the ASGI app, skipping the HTTP client, so the time
+    is the app's own: routing, parsing, validation, predict, serialization.
+    """
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        'client': ('bench', 1), 'server': ('bench', 80)
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    status = []
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def time_route(path, bodies, warmup=50):
+    """Per-request latencies (seconds) of posting pre-encoded bodies to one route"""
+    for body in bodies[:warmup]:
+        assert await asgi_post(path, body) == 200
+    times = np.empty(len(bodies))
+    for i, body in enumerate(bodies):
+        start = time.perf_counter()
+        await asgi_post(path, body)
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def check_parity(client, payloads):
+    """Both routes must return the same JSON and reject the same bad inputs"""
+    same = all(
+        client.post('/api/predict', json=p).json() == client.post('/api/predict/fast', json=p).json()
+        for p in payloads
+    )
+    bad_inputs = [
+        {'nationality': 'UK', 'visa_type': 'Tourist'},                          # missing age
+        {'applicant_age': 10, 'nationality': 'UK', 'visa_type': 'Tourist'},     # below bound
+        {'applicant_age': 30, 'nationality': 'UK', 'visa_type': 'Tourist', 'application_month': 13},
+        {'applicant_age': 30, 'nationality': 5, 'visa_type': 'Tourist'},        # wrong type
+    ]
+    rejected = all(
+        client.post('/api/predict', json=p).status_code == 422 == client.post('/api/predict/fast', json=p).status_code
+        for p in bad_inputs
+    )
+    return same, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction routes")
+    parser.add_argument('--requests', type=int, default=2000, help="requests per route (default: 2000)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PREDICTION API BENCHMARK")
+    print("=" * 60)
+
+    payloads = sample_requests(args.requests)
+    bodies = [json.dumps(p).encode() for p in payloads]
+
+    # the client runs startup (loads the service) and the parity checks
+    with TestClient(app) as client:
+        same, rejected = check_parity(client, payloads[:200])
+        print(f"\nSame responses on both routes: {same}")
+        print(f"Same 422 rejections on both routes: {rejected}")
+
+        results = {}
+        for path in ['/api/predict', '/api/predict/fast']:
+            results[path] = asyncio.run(time_route(path, bodies))
+
+    print(f"\n{'Route':<20} {'mean (us)':>10} {'p50 (us)':>10} {'p99 (us)':>10} {'req/s':>8}")
+    for path, times in results.items():
+        print(f"{path:<20} {times.mean() * 1e6:>10.0f} {np.percentile(times, 50) * 1e6:>10.0f} "
+              f"{np.percentile(times, 99) * 1e6:>10.0f} {1 / times.mean():>8.0f}")
+    speedup = results['/api/predict'].mean() / results['/api/predict/fast'].mean()
+    print(f"\nFast route speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# Load Test Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Replays browser sessions against a local uvicorn server while ramping up concurrency
+# Run from webapp/backend: python load_test.py [--users 1,2,4,8,16,32] [--stage-seconds 10] [--workers 1]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(BACKEND_DIR))
+
+# applications come from the same generator as the training data
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+from generate_synthetic_data import generate_visa_dataset
+
+# a browser opens at most this many connections to one host
+CONNECTIONS_PER_USER = 6
+
+
+def sample_applications(n, seed=42):
+    """Request bodies built from generated applications, kept inside the form's limits"""
+    random.seed(seed)
+    np.random.seed(seed)
+    df = generate_visa_dataset(n)
+    return [{
+        'applicant_age': int(min(max(row.applicant_age, 18), 100)),
+        'nationality': row.nationality,
+        'visa_type': row.visa_type,
+        'occupation': row.occupation,
+        'education_level': row.education_level,
+        'duration_requested_days': int(min(row.duration_requested_days, 365)),
+        'num_previous_visits': int(row.num_previous_visits),
+        'financial_proof_usd': float(row.financial_proof_usd),
+        'has_sponsor': bool(row.has_sponsor),
+        'documents_complete': bool(row.documents_complete),
+        'express_processing': bool(row.express_processing),
+        'application_month': int(row.application_month)
+    } for row in df.itertuples()]
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; just enough client for JSON request/response"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + (body or b""))
+        try:
+            status_line = await self.reader.readline()
+            status = int(status_line.split()[1])
+            length = 0
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await self.reader.readexactly(length)
+        except Exception:
+            self.close()
+            raise
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class VirtualUser:
+    """A browser tab: a small connection pool and the app's request pattern"""
+
+    def __init__(self, host, port, applications, rng, results):
+        self.pool = asyncio.Queue()
+        for _ in range(CONNECTIONS_PER_USER):
+            self.pool.put_nowait(Connection(host, port))
+        self.applications = applications
+        self.rng = rng
+        self.results = results
+
+    async def call(self, name, method, path, payload=None):
+        """One request on a free connection; records (name, latency, ok)"""
+        body = json.dumps(payload).encode() if payload is not None else None
+        connection = await self.pool.get()
+        start = time.perf_counter()
+        try:
+            ok = 200 <= await connection.request(method, path, body) < 300
+        except Exception:
+            ok = False
+        finally:
+            self.pool.put_nowait(connection)
+        self.results.append((name, time.perf_counter() - start, ok))
+
+    async def session(self, think_time):
+        """Page load, one estimate, what-if scenarios, then the 12-month sweep (as app.js does)"""
+        await asyncio.gather(self.call('options', 'GET', '/api/options'),
+                             self.call('statistics', 'GET', '/api/statistics'))
+        await self.think(think_time)
+
+        form = self.rng.choice(self.applications)
+        await self.call('predict', 'POST', '/api/predict', form)
+
+        scenarios = [
+            {**form, 'express_processing': not form['express_processing']},
+            {**form, 'documents_complete': not form['documents_complete']},
+            {**form, 'application_month': (form['application_month'] + 5) % 12 + 1}
+        ]
+        await asyncio.gather(*(self.call('what-if', 'POST', '/api/predict', s) for s in scenarios))
+        await asyncio.gather(*(self.call('month-sweep', 'POST', '/api/predict',
+                                         {**form, 'application_month': m}) for m in range(1, 13)))
+        await self.think(think_time)
+
+    async def think(self, think_time):
+        if think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / think_time))
+
+    def close(self):
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+
+async def run_stage(host, port, users, seconds, applications, think_time, seed):
+    """Closed loop: each user starts a new session as soon as its last one ends"""
+    results, sessions = [], [0]
+    deadline = time.perf_counter() + seconds
+
+    async def user_loop(i):
+        user = VirtualUser(host, port, applications, random.Random(seed + i), results)
+        try:
+            while time.perf_counter() < deadline:
+                await user.session(think_time)
+                sessions[0] += 1
+        finally:
+            user.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user_loop(i) for i in range(users)))
+    return results, sessions[0], time.perf_counter() - start
+
+
+def summarize(users, results, sessions, elapsed):
+    """Throughput, error rate and latency percentiles (ms) of one stage"""
+    latencies = np.array([r[1] for r in results]) * 1000
+    errors = sum(1 for r in results if not r[2])
+    predict = np.array([r[1] for r in results if r[0] != 'options' and r[0] != 'statistics']) * 1000
+    return {
+        'users': users,
+        'rps': len(results) / elapsed,
+        'sessions_per_s': sessions / elapsed,
+        'error_pct': 100 * errors / max(len(results), 1),
+        'p50': np.percentile(latencies, 50) if len(latencies) else float('nan'),
+        'p90': np.percentile(latencies, 90) if len(latencies) else float('nan'),
+        'p99': np.percentile(latencies, 99) if len(latencies) else float('nan'),
+        'predict_p99': np.percentile(predict, 99) if len(predict) else float('nan')
+    }
+
+
+def find_saturation(stages, gain=0.05):
+    """First stage after which more users add under `gain` throughput: the knee of the curve"""
+    for previous, current in zip(stages, stages[1:]):
+        if current['rps'] < previous['rps'] * (1 + gain):
+            return previous
+    return stages[-1]
+
+
+def start_server(port, workers):
+    """Launch uvicorn on this app and wait until it answers /api/health"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL,
+        # one client flat out is the point here, so no per-client rate limit
+        env={**os.environ, 'RATE_LIMIT_RPS': '0'}
+    )
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy in time")
+
+
+def parse_args():
+    """Command line options for the load test"""
+    parser = argparse.ArgumentParser(description="Load test the API with realistic browser sessions")
+    parser.add_argument('--users', default='1,2,4,8,16,32',
+                        help="concurrent users per stage, comma separated (default: 1,2,4,8,16,32)")
+    parser.add_argument('--stage-seconds', type=float, default=10, help="duration of each stage (default: 10)")
+    parser.add_argument('--think-time', type=float, default=0,
+                        help="mean pause between steps of a session in seconds (default: 0, flat out)")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes (default: 1)")
+    parser.add_argument('--port', type=int, default=8765, help="port for the local server (default: 8765)")
+    parser.add_argument('--url', default=None, help="test an already running server instead, e.g. http://host:8000")
+    parser.add_argument('--applications', type=int, default=2000,
+                        help="generated applications to draw sessions from (default: 2000)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    levels = [int(u) for u in args.users.split(',')]
+
+    print("=" * 72)
+    print("API LOAD TEST")
+    print("=" * 72)
+
+    # step 1: traffic model inputs
+    applications = sample_applications(args.applications)
+
+    # step 2: server under test
+    server = None
+    if args.url:
+        target = urllib.parse.urlparse(args.url)
+        host, port = target.hostname, target.port or 80
+        print(f"\nTarget: {args.url}")
+    else:
+        host, port = '127.0.0.1', args.port
+        print(f"\nStarting uvicorn with {args.workers} worker(s) on port {port}...")
+        server = start_server(port, args.workers)
+    print("Session: options + statistics, predict, 3 what-if predicts, 12-month sweep (18 requests)")
+    print(f"Stages of {args.stage_seconds:.0f}s, think time {args.think_time}s\n")
+
+    # step 3: ramp up
+    stages = []
+    try:
+        print(f"{'Users':>5} {'RPS':>8} {'Sess/s':>7} {'Err %':>6} {'p50 ms':>8} {'p90 ms':>8} "
+              f"{'p99 ms':>8} {'predict p99':>12}")
+        for users in levels:
+            results, sessions, elapsed = asyncio.run(
+                run_stage(host, port, users, args.stage_seconds, applications, args.think_time, seed=users))
+            s = summarize(users, results, sessions, elapsed)
+            stages.append(s)
+            print(f"{s['users']:>5} {s['rps']:>8.0f} {s['sessions_per_s']:>7.1f} {s['error_pct']:>6.2f} "
+                  f"{s['p50']:>8.1f} {s['p90']:>8.1f} {s['p99']:>8.1f} {s['predict_p99']:>12.1f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    # step 4: where throughput stops scaling
+    knee = find_saturation(stages)
+    print(f"\nSaturation: ~{knee['users']} users at {knee['rps']:.0f} req/s, p99 {knee['p99']:.1f} ms")
+    if server is not None:
+        print(f"Per core: ~{knee['rps'] / args.workers:.0f} req/s per uvicorn worker "
+              f"(load generator shares this machine's CPUs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# Prediction Cache for the Visa Processing Time Estimator
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Optional cache of prediction results and statistics payloads, shared by all server workers
+#
+# Enable with PREDICTION_CACHE:
+#   memory          - per-process LRU (also the stand-in for tests)
+#   mmap[:path]     - one file-backed table every worker on the host maps (default: in the temp dir)
+# and size the mmap table with PREDICTION_CACHE_MB (default 64).
+# Any client with get(key) / set(key, value) (e.g. redis.Redis) can be plugged in via KeyValueBackend.
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+
+class MemoryBackend:
+    """In-process LRU of key -> bytes; only this worker sees it"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key: bytes, value: bytes):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+class KeyValueBackend:
+    """Adapter for an external key-value store client with get(key) and set(key, value)"""
+
+    def __init__(self, client, prefix='visa-cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: bytes):
+        return self.client.get(self.prefix + key.hex())
+
+    def set(self, key: bytes, value: bytes):
+        self.client.set(self.prefix + key.hex(), value)
+
+
+class MmapBackend:
+    """
+    Fixed-size hash table in a memory-mapped file, so every worker process
+    that maps the same file reads the others' entries.
+
+    Each key has exactly one slot (a newer key landing on it evicts the
+    older one). A slot holds the 16-byte key digest, the value length, a
+    CRC32 over key and value, and the value. Writers clear the digest first
+    and set it last, and readers check both digest and CRC. A torn write,
+    or two writers racing on one slot, therefore reads as a miss, never as
+    another key's value, and no cross-process lock is needed. Values larger
+    than a slot are not cached.
+    """
+    HEADER = struct.Struct('<16sII')
+
+    def __init__(self, path, size_mb=64, slot_size=4096):
+        self.path = path
+        self.slot_size = slot_size
+        self.n_slots = max(1, size_mb * 1024 * 1024 // slot_size)
+        size = self.n_slots * slot_size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _offset(self, key: bytes) -> int:
+        return int.from_bytes(key[:8], 'little') % self.n_slots * self.slot_size
+
+    def get(self, key: bytes):
+        offset = self._offset(key)
+        digest, length, crc = self.HEADER.unpack_from(self._map, offset)
+        if digest != key or length > self.slot_size - self.HEADER.size:
+            return None
+        start = offset + self.HEADER.size
+        value = self._map[start:start + length]
+        if zlib.crc32(value, zlib.crc32(key)) != crc or self._map[offset:offset + 16] != key:
+            return None
+        return value
+
+    def set(self, key: bytes, value: bytes):
+        if len(value) > self.slot_size - self.HEADER.size:
+            return
+        offset = self._offset(key)
+        start = offset + self.HEADER.size
+        self._map[offset:offset + 16] = bytes(16)
+        self._map[start:start + len(value)] = value
+        self.HEADER.pack_into(self._map, offset, bytes(16), len(value), zlib.crc32(value, zlib.crc32(key)))
+        self._map[offset:offset + 16] = key
+
+
+class PredictionCache:
+    """
+    Cached JSON payloads under versioned keys: the version (a hash of the
+    model and data artifacts) is part of every key, so loading new
+    artifacts makes all older entries unreachable at once.
+    """
+
+    def __init__(self, backend, version: str):
+        self.backend = backend
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, kind: str, payload: bytes = b'') -> bytes:
+        return hashlib.blake2b(f'{self.version}|{kind}|'.encode() + payload, digest_size=16).digest()
+
+    def get_or_compute(self, kind: str, payload: bytes, compute, dumps) -> bytes:
+        """Serialized result for (kind, payload); compute() and dumps() run only on a miss"""
+        key = self.key(kind, payload)
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = dumps(compute())
+        self.backend.set(key, value)
+        return value
+
+
+def cache_from_env(version: str):
+    """The cache PREDICTION_CACHE asks for, or None when caching is off"""
+    setting = os.environ.get('PREDICTION_CACHE', 'off').strip()
+    kind, _, path = setting.partition(':')
+    kind = kind.lower()
+    if kind in ('', 'off', 'none'):
+        return None
+    if kind == 'memory':
+        return PredictionCache(MemoryBackend(), version)
+    if kind == 'mmap':
+        path = path or os.path.join(tempfile.gettempdir(), 'visa-prediction-cache.bin')
+        size_mb = int(os.environ.get('PREDICTION_CACHE_MB', '64'))
+        return PredictionCache(MmapBackend(path, size_mb), version)
+    raise ValueError(f"Unknown PREDICTION_CACHE '{setting}' (expected off, memory or mmap[:path])")
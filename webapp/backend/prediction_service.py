@@ -1,12 +1,124 @@
 # Prediction Service for Visa Processing Time Estimation
 # Author: Harsh
 # Connects to trained ML model and provides predictions
+# (pandas is only imported by the DataFrame batch path, so the web server starts without it)
 
-import pandas as pd
 import numpy as np
-import joblib
+import csv
+import hashlib
+import json
 import os
-from typing import Dict, Tuple
+import threading
+from typing import Dict, Tuple, TYPE_CHECKING
+
+from array_model import load_array_models
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# service field -> column name in the encodings artifact, and the category
+# used when a request leaves the field out or sends an unknown value
+ENCODED_FIELDS = {
+    'education': ('education_level', 'Graduate'),
+    'visa_type': ('visa_type', 'Tourist'),
+    'nationality': ('nationality', 'USA'),
+    'occupation': ('occupation', 'Professional')
+}
+
+# Every feature the service can compute, in the order a row is built;
+# the model's own columns are gathered from it by name
+SERVING_FEATURES = (
+    'applicant_age', 'duration_requested_days', 'num_previous_visits', 'financial_proof_usd',
+    'has_sponsor', 'documents_complete', 'express_processing', 'is_peak_season',
+    'education_encoded', 'visa_type_encoded', 'nationality_encoded', 'occupation_encoded',
+    'risk_score', 'country_avg_processing_time', 'visa_type_avg_time',
+    'country_avg_time_3m', 'country_avg_time_12m', 'visa_type_avg_time_3m', 'visa_type_avg_time_12m',
+    'center_queue_length', 'center_queue_wait_days'
+)
+FEATURE_POSITION = {name: i for i, name in enumerate(SERVING_FEATURES)}
+
+# Columns of the original models, for scalers saved without feature names
+LEGACY_FEATURES = SERVING_FEATURES[:15]
+
+# Axes of the statistics cube and the measures held in each cell
+CUBE_DIMENSIONS = ('nationality', 'visa_type', 'month')
+CUBE_MEASURES = ('count', 'sum_days', 'sum_sq_days', 'approved')
+
+# Columns of the featured dataset the service reads, and their types
+# (application_year is optional: without it there are no trailing averages)
+REFERENCE_COLUMNS = {
+    'nationality': str, 'visa_type': str, 'visa_status': str,
+    'application_month': np.int64, 'application_year': np.int64, 'processing_time_days': np.float64
+}
+
+
+def artifact_version(paths) -> str:
+    """Short hash of the files a service instance was loaded from (missing files are skipped)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def read_reference_columns(path, columns=REFERENCE_COLUMNS) -> Dict[str, np.ndarray]:
+    """
+    The named columns of a CSV file as NumPy arrays (columns missing from
+    the file are left out). Plain csv module: the reference data is small,
+    and this keeps pandas out of server startup.
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        wanted = [(name, header.index(name)) for name in columns if name in header]
+        values = {name: [] for name, _ in wanted}
+        for row in reader:
+            for name, i in wanted:
+                values[name].append(row[i])
+    # numeric columns go through float so "5.0" still parses as an int
+    return {name: np.array(v, dtype=str) if columns[name] is str
+            else np.array(v, dtype=np.float64).astype(columns[name])
+            for name, v in values.items()}
+
+
+def group_means(keys: np.ndarray, values: np.ndarray) -> Dict[str, float]:
+    """Mean of values per distinct key, as a plain dict"""
+    labels, inverse = np.unique(keys, return_inverse=True)
+    means = np.bincount(inverse, weights=values) / np.bincount(inverse)
+    return dict(zip(labels.tolist(), means.tolist()))
+
+
+class ApplicationRecord:
+    """
+    One application, parsed once from a request (dict or Pydantic model).
+    Slots keep it small and attribute reads cheap on the serving path.
+    """
+    __slots__ = ('applicant_age', 'nationality', 'visa_type', 'occupation', 'education_level',
+                 'duration_requested_days', 'num_previous_visits', 'financial_proof_usd',
+                 'has_sponsor', 'documents_complete', 'express_processing',
+                 'application_month', 'processing_center')
+    DEFAULTS = (30, 'USA', 'Tourist', 'Professional', 'Graduate',
+                30, 0, 15000,
+                False, True, False,
+                1, None)
+    
+    @classmethod
+    def parse(cls, source) -> 'ApplicationRecord':
+        """Build a record from a dict or any object with matching attributes"""
+        if isinstance(source, cls):
+            return source
+        record = cls.__new__(cls)
+        if isinstance(source, dict):
+            for name, default in zip(cls.__slots__, cls.DEFAULTS):
+                setattr(record, name, source.get(name, default))
+        else:
+            for name, default in zip(cls.__slots__, cls.DEFAULTS):
+                setattr(record, name, getattr(source, name, default))
+        return record
 
 
 class VisaPredictionService:
@@ -14,9 +126,30 @@ class VisaPredictionService:
     
     def __init__(self):
         self.model = None
+        self.model_name = None
+        self.model_format = None
         self.scaler = None
+        self.interval_models = []
+        self.approval_model = None
+        self._fused_weights = None
+        self._fused_bias = None
         self.data = None
+        self.record_count = 0
         self.encoding_maps = {}
+        self.encodings_version = None
+        self.model_version = None
+        self._lookup_tables = {}
+        self.feature_names = None
+        self.trailing_averages = {}
+        self.center_backlog = None
+        self.stats_cube = None
+        self.cube_labels = {}
+        self._cube_index = {}
+        self._default_center_load = None
+        self.country_avg = {}
+        self.visa_type_avg = {}
+        self._model_columns = None
+        self._buffers = threading.local()
         self._load_resources()
     
     def _load_resources(self):
@@ -24,26 +157,111 @@ class VisaPredictionService:
         # Get base directory (two levels up from webapp/backend)
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         
-        # Load model and scaler
+        # Load model and scaler: exported arrays when present (NumPy only,
+        # memory-mapped), else the pickles, which need sklearn
         model_path = os.path.join(base_dir, 'models', 'best_model.pkl')
         scaler_path = os.path.join(base_dir, 'models', 'scaler.pkl')
+        quantile_path = os.path.join(base_dir, 'models', 'quantile_models.pkl')
+        classifier_path = os.path.join(base_dir, 'models', 'approval_classifier.pkl')
+        serving_dir = os.path.join(base_dir, 'models', 'serving')
         
-        self.model = joblib.load(model_path)
-        self.scaler = joblib.load(scaler_path)
+        arrays = load_array_models(serving_dir) or {}
+        if 'point' in arrays and 'scaler' in arrays:
+            self.model = arrays['point']
+            self.scaler = arrays['scaler']
+            if 'lower' in arrays and 'upper' in arrays:
+                self.interval_models = [arrays['lower'], arrays['upper']]
+            self.approval_model = arrays.get('approval')
+            self.model_name = self.model.name
+            self.model_format = 'arrays'
+        else:
+            import joblib
+            self.model = joblib.load(model_path)
+            self.scaler = joblib.load(scaler_path)
+            
+            # Quantile models for the prediction interval (optional)
+            if os.path.exists(quantile_path):
+                quantile_models = joblib.load(quantile_path)
+                self.interval_models = [quantile_models['lower'], quantile_models['upper']]
+            
+            # Approval probability classifier (optional)
+            if os.path.exists(classifier_path):
+                self.approval_model = joblib.load(classifier_path)
+            self.model_name = type(self.model).__name__
+            self.model_format = 'pickle'
+        self._setup_fused_linear()
         
-        # Load featured dataset for reference statistics
+        # Load featured dataset for reference statistics (column -> array)
         data_path = os.path.join(base_dir, 'data', 'processed', 'visa_applications_featured.csv')
-        self.data = pd.read_csv(data_path)
+        self.data = read_reference_columns(data_path)
+        self.record_count = len(self.data['processing_time_days'])
+        
+        # Setup encoding maps (saved with the model, built-in maps for older model folders)
+        self._setup_encodings(os.path.join(base_dir, 'models', 'encodings.json'))
+        self._setup_trailing_averages()
+        self._setup_stats_cube()
+        
+        # Simulated processing center queues at the end of the data (optional)
+        backlog_path = os.path.join(base_dir, 'data', 'processed', 'center_backlog.json')
+        if os.path.exists(backlog_path):
+            with open(backlog_path) as f:
+                self.center_backlog = json.load(f)
         
-        # Setup encoding maps
-        self._setup_encodings()
+        # Columns the model was trained on, in training order
+        self.feature_names = list(getattr(self.scaler, 'feature_names_in_', [])) or None
+        self._model_columns = np.array(
+            [FEATURE_POSITION[name] for name in (self.feature_names or LEGACY_FEATURES)])
+        
+        # Identifies these artifacts, e.g. to version shared cache keys
+        serving_files = sorted(os.listdir(serving_dir)) if self.model_format == 'arrays' else []
+        self.model_version = artifact_version([
+            model_path, scaler_path, quantile_path, classifier_path, data_path,
+            os.path.join(base_dir, 'models', 'encodings.json'), backlog_path
+        ] + [os.path.join(serving_dir, name) for name in serving_files])
+        
+        # Historical averages used by every request
+        days = self.data['processing_time_days']
+        self._overall_avg = float(days.mean())
+        self.country_avg = group_means(self.data['nationality'], days)
+        self.visa_type_avg = group_means(self.data['visa_type'], days)
         
         print("✓ Prediction service loaded successfully!")
-        print(f"  - Model: {type(self.model).__name__}")
-        print(f"  - Dataset: {len(self.data)} records")
+        print(f"  - Model: {self.model_name} ({self.model_format})")
+        print(f"  - Interval: {'quantile models' if self.interval_models else 'fixed ±15% band'}"
+              f"{' (fused linear pass)' if self._fused_weights is not None else ''}")
+        print(f"  - Approval: {'classifier' if self.approval_model is not None else 'risk score buckets'}")
+        print(f"  - Encodings: {'version ' + self.encodings_version if self.encodings_version else 'built-in maps'}")
+        print(f"  - Dataset: {self.record_count} records")
     
-    def _setup_encodings(self):
+    def _setup_encodings(self, encodings_path=None):
         """Setup encoding mappings for categorical variables"""
+        if encodings_path and os.path.exists(encodings_path):
+            with open(encodings_path) as f:
+                artifact = json.load(f)
+            self.encodings_version = artifact['version']
+            for field, (column, _) in ENCODED_FIELDS.items():
+                categories = artifact['columns'][column]
+                self.encoding_maps[field] = {c: i for i, c in enumerate(categories)}
+        else:
+            self._setup_default_encodings()
+        
+        # Sorted vocabulary + matching codes per field, so a whole column of
+        # values is encoded with one searchsorted and one take
+        for field, (_, default) in ENCODED_FIELDS.items():
+            mapping = self.encoding_maps[field]
+            vocab = np.array(sorted(mapping), dtype=str)
+            codes = np.array([mapping[v] for v in vocab], dtype=np.int64)
+            self._lookup_tables[field] = (vocab, codes, mapping[default])
+    
+    def encode(self, field: str, values) -> np.ndarray:
+        """Codes for an array of category strings; unknown values get the field's default"""
+        vocab, codes, default = self._lookup_tables[field]
+        values = np.asarray(values, dtype=str)
+        pos = np.minimum(np.searchsorted(vocab, values), len(vocab) - 1)
+        return np.where(vocab[pos] == values, codes[pos], default)
+    
+    def _setup_default_encodings(self):
+        """Built-in maps matching the original training data"""
         
         # Education levels (ordinal)
         self.encoding_maps['education'] = {
@@ -73,107 +291,469 @@ class VisaPredictionService:
             'Self Employed': 6, 'Student': 7
         }
     
+    def _setup_fused_linear(self):
+        """
+        If the point, quantile and approval models are all linear, fold the
+        scaler into their coefficients so one matrix product on the raw
+        feature rows yields every output column at once (the approval
+        column is a logit).
+        """
+        models = [self.model] + self.interval_models
+        if self.approval_model is not None:
+            models.append(self.approval_model)
+        if not all(hasattr(m, 'coef_') and hasattr(m, 'intercept_') for m in models):
+            return
+        coefs = np.column_stack([np.ravel(m.coef_) for m in models])
+        intercepts = np.array([float(np.ravel(m.intercept_)[0]) for m in models])
+        scale = self.scaler.scale_
+        mean = self.scaler.mean_
+        # (x - mean) / scale @ coef + b  ==  x @ (coef / scale) + (b - mean / scale @ coef)
+        self._fused_weights = coefs / scale[:, None]
+        self._fused_bias = intercepts - (mean / scale) @ coefs
+    
+    def _score(self, features: np.ndarray) -> np.ndarray:
+        """
+        Score a batch of feature rows (model column order) in one pass.
+        Returns an (n, 4) array of [predicted, lower, upper] days and the
+        approval probability (NaN when no classifier is loaded).
+        Without the fused linear path, features are standardized in place.
+        """
+        n_days = 1 + len(self.interval_models)
+        approval = np.full(len(features), np.nan)
+        if self._fused_weights is not None:
+            out = features @ self._fused_weights + self._fused_bias
+            if self.approval_model is not None:
+                approval = 1.0 / (1.0 + np.exp(-out[:, n_days]))
+            out = out[:, :n_days]
+        else:
+            scaled = features
+            scaled -= self.scaler.mean_
+            scaled /= self.scaler.scale_
+            out = np.column_stack(
+                [self.model.predict(scaled)] + [m.predict(scaled) for m in self.interval_models]
+            )
+            if self.approval_model is not None:
+                approval = self.approval_model.predict_proba(scaled)[:, 1]
+        
+        point = out[:, 0]
+        if n_days == 1:
+            # No quantile models: fall back to ±15% or ±2 days, whichever is larger
+            margin = np.maximum(point * 0.15, 2.0)
+            lower, upper = point - margin, point + margin
+        else:
+            # Keep the point estimate inside its own interval
+            lower, upper = np.minimum(out[:, 1], point), np.maximum(out[:, 2], point)
+        
+        return np.column_stack([point, lower, upper, approval])
+    
+    def _setup_trailing_averages(self, windows=(3, 12)):
+        """
+        Trailing 3/12-month averages as of the month after the latest data,
+        i.e. the history a new application would see (same definition as
+        the training features).
+        """
+        if 'application_year' not in self.data:
+            return
+        periods = self.data['application_year'] * 12 + self.data['application_month']
+        for w in windows:
+            recent = periods > periods.max() - w
+            days = self.data['processing_time_days'][recent]
+            overall = float(days.mean())
+            for key, prefix in [('nationality', 'country'), ('visa_type', 'visa_type')]:
+                means = group_means(self.data[key][recent], days)
+                self.trailing_averages[f'{prefix}_avg_time_{w}m'] = (key, means, overall)
+    
+    def _setup_stats_cube(self):
+        """
+        Pre-aggregate the dataset into a dense (nationality x visa_type x month)
+        cube of count, sum, sum of squares and approvals, built in one bincount
+        pass per measure. Every stats query is then a slice and a sum over this
+        small array.
+        """
+        nationality_labels, nationality_pos = np.unique(self.data['nationality'], return_inverse=True)
+        visa_labels, visa_pos = np.unique(self.data['visa_type'], return_inverse=True)
+        labels = {
+            'nationality': nationality_labels.tolist(),
+            'visa_type': visa_labels.tolist(),
+            'month': list(range(1, 13))
+        }
+        shape = tuple(len(v) for v in labels.values())
+        cell = np.ravel_multi_index((nationality_pos, visa_pos, self.data['application_month'] - 1), shape)
+        days = self.data['processing_time_days']
+        measures = {
+            'count': None,
+            'sum_days': days,
+            'sum_sq_days': days * days,
+            'approved': (self.data['visa_status'] == 'Approved').astype(float)
+        }
+        cube = np.stack([np.bincount(cell, weights=measures[m], minlength=np.prod(shape)).astype(float)
+                         for m in CUBE_MEASURES], axis=-1).reshape(shape + (len(CUBE_MEASURES),))
+        index = {dim: {v: i for i, v in enumerate(values)} for dim, values in labels.items()}
+        
+        self.stats_cube = cube
+        self.cube_labels = labels
+        self._cube_index = index
+    
+    def query_stats_cube(self, filters: Dict = None, group_by=()) -> list:
+        """
+        Slice the cube and roll it up.
+        
+        Args:
+            filters: dimension -> list of values to keep (all values when absent)
+            group_by: dimensions kept in the result; the rest are summed away
+        
+        Returns:
+            One dict per non-empty group: its dimension values, count,
+            avg_days, std_days and approval_rate (%)
+        
+        Raises:
+            ValueError: on an unknown dimension or value
+        """
+        filters = filters or {}
+        for dim in list(filters) + list(group_by):
+            if dim not in CUBE_DIMENSIONS:
+                raise ValueError(f"Unknown dimension '{dim}' (expected one of {', '.join(CUBE_DIMENSIONS)})")
+        selected = {}
+        for dim in CUBE_DIMENSIONS:
+            values = filters.get(dim) or self.cube_labels[dim]
+            unknown = [v for v in values if v not in self._cube_index[dim]]
+            if unknown:
+                raise ValueError(f"Unknown {dim} value(s): {', '.join(map(str, unknown))}")
+            selected[dim] = list(values)
+        
+        block = self.stats_cube[np.ix_(*(
+            [self._cube_index[dim][v] for v in selected[dim]] for dim in CUBE_DIMENSIONS))]
+        keep = [d for d in CUBE_DIMENSIONS if d in group_by]
+        rolled = block.sum(axis=tuple(i for i, d in enumerate(CUBE_DIMENSIONS) if d not in keep))
+        
+        # measures for every group at once, then plain Python values per row
+        groups = rolled.reshape(-1, len(CUBE_MEASURES))
+        nonempty = np.flatnonzero(groups[:, 0])
+        count, total, total_sq, approved = groups[nonempty].T
+        variance = (total_sq - total * total / count) / np.maximum(count - 1, 1)
+        measures = zip(count.astype(np.int64).tolist(),
+                       (total / count).round(1).tolist(),
+                       np.sqrt(np.maximum(variance, 0.0)).round(1).tolist(),
+                       (approved / count * 100).round(1).tolist())
+        
+        keys = [[selected[dim][i] for i in positions.tolist()]
+                for dim, positions in zip(keep, np.unravel_index(nonempty, rolled.shape[:-1]) if keep else ())]
+        
+        rows = []
+        for i, (n, avg, std, rate) in enumerate(measures):
+            row = {dim: values[i] for dim, values in zip(keep, keys)}
+            row.update({'count': n, 'avg_days': avg, 'std_days': std, 'approval_rate': rate})
+            rows.append(row)
+        return rows
+    
+    def get_center_load(self, center: str = None) -> Tuple[float, float]:
+        """
+        Current (queue length, wait in days) at a processing center; without
+        a known center, the capacity-weighted average over all centers.
+        """
+        if self.center_backlog is None:
+            return 0.0, 0.0
+        centers = self.center_backlog['centers']
+        if center in centers:
+            return float(centers[center]['backlog']), float(centers[center]['wait_days'])
+        if self._default_center_load is None:
+            weights = np.array([c['capacity_per_month'] for c in centers.values()])
+            backlog = np.array([c['backlog'] for c in centers.values()])
+            wait = np.array([c['wait_days'] for c in centers.values()])
+            self._default_center_load = (float(np.average(backlog, weights=weights)),
+                                         float(np.average(wait, weights=weights)))
+        return self._default_center_load
+    
+    def get_center_backlog(self) -> Dict:
+        """Estimated backlog per processing center from the queue simulation"""
+        if self.center_backlog is None:
+            return {'as_of': None, 'centers': {}}
+        centers = self.center_backlog['centers']
+        return {
+            'as_of': self.center_backlog['as_of'],
+            'utilization': self.center_backlog['utilization'],
+            'total_backlog': sum(c['backlog'] for c in centers.values()),
+            'centers': centers
+        }
+    
     def get_country_avg_time(self, nationality: str) -> float:
         """Get average processing time for a country from historical data"""
-        country_data = self.data[self.data['nationality'] == nationality]
-        if len(country_data) > 0:
-            return country_data['processing_time_days'].mean()
-        return self.data['processing_time_days'].mean()  # fallback to overall avg
+        return self.country_avg.get(nationality, self._overall_avg)  # fallback to overall avg
     
     def get_visa_type_avg_time(self, visa_type: str) -> float:
         """Get average processing time for a visa type from historical data"""
-        visa_data = self.data[self.data['visa_type'] == visa_type]
-        if len(visa_data) > 0:
-            return visa_data['processing_time_days'].mean()
-        return self.data['processing_time_days'].mean()
+        return self.visa_type_avg.get(visa_type, self._overall_avg)
     
     def calculate_is_peak_season(self, month: int) -> int:
         """Determine if month is peak season (Oct-Mar)"""
         peak_months = [10, 11, 12, 1, 2, 3]
         return 1 if month in peak_months else 0
     
-    def calculate_risk_score(self, application: Dict) -> int:
+    def calculate_risk_score(self, application) -> int:
         """Calculate risk score based on application factors"""
+        record = ApplicationRecord.parse(application)
         risk = 0
         
         # Incomplete documents (+2)
-        if not application.get('documents_complete', True):
+        if not record.documents_complete:
             risk += 2
         
         # First time applicant (+1)
-        if application.get('num_previous_visits', 0) == 0:
+        if record.num_previous_visits == 0:
             risk += 1
         
         # No sponsor (+1)
-        if not application.get('has_sponsor', True):
+        if not record.has_sponsor:
             risk += 1
         
         # Low financial proof (+1)
-        if application.get('financial_proof_usd', 20000) < 10000:
+        if record.financial_proof_usd < 10000:
             risk += 1
         
         # Complex visa types (+1)
-        if application.get('visa_type') in ['Research', 'Employment']:
+        if record.visa_type in ('Research', 'Employment'):
             risk += 1
         
         return risk
     
+    def _encode_one(self, field: str, value) -> int:
+        """Code for a single category value (unknown values get the field's default)"""
+        return self.encoding_maps[field].get(value, self._lookup_tables[field][2])
+    
+    def _row_buffers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """This thread's reusable buffers: all serving features, and one model-ordered row"""
+        buffers = self._buffers
+        if getattr(buffers, 'row', None) is None or buffers.row.shape[1] != len(self._model_columns):
+            buffers.full = np.empty(len(SERVING_FEATURES))
+            buffers.row = np.empty((1, len(self._model_columns)))
+        return buffers.full, buffers.row
+    
+    def _fill_features(self, record: ApplicationRecord, out: np.ndarray) -> None:
+        """Write every serving feature of one record into out (SERVING_FEATURES order)"""
+        nationality, visa_type = record.nationality, record.visa_type
+        queue_length, queue_wait = self.get_center_load(record.processing_center)
+        trailing = self.trailing_averages
+        
+        def recent(col):
+            if col not in trailing:
+                return 0.0
+            key, means, overall = trailing[col]
+            return means.get(nationality if key == 'nationality' else visa_type, overall)
+        
+        out[:] = (
+            record.applicant_age,
+            record.duration_requested_days,
+            record.num_previous_visits,
+            record.financial_proof_usd,
+            1 if record.has_sponsor else 0,
+            1 if record.documents_complete else 0,
+            1 if record.express_processing else 0,
+            self.calculate_is_peak_season(record.application_month),
+            self._encode_one('education', record.education_level),
+            self._encode_one('visa_type', visa_type),
+            self._encode_one('nationality', nationality),
+            self._encode_one('occupation', record.occupation),
+            self.calculate_risk_score(record),
+            self.get_country_avg_time(nationality),
+            self.get_visa_type_avg_time(visa_type),
+            recent('country_avg_time_3m'),
+            recent('country_avg_time_12m'),
+            recent('visa_type_avg_time_3m'),
+            recent('visa_type_avg_time_12m'),
+            queue_length,
+            queue_wait
+        )
+    
     def predict(self, application: Dict) -> Dict:
         """
         Make a prediction for visa processing time
         
         Args:
-            application: Dictionary with applicant details
+            application: Applicant details (dict, request model or ApplicationRecord)
         
         Returns:
             Dictionary with prediction results
         """
-        # Extract and encode features
-        nationality = application.get('nationality', 'USA')
-        visa_type = application.get('visa_type', 'Tourist')
-        
-        # Calculate derived features
-        country_avg = self.get_country_avg_time(nationality)
-        visa_avg = self.get_visa_type_avg_time(visa_type)
-        month = application.get('application_month', 1)
-        is_peak = self.calculate_is_peak_season(month)
-        risk_score = self.calculate_risk_score(application)
-        
-        # Prepare feature vector (must match training features)
-        features = {
-            'applicant_age': application.get('applicant_age', 30),
-            'duration_requested_days': application.get('duration_requested_days', 30),
-            'num_previous_visits': application.get('num_previous_visits', 0),
-            'financial_proof_usd': application.get('financial_proof_usd', 15000),
-            'has_sponsor': 1 if application.get('has_sponsor', False) else 0,
-            'documents_complete': 1 if application.get('documents_complete', True) else 0,
-            'express_processing': 1 if application.get('express_processing', False) else 0,
-            'is_peak_season': is_peak,
-            'education_encoded': self.encoding_maps['education'].get(
-                application.get('education_level', 'Graduate'), 2),
-            'visa_type_encoded': self.encoding_maps['visa_type'].get(visa_type, 7),
-            'nationality_encoded': self.encoding_maps['nationality'].get(nationality, 19),
-            'occupation_encoded': self.encoding_maps['occupation'].get(
-                application.get('occupation', 'Professional'), 4),
-            'risk_score': risk_score,
-            'country_avg_processing_time': country_avg,
-            'visa_type_avg_time': visa_avg
-        }
+        # Parse once, then build the feature row in this thread's buffers
+        record = ApplicationRecord.parse(application)
+        full, row = self._row_buffers()
+        self._fill_features(record, full)
+        np.take(full, self._model_columns, out=row[0])
         
-        # Create DataFrame and scale
-        df = pd.DataFrame([features])
-        df_scaled = self.scaler.transform(df)
+        # Point estimate and interval in one pass
+        return self._build_result(record, full, self._score(row)[0])
+    
+    def _feature_rows(self, applications) -> Tuple[list, np.ndarray]:
+        """Parsed records and their serving feature rows (SERVING_FEATURES order)"""
+        records = [ApplicationRecord.parse(a) for a in applications]
+        full = np.empty((len(records), len(SERVING_FEATURES)))
+        for record, out in zip(records, full):
+            self._fill_features(record, out)
+        return records, full
+    
+    def predict_batch(self, applications) -> list:
+        """
+        Predict many applications with one scoring pass.
+        Returns one result dict per application, same as predict().
+        """
+        records, full = self._feature_rows(applications)
+        scores = self._score(full[:, self._model_columns])
+        return [self._build_result(r, f, sc) for r, f, sc in zip(records, full, scores)]
+    
+    @property
+    def explainable(self) -> bool:
+        """Whether the point model can split its predictions into feature contributions"""
+        return hasattr(self.model, 'contributions') or hasattr(self.model, 'coef_')
+    
+    def explain_batch(self, applications) -> list:
+        """
+        Each feature's contribution (in days) to predicted_days, for many
+        applications in one vectorized pass. Linear models give the exact
+        coef * standardized value; tree models (exported arrays) give path
+        attributions. Either way baseline_days plus the contributions adds
+        up to predicted_days. Contributions are sorted largest first.
+        Values are rounded like predict() (days to 0.1, baseline to 0.01,
+        contributions to 0.001); rounding_days holds what that rounding
+        lost, so baseline_days + contributions + rounding_days is exactly
+        predicted_days while baseline_days stays the same for every row.
+        """
+        _, full = self._feature_rows(applications)
+        features = full[:, self._model_columns]
+        scaled = (features - self.scaler.mean_) / self.scaler.scale_
+        if hasattr(self.model, 'contributions'):
+            baseline, contributions = self.model.contributions(scaled)
+        elif hasattr(self.model, 'coef_'):
+            baseline = float(np.ravel(self.model.intercept_)[0])
+            contributions = scaled * np.ravel(self.model.coef_)
+        else:
+            raise ValueError(f"{self.model_name} cannot be explained; export it with src/fast_inference.py")
         
-        # Make prediction
-        predicted_days = self.model.predict(df_scaled)[0]
+        names = self.feature_names or list(LEGACY_FEATURES)
+        predicted = baseline + contributions.sum(axis=1)
+        order = np.argsort(-np.abs(contributions), axis=1, kind='stable')
+        shown_days = np.round(predicted, 1)
+        shown_baseline = round(float(baseline), 2)
+        shown_parts = np.round(contributions, 3)
+        residual = np.round(shown_days - shown_baseline - shown_parts.sum(axis=1), 3)
+        return [{
+            'predicted_days': float(days),
+            'baseline_days': shown_baseline,
+            'rounding_days': float(rounding),
+            'contributions': [
+                {'feature': names[i], 'value': float(row[i]), 'contribution': float(parts[i])}
+                for i in ranks
+            ]
+        } for days, rounding, row, parts, ranks in zip(shown_days, residual, features, shown_parts, order)]
+    
+    def _frame_column(self, df: 'pd.DataFrame', name: str) -> np.ndarray:
+        """One application field of a DataFrame, with missing values (or column) set to the record default"""
+        import pandas as pd
+        default = ApplicationRecord.DEFAULTS[ApplicationRecord.__slots__.index(name)]
+        if name not in df.columns:
+            return np.full(len(df), default, dtype=object if isinstance(default, str) else float)
+        if isinstance(default, str):
+            return df[name].fillna(default).astype(str).to_numpy()
+        return pd.to_numeric(df[name], errors='coerce').fillna(float(default)).to_numpy(dtype=float)
+    
+    @staticmethod
+    def _map_values(values, lookup) -> np.ndarray:
+        """Apply lookup(value) -> float per distinct value, then broadcast back to every row"""
+        import pandas as pd
+        codes, uniques = pd.factorize(values)
+        table = np.array([lookup(u) for u in uniques] + [lookup(None)], dtype=float)
+        return table[codes]  # code -1 (missing) picks the trailing lookup(None)
+    
+    def feature_frame(self, df: 'pd.DataFrame') -> np.ndarray:
+        """
+        Serving features (SERVING_FEATURES order) for a DataFrame of raw-format
+        applications, vectorized over rows. Same values as _fill_features
+        builds one record at a time; missing fields get the record defaults.
+        """
+        col = lambda name: self._frame_column(df, name)
+        nationality, visa_type = col('nationality'), col('visa_type')
+        month = col('application_month')
+        previous_visits = col('num_previous_visits')
+        financial_proof = col('financial_proof_usd')
+        has_sponsor = col('has_sponsor') != 0
+        documents_complete = col('documents_complete') != 0
+        express = col('express_processing') != 0
         
-        # Calculate confidence interval (±15% or ±2 days, whichever is larger)
-        margin = max(predicted_days * 0.15, 2.0)
-        min_days = max(1, predicted_days - margin)
-        max_days = predicted_days + margin
+        # same rules as calculate_risk_score (ints, since bool + bool is a logical or)
+        risk = (2 * (~documents_complete).astype(np.int64) + (previous_visits == 0).astype(np.int64)
+                + (~has_sponsor).astype(np.int64) + (financial_proof < 10000).astype(np.int64)
+                + np.isin(visa_type, ('Research', 'Employment')).astype(np.int64))
         
-        # Determine status likelihood based on risk score
-        if risk_score <= 1:
+        centers = df['processing_center'] if 'processing_center' in df.columns else np.full(len(df), None)
+        
+        def recent(name):
+            if name not in self.trailing_averages:
+                return np.zeros(len(df))
+            key, means, overall = self.trailing_averages[name]
+            return self._map_values(nationality if key == 'nationality' else visa_type,
+                                    lambda v: means.get(v, overall))
+        
+        return np.column_stack([
+            col('applicant_age'),
+            col('duration_requested_days'),
+            previous_visits,
+            financial_proof,
+            has_sponsor,
+            documents_complete,
+            express,
+            np.isin(month, (10, 11, 12, 1, 2, 3)),
+            self.encode('education', col('education_level')),
+            self.encode('visa_type', visa_type),
+            self.encode('nationality', nationality),
+            self.encode('occupation', col('occupation')),
+            risk,
+            self._map_values(nationality, self.get_country_avg_time),
+            self._map_values(visa_type, self.get_visa_type_avg_time),
+            recent('country_avg_time_3m'),
+            recent('country_avg_time_12m'),
+            recent('visa_type_avg_time_3m'),
+            recent('visa_type_avg_time_12m'),
+            self._map_values(centers, lambda c: self.get_center_load(c)[0]),
+            self._map_values(centers, lambda c: self.get_center_load(c)[1])
+        ]).astype(float)
+    
+    def predict_frame(self, df: 'pd.DataFrame', features: np.ndarray = None) -> 'pd.DataFrame':
+        """
+        Score a DataFrame of raw-format applications in one vectorized pass.
+        Returns predicted/min/max days, approval probability (NaN without a
+        classifier) and risk score per row, rounded like predict().
+        features: serving features for df built by the caller (default: feature_frame(df)).
+        """
+        import pandas as pd
+        full = self.feature_frame(df) if features is None else features
+        scores = self._score(full[:, self._model_columns])
+        return pd.DataFrame({
+            'predicted_days': scores[:, 0].round(1),
+            'min_days': np.maximum(1, scores[:, 1]).round(1),
+            'max_days': scores[:, 2].round(1),
+            'approval_probability': scores[:, 3].round(3),
+            'risk_score': full[:, FEATURE_POSITION['risk_score']].astype(np.int64)
+        }, index=df.index)
+    
+    def _build_result(self, record: ApplicationRecord, full: np.ndarray, scores: np.ndarray) -> Dict:
+        """Response dict from a record, its serving features and its [point, lower, upper, approval] scores"""
+        predicted_days, lower_days, upper_days, approval_prob = scores
+        risk_score = int(full[FEATURE_POSITION['risk_score']])
+        is_peak = full[FEATURE_POSITION['is_peak_season']]
+        country_avg = full[FEATURE_POSITION['country_avg_processing_time']]
+        visa_avg = full[FEATURE_POSITION['visa_type_avg_time']]
+        min_days = max(1, lower_days)
+        max_days = upper_days
+        
+        # Approval likelihood from the classifier, or risk score buckets without one
+        if not np.isnan(approval_prob):
+            approval_percentage = int(round(approval_prob * 100))
+            if approval_prob >= 0.80:
+                approval_likelihood = "High"
+            elif approval_prob >= 0.65:
+                approval_likelihood = "Medium"
+            else:
+                approval_likelihood = "Low"
+        elif risk_score <= 1:
             approval_likelihood = "High"
             approval_percentage = 85
         elif risk_score <= 3:
@@ -195,22 +775,22 @@ class VisaPredictionService:
             'visa_type_average': round(visa_avg, 1),
             'is_peak_season': bool(is_peak),
             'factors': {
-                'documents_complete': application.get('documents_complete', True),
-                'has_sponsor': application.get('has_sponsor', False),
-                'express_processing': application.get('express_processing', False),
-                'previous_visits': application.get('num_previous_visits', 0)
+                'documents_complete': record.documents_complete,
+                'has_sponsor': record.has_sponsor,
+                'express_processing': record.express_processing,
+                'previous_visits': record.num_previous_visits
             }
         }
     
     def get_statistics(self) -> Dict:
         """Get overall statistics from the dataset"""
         return {
-            'total_applications': len(self.data),
-            'avg_processing_time': round(self.data['processing_time_days'].mean(), 1),
+            'total_applications': self.record_count,
+            'avg_processing_time': round(float(self.data['processing_time_days'].mean()), 1),
             'min_processing_time': int(self.data['processing_time_days'].min()),
             'max_processing_time': int(self.data['processing_time_days'].max()),
             'approval_rate': round(
-                (self.data['visa_status'] == 'Approved').mean() * 100, 1
+                float((self.data['visa_status'] == 'Approved').mean()) * 100, 1
             ),
             'visa_types': list(self.encoding_maps['visa_type'].keys()),
             'nationalities': list(self.encoding_maps['nationality'].keys()),
@@ -221,32 +801,29 @@ class VisaPredictionService:
     
     def get_visa_type_stats(self) -> Dict:
         """Get statistics by visa type"""
+        rows = {row['visa_type']: row for row in self.query_stats_cube(group_by=['visa_type'])}
         stats = {}
         for visa_type in self.encoding_maps['visa_type'].keys():
-            visa_data = self.data[self.data['visa_type'] == visa_type]
-            if len(visa_data) > 0:
+            if visa_type in rows:
                 stats[visa_type] = {
-                    'count': len(visa_data),
-                    'avg_days': round(visa_data['processing_time_days'].mean(), 1),
-                    'approval_rate': round(
-                        (visa_data['visa_status'] == 'Approved').mean() * 100, 1
-                    )
+                    'count': rows[visa_type]['count'],
+                    'avg_days': rows[visa_type]['avg_days'],
+                    'approval_rate': rows[visa_type]['approval_rate']
                 }
         return stats
     
     def get_country_stats(self) -> Dict:
         """Get statistics by country"""
+        rows = {row['nationality']: row for row in self.query_stats_cube(group_by=['nationality'])}
         stats = {}
         for country in self.encoding_maps['nationality'].keys():
-            country_data = self.data[self.data['nationality'] == country]
-            if len(country_data) > 0:
+            if country in rows:
                 stats[country] = {
-                    'count': len(country_data),
-                    'avg_days': round(country_data['processing_time_days'].mean(), 1)
+                    'count': rows[country]['count'],
+                    'avg_days': rows[country]['avg_days']
                 }
         return stats
 
-
 # Singleton instance
 _service_instance = None
 
@@ -0,0 +1,194 @@
+# Request Profiler for the Visa Processing Time Estimator API
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Opt-in cProfile capture of sampled requests, aggregated for top-function and flamegraph views
+#
+# Enable with PROFILE_REQUESTS=<fraction of requests to profile>, e.g. 0.01
+# (0 profiles only requests sent with the "X-Profile-Request: 1" header).
+# When the variable is unset nothing is installed, so there is no overhead at all
+# (cProfile and pstats are not even imported until a request is profiled).
+#
+# Accuracy: cProfile hooks the event-loop thread, not one request. Any other
+# request the loop runs while a profiled one is awaiting is recorded into that
+# profile, and work sent to the threadpool (e.g. /api/predict/stream scoring)
+# is not recorded at all. A profile is only exact at concurrency 1, so each
+# profiled request also counts the other requests that overlapped it, and
+# /api/debug/profile reports those counts.
+
+import io
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+
+PROFILE_HEADER = b'x-profile-request'
+
+
+class RequestProfiler:
+    """
+    Aggregated cProfile data of the sampled requests in this worker.
+    Only one request is profiled at a time (a profiler hooks the whole
+    thread). A sampled request arriving meanwhile gets no profile of its
+    own, but its event-loop work lands in the running one; `overlapped`
+    and `overlapping_requests` say how often that happened.
+    """
+
+    def __init__(self, sample_rate=0.0, skip_prefixes=('/api/debug/',)):
+        self.sample_rate = sample_rate
+        self.skip_prefixes = skip_prefixes
+        self.requests = 0
+        self.seconds = 0.0
+        self.overlapped = 0             # profiled requests that shared the loop with others
+        self.overlapping_requests = 0   # other requests in flight during those profiles
+        self.stats = None
+        self._busy = threading.Lock()
+        self._merge = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """A profiler when PROFILE_REQUESTS is set, else None"""
+        setting = os.environ.get('PROFILE_REQUESTS')
+        if setting is None or setting.strip() == '':
+            return None
+        return cls(sample_rate=float(setting))
+
+    def wants(self, scope) -> bool:
+        """Whether to profile this request: header opt-in or random sample"""
+        if scope['path'].startswith(self.skip_prefixes):
+            return False
+        for name, value in scope['headers']:
+            if name == PROFILE_HEADER:
+                return value.strip() not in (b'', b'0')
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def add(self, profile: 'cProfile.Profile', seconds: float, overlapping: int = 0):
+        """Merge one request's profile into the aggregate (overlapping: other requests in flight meanwhile)"""
+        import pstats
+        with self._merge:
+            if self.stats is None:
+                self.stats = pstats.Stats(profile, stream=io.StringIO())
+            else:
+                self.stats.add(profile)
+            self.requests += 1
+            self.seconds += seconds
+            self.overlapped += overlapping > 0
+            self.overlapping_requests += overlapping
+
+    def reset(self):
+        with self._merge:
+            self.stats = None
+            self.requests = 0
+            self.seconds = 0.0
+            self.overlapped = 0
+            self.overlapping_requests = 0
+
+    def top_functions(self, limit=25, sort='cumulative') -> list:
+        """Heaviest functions across all profiled requests"""
+        with self._merge:
+            if self.stats is None:
+                return []
+            key = 3 if sort == 'cumulative' else 2
+            rows = sorted(self.stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:limit]
+        return [{
+            'function': format_function(func),
+            'calls': nc,
+            'total_ms': round(tt * 1000, 3),
+            'cumulative_ms': round(ct * 1000, 3),
+            'per_request_ms': round(ct * 1000 / max(self.requests, 1), 3)
+        } for func, (cc, nc, tt, ct, callers) in rows]
+
+    def collapsed_stacks(self) -> str:
+        """
+        Profile as collapsed stacks ("root;caller;callee <microseconds>" per
+        line) for flamegraph.pl, speedscope and similar tools. cProfile only
+        records caller->callee edges, so each path's time is apportioned by
+        the share of the callee's time spent under that caller.
+        """
+        with self._merge:
+            if self.stats is None:
+                return ''
+            stats = dict(self.stats.stats)
+
+        callees = {}
+        for func, (cc, nc, tt, ct, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+        roots = [func for func, entry in stats.items() if not entry[4]]
+
+        lines = {}
+
+        def walk(func, path, seconds):
+            tt, ct = stats[func][2], stats[func][3]
+            if ct <= 0 or seconds <= 0:
+                return
+            share = seconds / ct
+            stack = path + (format_function(func),)
+            own = tt * share
+            if own > 0:
+                name = ';'.join(stack)
+                lines[name] = lines.get(name, 0.0) + own
+            for callee, edge_seconds in callees.get(func, []):
+                if format_function(callee) not in path and callee in stats:
+                    walk(callee, stack, edge_seconds * share)
+
+        for root in roots:
+            walk(root, (), stats[root][3])
+        return ''.join(f"{stack} {max(1, round(seconds * 1e6))}\n"
+                       for stack, seconds in sorted(lines.items()))
+
+
+def format_function(func) -> str:
+    """pstats function key -> 'module.py:line(name)' (built-ins as their name)"""
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles the requests its RequestProfiler picks.
+    It also counts every HTTP request in flight, so a profile knows how many
+    other requests ran on the loop while it was recording.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+        self.active = 0
+        self._overlapping = None  # while a profile records: other requests seen so far
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        self.active += 1
+        if self._overlapping is not None:
+            self._overlapping += 1
+        try:
+            if not self.profiler.wants(scope) or not self.profiler._busy.acquire(blocking=False):
+                await self.app(scope, receive, send)
+                return
+            await self._profiled(scope, receive, send)
+        finally:
+            self.active -= 1
+
+    async def _profiled(self, scope, receive, send):
+        import cProfile
+        profile = cProfile.Profile()
+        self._overlapping = self.active - 1
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                profile.disable()
+        finally:
+            overlapping, self._overlapping = self._overlapping, None
+            self.profiler._busy.release()
+        self.profiler.add(profile, time.perf_counter() - start, overlapping)
@@ -0,0 +1,163 @@
+# Startup Benchmark Script
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Measures the import cost of each module and the time a fresh server takes to answer,
+# and with --check fails (exit code 1) when startup goes over its budget
+# Run from webapp/backend: python startup_benchmark.py [--runs 3] [--check]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Startup budget for --check and tests/test_startup.py, in milliseconds on one development core
+# (measured ~600 ms and ~780 ms; with pandas at import it was ~850 ms and ~1220 ms).
+# Raise it deliberately, with the new numbers in the commit, not to make a run pass.
+STARTUP_BUDGET = {
+    'import_ms': 750,          # `import app`, i.e. what every worker and test pays
+    'first_request_ms': 1000   # process launch -> first /api/predict answered
+}
+
+# Modules `import app` must not load: only the batch, training and profiling
+# paths need them, and they import them where they are used
+LAZY_MODULES = ('pandas', 'pyarrow', 'sklearn', 'scipy', 'joblib', 'cProfile', 'pstats')
+
+SAMPLE_APPLICATION = {
+    'applicant_age': 32, 'nationality': 'USA', 'visa_type': 'Business',
+    'num_previous_visits': 1, 'financial_proof_usd': 15000, 'application_month': 3
+}
+
+
+def import_profile():
+    """
+    `python -X importtime -c "import app"` in a fresh interpreter.
+    Returns the total in ms and (module, self ms, cumulative ms, depth) per module.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import app failed:\n{result.stderr[-2000:]}")
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    total = next(cumulative for name, _, cumulative, _ in modules if name == 'app')
+    return total, modules
+
+
+def package_costs(modules):
+    """Self time summed per top-level package, most expensive first"""
+    costs = {}
+    for name, self_ms, _, _ in modules:
+        root = name.split('.')[0]
+        costs[root] = costs.get(root, 0.0) + self_ms
+    return sorted(costs.items(), key=lambda item: -item[1])
+
+
+def time_to_first_request(port):
+    """
+    Launch uvicorn and time it until /api/health answers and then until the
+    first prediction comes back. Returns (ready ms, first request ms).
+    """
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--host', '127.0.0.1', '--port', str(port),
+         '--log-level', 'warning'],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                if time.perf_counter() - start > 60:
+                    raise RuntimeError("uvicorn did not become healthy in time")
+                time.sleep(0.01)
+        ready = time.perf_counter()
+        request = urllib.request.Request(f'http://127.0.0.1:{port}/api/predict',
+                                         data=json.dumps(SAMPLE_APPLICATION).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        urllib.request.urlopen(request, timeout=10).read()
+        first = time.perf_counter()
+    finally:
+        server.terminate()
+        server.wait()
+    return (ready - start) * 1000, (first - start) * 1000
+
+
+def check_budget(import_ms, first_request_ms, loaded, budget):
+    """Budget lines as (ok, message)"""
+    lazy_loaded = sorted(m for m in LAZY_MODULES if m in loaded)
+    return [
+        (import_ms <= budget['import_ms'],
+         f"import app {import_ms:.0f} ms (budget {budget['import_ms']:.0f} ms)"),
+        (first_request_ms <= budget['first_request_ms'],
+         f"first request {first_request_ms:.0f} ms (budget {budget['first_request_ms']:.0f} ms)"),
+        (not lazy_loaded,
+         f"lazy modules loaded by import app: {', '.join(lazy_loaded) or 'none'}")
+    ]
+
+
+def parse_args():
+    """Command line options for the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Measure import cost and time to first request")
+    parser.add_argument('--runs', type=int, default=3, help="fresh processes per measurement, median kept (default: 3)")
+    parser.add_argument('--top', type=int, default=15, help="packages listed by import cost (default: 15)")
+    parser.add_argument('--port', type=int, default=8766, help="port for the local server (default: 8766)")
+    parser.add_argument('--check', action='store_true', help="exit with code 1 when over the startup budget")
+    parser.add_argument('--import-budget-ms', type=float, default=STARTUP_BUDGET['import_ms'])
+    parser.add_argument('--first-request-budget-ms', type=float, default=STARTUP_BUDGET['first_request_ms'])
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    budget = {'import_ms': args.import_budget_ms, 'first_request_ms': args.first_request_budget_ms}
+
+    print("=" * 60)
+    print("STARTUP BENCHMARK")
+    print("=" * 60)
+
+    # step 1: import cost, module by module (median run kept)
+    profiles = sorted((import_profile() for _ in range(args.runs)), key=lambda p: p[0])
+    import_ms, modules = profiles[len(profiles) // 2]
+    loaded = {name.split('.')[0] for name, _, _, _ in modules}
+    print(f"\nimport app: {import_ms:.0f} ms ({len(modules)} modules)")
+    print(f"\n{'Package':<28} {'Self ms':>9}")
+    for package, self_ms in package_costs(modules)[:args.top]:
+        print(f"{package:<28} {self_ms:>9.1f}")
+    print(f"\n{'Backend module':<28} {'Cumulative ms':>14}")
+    for name, _, cumulative_ms, depth in modules:
+        if depth <= 1 and os.path.exists(os.path.join(BACKEND_DIR, name + '.py')):
+            print(f"{name:<28} {cumulative_ms:>14.1f}")
+
+    # step 2: launch to first answered prediction
+    runs = [time_to_first_request(args.port) for _ in range(args.runs)]
+    ready_ms = statistics.median(r[0] for r in runs)
+    first_request_ms = statistics.median(r[1] for r in runs)
+    print(f"\nServer ready (/api/health): {ready_ms:7.0f} ms")
+    print(f"First /api/predict answered: {first_request_ms:7.0f} ms  (median of {args.runs})")
+
+    # step 3: startup budget
+    print("\nBudget:")
+    results = check_budget(import_ms, first_request_ms, loaded, budget)
+    for ok, message in results:
+        print(f"  {'PASS' if ok else 'FAIL'}  {message}")
+    if args.check and not all(ok for ok, _ in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# Static Assets for the Visa Processing Time Estimator frontend
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Serves the frontend from memory with precompressed variants, ETags and HTTP caching
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+# fingerprinted URLs (?v=<content hash>) never change content, so cache them
+# for a year; pages and unversioned URLs are revalidated with their ETag
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# local script/stylesheet links in the pages, e.g. href="/styles.css?v=20260212"
+ASSET_LINK = re.compile(rb'((?:src|href)=")(/?)([\w.-]+\.(?:js|css))(?:\?v=[^"]*)?"')
+
+
+class Asset:
+    """One frontend file: its media type, content hash and body per content encoding"""
+    __slots__ = ('media_type', 'version', 'bodies')
+
+    def __init__(self, name: str, body: bytes):
+        self.media_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.version = hashlib.sha256(body).hexdigest()[:12]
+        self.bodies = {'identity': body}
+        # compressed copies are made once here, and kept only when they are smaller
+        variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=11)
+        for encoding, compressed in variants.items():
+            if len(compressed) < len(body):
+                self.bodies[encoding] = compressed
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.version}"' if encoding == 'identity' else f'"{self.version}-{encoding}"'
+
+
+def accepted_encodings(header: str) -> set:
+    """Codings a client accepts from its Accept-Encoding header (q=0 means refused)"""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticAssets:
+    """
+    The whole frontend folder, read into memory once. Pages have their
+    script/stylesheet links rewritten to content-hash versions, so a
+    changed app.js or styles.css gets a new URL and the old one can be
+    cached forever.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets = {}
+        self.routes = {}
+        self._load()
+
+    def _load(self):
+        raw = {}
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    raw[name] = f.read()
+
+        # version the scripts/styles first, then point the pages at them
+        for name, body in raw.items():
+            if not name.endswith('.html'):
+                self.assets[name] = Asset(name, body)
+        for name, body in raw.items():
+            if name.endswith('.html'):
+                self.assets[name] = Asset(name, ASSET_LINK.sub(self._versioned_link, body))
+
+        # every file at /name, pages also at /name without .html, home at /
+        for name in self.assets:
+            self.routes['/' + name] = name
+            if name.endswith('.html'):
+                self.routes['/' + name[:-len('.html')]] = name
+        if 'index.html' in self.assets:
+            self.routes['/'] = 'index.html'
+
+    def _versioned_link(self, match) -> bytes:
+        prefix, slash, name = match.group(1), match.group(2), match.group(3)
+        asset = self.assets.get(name.decode())
+        if asset is None:
+            return match.group(0)
+        return prefix + slash + name + b'?v=' + asset.version.encode() + b'"'
+
+    def response(self, path: str, headers, query_version: str = None) -> Response:
+        """
+        Response for a GET of path: the best encoding the client accepts,
+        304 when its If-None-Match already holds that representation.
+        """
+        asset = self.assets[self.routes[path]]
+        accepted = accepted_encodings(headers.get('accept-encoding', ''))
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in asset.bodies and (candidate in accepted or '*' in accepted):
+                encoding = candidate
+                break
+
+        etag = asset.etag(encoding)
+        immutable = not asset.media_type.startswith('text/html') and query_version == asset.version
+        response_headers = {
+            'ETag': etag,
+            'Cache-Control': IMMUTABLE if immutable else REVALIDATE,
+            'Vary': 'Accept-Encoding'
+        }
+
+        if_none_match = headers.get('if-none-match')
+        if if_none_match:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            if etag in tags or '*' in tags:
+                return Response(status_code=304, headers=response_headers)
+
+        if encoding != 'identity':
+            response_headers['Content-Encoding'] = encoding
+        return Response(content=asset.bodies[encoding], media_type=asset.media_type, headers=response_headers)
@@ -0,0 +1,40 @@
+# Startup Regression Tests
+# Author: Harsh
+# Infosys Springboard Project - Milestone 4
+# Fails when `import app` loads a module that should stay lazy or goes over the startup budget
+# Run from webapp/backend: python -m pytest tests
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from startup_benchmark import STARTUP_BUDGET, import_profile, check_budget
+
+RUNS = 3
+# Headroom over the budget for machines slower or busier than the one it was set on;
+# a real regression (pandas back at import) costs far more than this
+IMPORT_MARGIN = 1.25
+
+
+@pytest.fixture(scope='module')
+def profile():
+    """Median `python -X importtime -c "import app"` of RUNS fresh interpreters"""
+    profiles = sorted((import_profile() for _ in range(RUNS)), key=lambda p: p[0])
+    import_ms, modules = profiles[len(profiles) // 2]
+    loaded = {name.split('.')[0] for name, _, _, _ in modules}
+    return import_ms, loaded
+
+
+def test_import_app_keeps_lazy_modules_out(profile):
+    import_ms, loaded = profile
+    ok, message = check_budget(import_ms, 0, loaded, STARTUP_BUDGET)[2]
+    assert ok, message
+
+
+def test_import_app_within_budget(profile):
+    import_ms, _ = profile
+    limit = STARTUP_BUDGET['import_ms'] * IMPORT_MARGIN
+    assert import_ms <= limit, (f"import app took {import_ms:.0f} ms, over the {STARTUP_BUDGET['import_ms']} ms "
+                                f"budget (+{IMPORT_MARGIN - 1:.0%} margin = {limit:.0f} ms)")